@@ -0,0 +1,79 @@
+"""
+Compare the throughput of SATClient driven by a thread pool with AsyncSATClient
+against a local stub that adds a fixed latency to every response.
+
+    python benchmarks/bench_async_client.py --requests 2000 --concurrency 64 --latency 0.02
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from stub import generate_key_pair, start_stub, stub_config
+from werkzeug.wrappers import Request, Response
+
+from py_sat import SATClient
+from py_sat.async_client import AsyncSATClient
+from py_sat.constant import ACCOUNT_PATH
+
+ACCOUNT_BODY = '{"data": {"type": "account", "id": "1", "attributes": {"saldo": 1}}}'
+
+
+def bench_threaded(config, total: int, concurrency: int) -> float:
+    sat_client = SATClient(config.with_connection_pool(pool_maxsize=concurrency))
+    sat_client.account()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda _: sat_client.account(), range(total)))
+    return time.perf_counter() - start
+
+
+def bench_async(config, total: int, concurrency: int) -> float:
+    async def run() -> float:
+        async with AsyncSATClient(config) as sat_client:
+            await sat_client.account()
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def one():
+                async with semaphore:
+                    await sat_client.account()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(total)))
+            return time.perf_counter() - start
+
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    def slow_account(request: Request) -> Response:
+        time.sleep(args.latency)
+        return Response(ACCOUNT_BODY, content_type="application/json")
+
+    server = start_stub()
+    server.expect_request(ACCOUNT_PATH).respond_with_handler(slow_account)
+    private_key, public_key = generate_key_pair()
+    try:
+        for name, bench in (("threaded", bench_threaded), ("async", bench_async)):
+            config = stub_config(server, private_key, public_key).with_connection_pool(
+                pool_maxsize=args.concurrency
+            )
+            elapsed = bench(config, args.requests, args.concurrency)
+            print(
+                f"{name:>8}: {args.requests} requests in {elapsed:.2f}s, "
+                f"{args.requests / elapsed:.0f} req/s"
+            )
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
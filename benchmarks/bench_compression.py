@@ -0,0 +1,190 @@
+"""
+Compare bytes on wire and latency of list_product and checkout with and without compression
+against a local stub. The stub throttles every body to --bandwidth bytes per second,
+loopback is too fast for the transfer time to show otherwise.
+
+    python benchmarks/bench_compression.py --products 2000 --requests 20 --bandwidth 1000000
+"""
+
+import argparse
+import gzip
+import json
+import statistics
+import time
+import zlib
+
+from stub import generate_key_pair, start_stub, stub_config
+from werkzeug.wrappers import Request, Response
+
+from py_sat import SATClient
+from py_sat.compression import BROTLI_AVAILABLE
+from py_sat.constant import CHECKOUT_PATH, PRODUCT_LIST_PATH
+from py_sat.models import Field, OrderRequest
+
+if BROTLI_AVAILABLE:
+    try:
+        import brotli
+    except ImportError:
+        import brotlicffi as brotli
+
+
+def build_catalog(products: int) -> bytes:
+    return json.dumps(
+        {
+            "data": [
+                {
+                    "type": "product",
+                    "id": f"pulsa-{i}",
+                    "attributes": {
+                        "product_name": f"Pulsa Telkomsel {i * 1000}",
+                        "operator_name": "Telkomsel",
+                        "category_name": "Pulsa",
+                        "is_inquiry": False,
+                        "price": i * 1000 + 500,
+                        "status": 1,
+                    },
+                }
+                for i in range(products)
+            ]
+        }
+    ).encode()
+
+
+def negotiate(accept_encoding: str):
+    accepted = [value.strip() for value in accept_encoding.split(",")]
+    for encoding in ("br", "gzip", "deflate"):
+        if encoding in accepted and (encoding != "br" or BROTLI_AVAILABLE):
+            return encoding
+    return None
+
+
+def encode(body: bytes, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    if encoding == "deflate":
+        return zlib.compress(body, 6)
+    return body
+
+
+class Stub:
+    def __init__(self, catalog: bytes, bandwidth: float):
+        self.catalog = catalog
+        # A real server caches the encoded catalog, it is not compressed per request
+        self.encoded_catalogs = {
+            encoding: encode(catalog, encoding)
+            for encoding in ("br", "gzip", "deflate", None)
+            if encoding != "br" or BROTLI_AVAILABLE
+        }
+        self.bandwidth = bandwidth
+        self.bytes_received = 0
+        self.bytes_sent = 0
+
+    def throttle(self, size: int):
+        time.sleep(size / self.bandwidth)
+
+    def respond(self, body: bytes, request: Request, encoded=None) -> Response:
+        # Negotiate like SAT would: only what the client advertised
+        encoding = negotiate(request.headers.get("Accept-Encoding", ""))
+        encoded = encoded or encode(body, encoding)
+        self.bytes_sent += len(encoded)
+        self.throttle(len(encoded))
+        headers = {"Content-Encoding": encoding} if encoding else {}
+        return Response(encoded, content_type="application/json", headers=headers)
+
+    def product_list(self, request: Request) -> Response:
+        encoding = negotiate(request.headers.get("Accept-Encoding", ""))
+        return self.respond(self.catalog, request, self.encoded_catalogs[encoding])
+
+    def checkout(self, request: Request) -> Response:
+        raw = request.get_data()
+        self.bytes_received += len(raw)
+        self.throttle(len(raw))
+        body = raw
+        if request.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(raw)
+        order = json.loads(body)["data"]
+        return self.respond(
+            json.dumps(
+                {
+                    "data": {
+                        "type": "order",
+                        "id": order["id"],
+                        "attributes": {**order["attributes"], "status": "Pending"},
+                    }
+                }
+            ).encode(),
+            request,
+        )
+
+
+def bench(sat_client: SATClient, stub: Stub, requests: int):
+    stub.bytes_received = stub.bytes_sent = 0
+    list_latencies, checkout_latencies = [], []
+    for i in range(requests):
+        start = time.perf_counter()
+        response = sat_client.list_product()
+        list_latencies.append(time.perf_counter() - start)
+        assert response.is_success()
+
+        start = time.perf_counter()
+        response = sat_client.checkout(
+            OrderRequest(
+                id=f"bench-{time.time_ns()}-{i}",
+                product_code="pulsa-10",
+                client_number="081234567890",
+                amount=10500,
+                fields=[Field(name=f"note_{n}", value="bench " * 20) for n in range(8)],
+            )
+        )
+        checkout_latencies.append(time.perf_counter() - start)
+        assert response.is_success()
+
+    return (
+        stub.bytes_sent / requests,
+        stub.bytes_received / requests,
+        statistics.mean(list_latencies) * 1000,
+        statistics.mean(checkout_latencies) * 1000,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--bandwidth", type=float, default=1_000_000)
+    args = parser.parse_args()
+
+    stub = Stub(build_catalog(args.products), args.bandwidth)
+    server = start_stub()
+    server.expect_request(PRODUCT_LIST_PATH).respond_with_handler(stub.product_list)
+    server.expect_request(CHECKOUT_PATH, method="POST").respond_with_handler(
+        stub.checkout
+    )
+    private_key, public_key = generate_key_pair()
+    try:
+        # requests advertises gzip by default, the baseline advertises nothing
+        plain = stub_config(server, private_key, public_key).with_compression(
+            accept_encodings=()
+        )
+        compressed = stub_config(server, private_key, public_key).with_compression(
+            request_encoding="gzip", min_size=256
+        )
+        print(f"catalog of {args.products} products, {len(stub.catalog)} bytes")
+        for name, config in (("plain", plain), ("compressed", compressed)):
+            sat_client = SATClient(config)
+            sat_client.list_product()
+            received, sent, list_ms, checkout_ms = bench(
+                sat_client, stub, args.requests
+            )
+            print(
+                f"{name:>10}: list_product {received:>9.0f} B down {list_ms:7.2f} ms, "
+                f"checkout {sent:>6.0f} B up {checkout_ms:6.2f} ms"
+            )
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Measure how Signature.sign_many and Signature.verify_many scale with the worker processes of the pool,
+from the in-process baseline to one worker per CPU. Worker start up is excluded, each pool is warmed first.
+
+    python benchmarks/bench_signature_pool.py --messages 2000 --bits 2048 --max-workers 8
+"""
+
+import argparse
+import os
+import time
+
+from stub import generate_key_pair
+
+from py_sat.signature import Signature, SignatureBackend, SignatureType
+from py_sat.signature.pool import SignaturePoolConfig
+
+
+def build_messages(count: int):
+    return [
+        '{"data":{"attributes":{"amount":12500,"client_number":"2121212",'
+        f'"product_code":"pln-postpaid"}},"id":"bench-{i}","type":"order"}}}}'
+        for i in range(count)
+    ]
+
+
+def measure(signature: Signature, messages, signed):
+    signature.sign_many(messages[:64])
+
+    started = time.perf_counter()
+    results = signature.sign_many(messages)
+    sign_elapsed = time.perf_counter() - started
+    assert all(result.ok for result in results)
+
+    started = time.perf_counter()
+    results = signature.verify_many(zip(messages, signed))
+    verify_elapsed = time.perf_counter() - started
+    assert all(result.value for result in results)
+
+    return len(messages) / sign_elapsed, len(messages) / verify_elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--bits", type=int, default=2048)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument(
+        "--backend",
+        choices=[backend.value for backend in SignatureBackend],
+        default=SignatureBackend.AUTO.value,
+    )
+    args = parser.parse_args()
+
+    private_key, public_key = generate_key_pair(args.bits)
+    backend = SignatureBackend(args.backend)
+    messages = build_messages(args.messages)
+
+    baseline = Signature(private_key, public_key, SignatureType.PSS, backend)
+    signed = [baseline.sign(message) for message in messages]
+
+    print(
+        f"{args.messages} messages, RSA {args.bits}, {baseline.backend.value} backend, "
+        f"{os.cpu_count()} CPUs"
+    )
+    print(
+        f"{'workers':>10} {'sign/s':>10} {'speedup':>8} {'verify/s':>10} {'speedup':>8}"
+    )
+
+    base_sign, base_verify = measure(baseline, messages, signed)
+    print(
+        f"{'in-process':>10} {base_sign:>10.0f} {1.0:>8.2f} {base_verify:>10.0f} {1.0:>8.2f}"
+    )
+
+    for workers in range(1, args.max_workers + 1):
+        signature = Signature(
+            private_key,
+            public_key,
+            SignatureType.PSS,
+            backend,
+            pool_config=SignaturePoolConfig(
+                workers=workers, chunk_size=args.chunk_size
+            ),
+        )
+        try:
+            sign_rate, verify_rate = measure(signature, messages, signed)
+        finally:
+            signature.close()
+        print(
+            f"{workers:>10} {sign_rate:>10.0f} {sign_rate / base_sign:>8.2f} "
+            f"{verify_rate:>10.0f} {verify_rate / base_verify:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
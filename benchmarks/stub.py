@@ -0,0 +1,47 @@
+"""
+Local SAT stub shared by the benchmarks, it serves the token endpoint and lets
+each benchmark register the SAT endpoints it needs.
+"""
+
+import logging
+import os
+
+from Crypto.PublicKey import RSA
+from pytest_httpserver import HTTPServer
+
+from py_sat import SATClientConfig
+
+
+def start_stub(threaded: bool = True) -> HTTPServer:
+    os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+    server = HTTPServer(threaded=threaded)
+    server.start()
+    server.expect_request("/token", method="POST").respond_with_json(
+        {"access_token": "benchToken", "token_type": "bearer", "expires_in": 3600}
+    )
+    return server
+
+
+def generate_key_pair(bits: int = 2048):
+    key = RSA.generate(bits)
+    return (
+        key.export_key(format="PEM", pkcs=8).decode(),
+        key.public_key().export_key(format="PEM").decode(),
+    )
+
+
+def stub_config(
+    server: HTTPServer, private_key: str, public_key: str
+) -> SATClientConfig:
+    return (
+        SATClientConfig(
+            client_id="client_id",
+            client_secret="client_secret",
+            private_key=private_key,
+            sat_public_key=public_key,
+        )
+        .with_sat_base_url(server.url_for("")[:-1])
+        .with_access_token_base_url(server.url_for("/token"))
+    )
@@ -0,0 +1,453 @@
+"""
+async_client package contains the asyncio flavour of SATClient.
+
+It mirrors every SATClient method as a coroutine, sends requests through AsyncHTTPClient
+and runs the RSA signature operations in an executor so they never block the event loop.
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Union
+
+from requests.exceptions import HTTPError
+
+from py_sat.async_http_client import AsyncHTTPClient
+from py_sat.callback import (CallbackDedupCache, CallbackDedupStats,
+                             CallbackDelivery, parse_callback_body)
+from py_sat.client import (_PASSTHROUGH_EXCEPTIONS, SATClientConfig,
+                           _handle_http_error)
+from py_sat.constant import (ACCOUNT_PATH, CHECK_STATUS_PATH, CHECKOUT_PATH,
+                             INQUIRY_PATH, PING_PATH, PRODUCT_LIST_PATH,
+                             SIGNATURE_HEADER_KEY, SIGNED_BODY_ATTRIBUTE,
+                             Endpoint)
+from py_sat.exceptions import (GeneralException, InvalidInputException,
+                               UnauthenticatedException)
+from py_sat.models import (Account, ErrorResponse, InquiryRequest,
+                           InquiryResponse, OrderDetail, OrderRequest,
+                           PartnerProduct, PingResponse, ProductListResponse)
+from py_sat.signature import Signature
+from py_sat.timeout import Deadline, Timeout, TimeoutConfig
+from py_sat.utils import (encode_json_request, generate_json_api_request,
+                          parse_json_api_list_response,
+                          parse_json_api_response)
+
+
+class AsyncSATClient:
+    """
+    AsyncSATClient is the asyncio counterpart of SATClient, use it with `async with`
+    or call close() to release the connection pool
+    """
+
+    _config: SATClientConfig
+    signature: Signature
+    _logger: logging.Logger
+    _http_client: AsyncHTTPClient
+    _executor: Optional[Executor]
+
+    def __init__(self, config: SATClientConfig, executor: Optional[Executor] = None):
+        """
+        :param config: SATClientConfig, shared with SATClient, without the options only SATClient supports
+        :param executor: executor running the RSA sign and verify, default to the loop default executor
+        :raise InvalidInputException: if the config enables an option only SATClient supports
+        """
+        unsupported = [
+            option
+            for option, value in (
+                ("with_token_store", config.token_store),
+                ("with_hedging", config.hedge_policy),
+                ("with_bulkheads", config.bulkhead_config),
+                ("with_sat_base_urls", config.failover_config),
+            )
+            if value is not None
+        ]
+        if unsupported:
+            raise InvalidInputException(
+                f"AsyncSATClient does not support {', '.join(unsupported)}, use SATClient"
+            )
+
+        self._config = config
+        self.signature = Signature(
+            config.private_key,
+            config.sat_public_key,
+            config.padding_type,
+            config.signature_backend,
+            config.sat_public_keys,
+            config.signature_pool_config,
+        )
+        self._callback_dedup = (
+            CallbackDedupCache(config.callback_dedup_config)
+            if config.callback_dedup_config
+            else None
+        )
+        self._logger = config.logger
+        self._executor = executor
+        self._http_client = AsyncHTTPClient(
+            base_url=config.sat_base_url,
+            oauth_base_url=config.access_token_base_url,
+            client_id=config.client_id,
+            client_secret=config.client_secret,
+            logger=config.logger,
+            pool_config=config.pool_config,
+            timeout_config=TimeoutConfig(
+                default=Timeout(connect=config.timeout, read=config.timeout),
+                endpoints=dict(config.endpoint_timeouts),
+            ),
+            retry_policy=config.retry_policy,
+            token_refresh_ratio=config.token_refresh_ratio,
+            request_log_config=config.request_log_config,
+            is_debug=config.is_debug,
+            compression_config=config.compression_config,
+            circuit_breaker_config=config.circuit_breaker_config,
+            rate_limit_config=config.rate_limit_config,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the connection pool of the underlying http client and the signature worker processes
+        """
+        await self._http_client.close()
+        self.signature.close()
+
+    async def ping(
+        self, deadline: Optional[float] = None
+    ) -> Union[PingResponse, ErrorResponse]:
+        """
+        Ping is a method to check the SAT server health
+               :param deadline: optional time budget in seconds for the whole call
+               :return: PingResponse or ErrorResponse
+               :raise ResponseGeneralException: if there are unexpected error when hitting SAT (403 forbidden, network error)
+               :raise GeneralException: if there is an unexpected exception when pinging
+        """
+        try:
+            url = f"{self._config.sat_base_url}{PING_PATH}"
+
+            response = await self._http_client.send_request(
+                "GET", url, endpoint=Endpoint.PING, deadline=Deadline.after(deadline)
+            )
+            response.raise_for_status()
+
+            json_response = response.json()
+            return PingResponse.from_dict(json_response).with_raw_response(response)
+        except HTTPError as exc:
+            return _handle_http_error(exc, self._logger)
+        except _PASSTHROUGH_EXCEPTIONS:
+            raise
+        except Exception as exc:
+            self._logger.error("Error when pinging: %s", exc)
+            raise GeneralException(exc)
+
+    async def inquiry(
+        self, req: InquiryRequest, deadline: Optional[float] = None
+    ) -> Union[InquiryResponse, ErrorResponse]:
+        """
+        Inquiry is a method to get user bills based on client number and product code
+               :param req: InquiryRequest
+               :param deadline: optional time budget in seconds for the whole call
+               :return:  InquiryBaseResponse or ErrorResponse
+               :raise ResponseGeneralException: if there are unexpected error when hitting SAT (403 forbidden, network error)
+               :raise GeneralException: if there is an unexpected exception when inquiring
+        """
+        try:
+            url = f"{self._config.sat_base_url}{INQUIRY_PATH}"
+
+            body = generate_json_api_request(req.to_dict())
+            response = await self._http_client.send_request(
+                "POST",
+                url,
+                endpoint=Endpoint.INQUIRY,
+                deadline=Deadline.after(deadline),
+                data=json.dumps(body).encode("utf-8"),
+            )
+            response.raise_for_status()
+
+            json_response = response.json()
+            data = parse_json_api_response(json_response)
+
+            return InquiryResponse.from_dict(data).with_raw_response(response)
+        except HTTPError as exc:
+            return _handle_http_error(exc, self._logger)
+        except _PASSTHROUGH_EXCEPTIONS:
+            raise
+        except Exception as exc:
+            self._logger.error("Error when inquiry: %s", exc)
+            raise GeneralException(exc)
+
+    async def checkout(
+        self, req: OrderRequest, deadline: Optional[float] = None
+    ) -> Union[OrderDetail, ErrorResponse]:
+        """
+        Checkout is a method to do payment an order based on client number, product code and request id.
+        Request ID should use unique identifier for each transaction
+               :param req: OrderRequest
+               :param deadline: optional time budget in seconds for the whole call
+               :return: OrderDetail or ErrorResponse
+               :raise ResponseGeneralException: if there are unexpected error when hitting SAT (403 forbidden, network error)
+               :raise GeneralException: if there is an unexpected exception when checking out
+        """
+        try:
+            url = f"{self._config.sat_base_url}{CHECKOUT_PATH}"
+
+            # Serialized once, the signed bytes are the sent bytes
+            body = encode_json_request(generate_json_api_request(req.to_dict()))
+            signature = await self._run_in_executor(self.signature.sign, body)
+
+            response = await self._http_client.send_request(
+                "POST",
+                url,
+                endpoint=Endpoint.CHECKOUT,
+                deadline=Deadline.after(deadline),
+                data=body,
+                headers={SIGNATURE_HEADER_KEY: signature},
+            )
+            setattr(response, SIGNED_BODY_ATTRIBUTE, body)
+            response.raise_for_status()
+
+            json_response = response.json()
+            data = parse_json_api_response(json_response)
+
+            return OrderDetail.from_dict(data).with_raw_response(response)
+        except HTTPError as exc:
+            return _handle_http_error(exc, self._logger)
+        except _PASSTHROUGH_EXCEPTIONS:
+            raise
+        except Exception as exc:
+            self._logger.error("Error when checkout: %s", exc)
+            raise GeneralException(exc)
+
+    async def check_status(
+        self, request_id: str, deadline: Optional[float] = None
+    ) -> Union[OrderDetail, ErrorResponse]:
+        """
+        CheckStatus is a method to check the final status of an order.
+        request id is must be filled
+               :param request_id: request id to check the status
+               :param deadline: optional time budget in seconds for the whole call
+               :return: OrderDetail or ErrorResponse
+               :raise ResponseGeneralException: if there are unexpected error when hitting SAT (403 forbidden, network error)
+               :raise GeneralException: if there is an unexpected exception when checking status
+        """
+        try:
+            url = f"{self._config.sat_base_url}{CHECK_STATUS_PATH.format(request_id=request_id)}"
+
+            response = await self._http_client.send_request(
+                "GET",
+                url,
+                endpoint=Endpoint.CHECK_STATUS,
+                deadline=Deadline.after(deadline),
+            )
+            response.raise_for_status()
+
+            signature = response.headers.get("signature")
+            if not signature:
+                raise UnauthenticatedException(
+                    "Signature is not present in the header, please check the request"
+                )
+
+            body = response.content
+            key_id = (
+                response.headers.get(self._config.sat_key_id_header)
+                if self._config.sat_key_id_header
+                else None
+            )
+            valid = await self._run_in_executor(
+                self.signature.verify, body, signature, key_id
+            )
+            if not valid:
+                raise UnauthenticatedException("Signature is not valid")
+
+            # The verified buffer is the parsed one, no decode to text in between
+            json_response = json.loads(body)
+
+            data = parse_json_api_response(json_response)
+
+            return OrderDetail.from_dict(data).with_raw_response(response)
+        except HTTPError as exc:
+            return _handle_http_error(exc, self._logger)
+        except _PASSTHROUGH_EXCEPTIONS:
+            raise
+        except Exception as exc:
+            self._logger.error("Error when check status: %s", exc)
+            raise GeneralException(exc)
+
+    async def list_product(
+        self, code: Optional[str] = None, deadline: Optional[float] = None
+    ) -> Union[ProductListResponse, ErrorResponse]:
+        """
+        ListProduct is a method to get all the product list enabled on your credentials.
+        you can also specify the product code, to get only one product detail.
+               :param code: product code to filter the product list
+               :param deadline: optional time budget in seconds for the whole call
+               :return: ProductListResponse or ErrorResponse
+               :raise ResponseGeneralException: if there are unexpected error when hitting SAT (403 forbidden, network error)
+               :raise GeneralException: if there is an unexpected exception when listing product
+        """
+        try:
+            url = f"{self._config.sat_base_url}{PRODUCT_LIST_PATH}"
+
+            response = await self._http_client.send_request(
+                "GET",
+                url,
+                endpoint=Endpoint.PRODUCT_LIST,
+                deadline=Deadline.after(deadline),
+                params={"product_code": code},
+            )
+            response.raise_for_status()
+
+            json_response = response.json()
+            data = parse_json_api_list_response(json_response)
+            products = [
+                PartnerProduct.from_dict(item).with_raw_response(response)
+                for item in data
+            ]
+
+            return ProductListResponse(products=products).with_raw_response(response)
+        except HTTPError as exc:
+            return _handle_http_error(exc, self._logger)
+        except _PASSTHROUGH_EXCEPTIONS:
+            raise
+        except Exception as exc:
+            self._logger.error("Error when list product: %s", exc)
+            raise GeneralException(exc)
+
+    async def account(
+        self, deadline: Optional[float] = None
+    ) -> Union[Account, ErrorResponse]:
+        """
+        Account is a method to check account balance
+               :param deadline: optional time budget in seconds for the whole call
+               :return: Account or ErrorResponse
+               :raise ResponseGeneralException: if there are unexpected error when hitting SAT (403 forbidden, network error)
+               :raise GeneralException: if there is an unexpected exception when checking account
+        """
+        try:
+            url = f"{self._config.sat_base_url}{ACCOUNT_PATH}"
+
+            response = await self._http_client.send_request(
+                "GET", url, endpoint=Endpoint.ACCOUNT, deadline=Deadline.after(deadline)
+            )
+            response.raise_for_status()
+
+            json_response = response.json()
+            data = parse_json_api_response(json_response)
+
+            return Account.from_dict(data).with_raw_response(response)
+        except HTTPError as exc:
+            return _handle_http_error(exc, self._logger)
+        except _PASSTHROUGH_EXCEPTIONS:
+            raise
+        except Exception as exc:
+            self._logger.error("Error when checking balance: %s", exc)
+            raise GeneralException(exc)
+
+    async def handle_callback(
+        self,
+        sat_response_data: Dict[str, Any],
+        sat_response_headers: Dict[str, Any],
+        do: Callable[[OrderDetail], Union[None, Awaitable[None]]],
+    ):
+        """
+        HandleCallback verifies the callback request from SAT and pass the order detail to your function
+           :param sat_response_data: JSON API response data from SAT webhook, must be a dictionary
+           :param sat_response_headers: HTTP headers from SAT webhook, must be a dictionary
+           :param do: Your custom function to handle the callback, a function or a coroutine function
+                      with OrderDetail as parameter
+           :raise InvalidInputException: if the header does not contain the signature
+           :raise UnauthenticatedException: if the signature is not valid
+           :raise CallbackInFlightException: if the dedup cache is enabled and another delivery of the callback
+                      is still being handled, answer with a non-2xx status so SAT delivers it again
+        """
+        await self._handle_callback(
+            json.dumps(sat_response_data),
+            sat_response_headers,
+            lambda: OrderDetail.from_dict(parse_json_api_response(sat_response_data)),
+            do,
+        )
+
+    async def handle_callback_raw(
+        self,
+        body: bytes,
+        headers: Mapping[str, Any],
+        do: Callable[[OrderDetail], Union[None, Awaitable[None]]],
+    ):
+        """
+        HandleCallbackRaw is HandleCallback for the raw request body, prefer it over HandleCallback.
+        The signature is verified on the exact bytes SAT sent, and they are parsed once, after the verification
+           :param body: raw HTTP body of the SAT webhook, as received
+           :param headers: HTTP headers from SAT webhook
+           :param do: Your custom function to handle the callback, a function or a coroutine function
+                      with OrderDetail as parameter
+           :raise InvalidInputException: if the body is not bytes or not JSON, or the header does not contain the signature
+           :raise UnauthenticatedException: if the signature is not valid
+           :raise CallbackInFlightException: if the dedup cache is enabled and another delivery of the callback
+                      is still being handled, answer with a non-2xx status so SAT delivers it again
+        """
+        if not isinstance(body, bytes):
+            raise InvalidInputException("Callback body must be bytes")
+
+        await self._handle_callback(
+            body, headers, lambda: parse_callback_body(body), do
+        )
+
+    def get_callback_dedup_stats(self) -> Optional[CallbackDedupStats]:
+        """
+        Hits and misses of the callback dedup cache, None when it is not enabled
+        """
+        return self._callback_dedup.get_stats() if self._callback_dedup else None
+
+    def get_http_client(self) -> AsyncHTTPClient:
+        """
+        GetHTTPClient will return async http client which already wrapped to support oauth2
+        for custom integration to SAT Service
+                :return: AsyncHTTPClient
+        """
+        return self._http_client
+
+    def get_signature(self) -> Signature:
+        """
+        GetSignature will return signature object which already wrapped to support RSA signature
+        for custom integration to SAT Service
+                :return: Signature
+        """
+        return self.signature
+
+    async def _handle_callback(
+        self,
+        body: Union[str, bytes],
+        headers: Mapping[str, Any],
+        parse: Callable[[], OrderDetail],
+        do: Callable[[OrderDetail], Union[None, Awaitable[None]]],
+    ):
+        delivery = CallbackDelivery(
+            body, headers, self._config.sat_key_id_header, self._callback_dedup
+        )
+        if delivery.skipped:
+            return
+
+        if delivery.needs_verification:
+            verify = await self._run_in_executor(
+                self.signature.verify, body, delivery.signature, delivery.key_id
+            )
+            if not verify:
+                raise UnauthenticatedException("Signature is not valid")
+
+        order_detail = delivery.claim(parse())
+        if order_detail is None:
+            return
+
+        with delivery.handling():
+            result = do(order_detail)
+            if inspect.isawaitable(result):
+                await result
+
+    async def _run_in_executor(self, func: Callable, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
@@ -0,0 +1,422 @@
+"""
+async_http_client package contains the asyncio transport used by AsyncSATClient.
+
+It requires the optional aiohttp dependency, install it with `pip install py-sat-sdk[async]`.
+"""
+
+import asyncio
+import base64
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from py_sat.circuit_breaker import (CircuitBreaker, CircuitBreakerConfig,
+                                    CircuitBreakerRegistry, CircuitState)
+from py_sat.compression import CompressionConfig
+from py_sat.constant import DATE_TIME_FORMAT, SDK_LABEL, Endpoint
+from py_sat.exceptions import (DeadlineExceededException,
+                               UnauthenticatedException)
+from py_sat.http_client import DEFAULT_TIMEOUT
+from py_sat.pool import PoolConfig
+from py_sat.rate_limit import RateLimitConfig, RateLimiter
+from py_sat.request_log import RequestLogConfig, RequestLogger
+from py_sat.retry import RETRY_STATE_ATTRIBUTE, RetryPolicy, RetryState
+from py_sat.timeout import Deadline, Timeout, TimeoutConfig
+from py_sat.token import DEFAULT_REFRESH_RATIO, AccessToken, AsyncTokenManager
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class AsyncHTTPClient:
+    """
+    AsyncHTTPClient is the asyncio counterpart of HTTPClient, it manages the OAuth token
+    and sends requests to SAT without blocking the event loop
+    """
+
+    _base_url: str
+    _oauth_base_url: str
+    _token_manager: AsyncTokenManager
+    _token_refresh_ratio: float
+    _client_id: str
+    _client_secret: str
+    _logger: logging.Logger
+    _request_logger: RequestLogger
+    _pool_config: PoolConfig
+    _timeout_config: TimeoutConfig
+    _retry_policy: Optional[RetryPolicy]
+    _compression_config: Optional[CompressionConfig]
+    _circuit_breakers: Optional[CircuitBreakerRegistry]
+    _rate_limiter: Optional[RateLimiter]
+    _session: Optional["aiohttp.ClientSession"]
+
+    def __init__(
+        self,
+        base_url: str,
+        oauth_base_url: str,
+        client_id: str,
+        client_secret: str,
+        logger: logging.Logger,
+        pool_config: Optional[PoolConfig] = None,
+        timeout_config: Optional[TimeoutConfig] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        token_refresh_ratio: float = DEFAULT_REFRESH_RATIO,
+        request_log_config: Optional[RequestLogConfig] = None,
+        is_debug: bool = False,
+        compression_config: Optional[CompressionConfig] = None,
+        circuit_breaker_config: Optional[CircuitBreakerConfig] = None,
+        rate_limit_config: Optional[RateLimitConfig] = None,
+    ):
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncHTTPClient requires aiohttp, install it with `pip install py-sat-sdk[async]`"
+            )
+
+        self._base_url = base_url
+        self._oauth_base_url = oauth_base_url
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._logger = logger
+        self._request_logger = RequestLogger(
+            logger, request_log_config, log_body=is_debug
+        )
+        self._pool_config = pool_config or PoolConfig()
+        self._timeout_config = timeout_config or TimeoutConfig(
+            default=Timeout(connect=DEFAULT_TIMEOUT, read=DEFAULT_TIMEOUT)
+        )
+        self._retry_policy = retry_policy
+        self._compression_config = compression_config
+        self._circuit_breakers = (
+            CircuitBreakerRegistry(circuit_breaker_config, logger)
+            if circuit_breaker_config is not None
+            else None
+        )
+        self._rate_limiter = (
+            RateLimiter(rate_limit_config) if rate_limit_config is not None else None
+        )
+        self._token_refresh_ratio = token_refresh_ratio
+        self._token_manager = AsyncTokenManager(self._fetch_token, logger)
+        # The session is bound to the running loop, it is created on first use
+        self._session = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._pool_config.pool_connections
+                * self._pool_config.pool_maxsize,
+                limit_per_host=self._pool_config.pool_maxsize,
+                keepalive_timeout=self._pool_config.idle_timeout or 15,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self):
+        """
+        Close the underlying connection pool
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def get_access_token(self, deadline: Optional[Deadline] = None) -> str:
+        """
+        Fetch a new access token using client credentials grant
+               :param deadline: deadline of the call that needs the token
+               :return: the access token
+               :raise UnauthenticatedException: if the OAuth server rejects the credentials
+        """
+        return (await self._fetch_token(deadline)).access_token
+
+    async def _fetch_token(self, deadline: Optional[Deadline] = None) -> AccessToken:
+        timeout = self._resolve_timeout(Endpoint.TOKEN, deadline)
+        try:
+            async with self._get_session().post(
+                self._oauth_base_url,
+                data={"grant_type": "client_credentials"},
+                headers={
+                    "Accept": "application/json",
+                    "Authorization": self._basic_auth_header(),
+                },
+                timeout=self._client_timeout(timeout),
+            ) as response:
+                body = await response.read()
+                if response.status >= 400:
+                    raise UnauthenticatedException(
+                        f"Failed to fetch access token: {response.status} {body!r}"
+                    )
+                token = await response.json(content_type=None)
+        except asyncio.TimeoutError as exc:
+            self._raise_if_deadline_exceeded(deadline, Endpoint.TOKEN, exc)
+            raise
+
+        return AccessToken.from_response(token, self._token_refresh_ratio)
+
+    def _basic_auth_header(self) -> str:
+        credentials = f"{self._client_id}:{self._client_secret}".encode("utf-8")
+        return f"Basic {base64.b64encode(credentials).decode('ascii')}"
+
+    async def ensure_access_token(self, deadline: Optional[Deadline] = None) -> str:
+        """
+        Return a valid access token, fetching it when missing or expired and refreshing it
+        in the background once it is close to expiry, await it on startup to warm up the client
+               :param deadline: deadline of the call that needs the token
+               :return: the access token
+        """
+        return await self._token_manager.get(deadline)
+
+    async def send_request(
+        self,
+        method: str,
+        url: str,
+        endpoint: Optional[Endpoint] = None,
+        deadline: Optional[Deadline] = None,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> requests.Response:
+        """
+        Sends a request and returns the response, converted to requests.Response
+        so every model and error handler of the SDK can be reused.
+                :param method: HTTP method
+                :param url: absolute url of the request
+                :param endpoint: SAT endpoint of the request, used to pick the endpoint timeout
+                :param deadline: deadline of the whole call, the socket timeouts and backoffs never outlive it
+                :param params: query parameters, None values are omitted
+                :param data: raw request body
+                :param headers: additional request headers
+                :return: requests.Response, retries done are recorded on the sat_retry_state attribute
+                :raise DeadlineExceededException: if the deadline passed before a response arrived
+        """
+        if params:
+            params = {k: v for k, v in params.items() if v is not None}
+
+        config = self._compression_config
+        if config is not None and config.should_compress(endpoint, data):
+            # Compressed once, retries and replays send the same bytes
+            data = config.compress(data)
+            headers = {**(headers or {}), "Content-Encoding": config.request_encoding}
+
+        if self._retry_policy is None or endpoint is None:
+            return await self._send(
+                method, url, endpoint, deadline, params, data, headers
+            )
+
+        policy = self._retry_policy
+        state = RetryState()
+        attempt = 1
+        while True:
+            try:
+                response = await self._send(
+                    method, url, endpoint, deadline, params, data, headers
+                )
+            except DeadlineExceededException:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                if attempt >= policy.max_attempts or not policy.should_retry_failure(
+                    endpoint, _is_connect_failure(exc)
+                ):
+                    raise
+                wait = policy.backoff(attempt)
+                if deadline is not None and deadline.remaining() <= wait:
+                    raise
+                self._logger.debug(
+                    "Retrying %s after %r, attempt %d", endpoint.value, exc, attempt
+                )
+            else:
+                if attempt >= policy.max_attempts or not policy.should_retry_response(
+                    endpoint, response
+                ):
+                    setattr(response, RETRY_STATE_ATTRIBUTE, state)
+                    return response
+                wait = policy.wait_for_response(response, attempt)
+                if deadline is not None and deadline.remaining() <= wait:
+                    setattr(response, RETRY_STATE_ATTRIBUTE, state)
+                    return response
+                self._logger.debug(
+                    "Retrying %s after status %d, attempt %d",
+                    endpoint.value,
+                    response.status_code,
+                    attempt,
+                )
+
+            await asyncio.sleep(wait)
+            state.retries += 1
+            state.backoff += wait
+            attempt += 1
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        endpoint: Optional[Endpoint],
+        deadline: Optional[Deadline],
+        params: Optional[Dict[str, Any]],
+        data: Optional[bytes],
+        headers: Optional[Dict[str, str]],
+    ) -> requests.Response:
+        access_token = await self.ensure_access_token(deadline)
+        response = await self._send_authorized(
+            method, url, endpoint, deadline, params, data, headers, access_token
+        )
+        if response.status_code != 401:
+            return response
+
+        # The token was revoked or expired early, refresh it once and replay the request
+        self._logger.debug("Access token rejected, replaying request with a new token")
+        self._token_manager.invalidate(access_token)
+        access_token = await self.ensure_access_token(deadline)
+        return await self._send_authorized(
+            method, url, endpoint, deadline, params, data, headers, access_token
+        )
+
+    async def _send_authorized(
+        self,
+        method: str,
+        url: str,
+        endpoint: Optional[Endpoint],
+        deadline: Optional[Deadline],
+        params: Optional[Dict[str, Any]],
+        data: Optional[bytes],
+        headers: Optional[Dict[str, str]],
+        access_token: str,
+    ) -> requests.Response:
+        request_headers = dict(headers or {})
+        request_headers["Content-Type"] = "application/json"
+        request_headers["Accept"] = "application/json"
+        request_headers["X-Sat-Sdk-Version"] = SDK_LABEL
+        request_headers["Authorization"] = f"Bearer {access_token}"
+        if self._compression_config is not None:
+            request_headers["Accept-Encoding"] = (
+                self._compression_config.accept_encoding_header()
+            )
+
+        if self._rate_limiter is not None:
+            wait = self._rate_limiter.reserve(endpoint, deadline)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+        timeout = self._resolve_timeout(endpoint, deadline)
+        breaker = self._get_circuit_breaker(endpoint)
+        if breaker is not None:
+            admission = breaker.before_call()
+
+        # Stamped after the rate limiter wait, Date is the time the request leaves
+        request_headers["Date"] = datetime.now(timezone.utc).strftime(DATE_TIME_FORMAT)
+        started = time.monotonic()
+        try:
+            async with self._get_session().request(
+                method,
+                url,
+                params=params,
+                data=data,
+                headers=request_headers,
+                timeout=self._client_timeout(timeout),
+            ) as response:
+                body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            if breaker is not None:
+                breaker.on_failure(admission, time.monotonic() - started)
+            if isinstance(exc, asyncio.TimeoutError):
+                self._raise_if_deadline_exceeded(deadline, endpoint, exc)
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.on_ignored(admission)
+            raise
+
+        elapsed = time.monotonic() - started
+        if breaker is not None:
+            if breaker.is_failure_status(response.status):
+                breaker.on_failure(admission, elapsed)
+            else:
+                breaker.on_success(admission, elapsed)
+
+        result = _to_requests_response(
+            method, str(response.url), request_headers, data, response, body
+        )
+        result.elapsed = timedelta(seconds=elapsed)
+        if self._rate_limiter is not None:
+            self._rate_limiter.observe(endpoint, result)
+        self._request_logger.log(result, endpoint, elapsed)
+        return result
+
+    def get_circuit_state(self, endpoint: Endpoint) -> CircuitState:
+        """
+        GetCircuitState returns the circuit breaker state of the endpoint, CLOSED when breakers are disabled
+                :param endpoint: the endpoint
+                :return: CircuitState
+        """
+        if self._circuit_breakers is None:
+            return CircuitState.CLOSED
+        return self._circuit_breakers.get_state(endpoint)
+
+    def _get_circuit_breaker(
+        self, endpoint: Optional[Endpoint]
+    ) -> Optional[CircuitBreaker]:
+        if self._circuit_breakers is None or endpoint is None:
+            return None
+        return self._circuit_breakers.get(endpoint)
+
+    def _resolve_timeout(
+        self, endpoint: Optional[Endpoint], deadline: Optional[Deadline]
+    ) -> Timeout:
+        timeout = self._timeout_config.for_endpoint(endpoint)
+        if deadline is None:
+            return timeout
+
+        deadline.check(endpoint.value if endpoint else "request")
+        return deadline.bound(timeout)
+
+    @staticmethod
+    def _client_timeout(timeout: Timeout) -> "aiohttp.ClientTimeout":
+        return aiohttp.ClientTimeout(
+            total=None, sock_connect=timeout.connect, sock_read=timeout.read
+        )
+
+    @staticmethod
+    def _raise_if_deadline_exceeded(
+        deadline: Optional[Deadline], endpoint: Optional[Endpoint], exc: Exception
+    ):
+        if deadline is not None and deadline.expired():
+            operation = endpoint.value if endpoint else "request"
+            raise DeadlineExceededException(
+                f"{operation} timed out before the deadline: {exc!r}"
+            ) from exc
+
+
+def _is_connect_failure(exc: Exception) -> bool:
+    connect_errors = (aiohttp.ClientConnectorError,)
+    if hasattr(aiohttp, "ConnectionTimeoutError"):
+        connect_errors += (aiohttp.ConnectionTimeoutError,)
+    return isinstance(exc, connect_errors)
+
+
+def _to_requests_response(
+    method: str,
+    url: str,
+    request_headers: Dict[str, str],
+    request_body: Optional[bytes],
+    response: "aiohttp.ClientResponse",
+    body: bytes,
+) -> requests.Response:
+    prepared = requests.PreparedRequest()
+    prepared.method = method
+    prepared.url = url
+    prepared.headers = CaseInsensitiveDict(request_headers)
+    prepared.body = request_body
+
+    result = requests.Response()
+    result.status_code = response.status
+    result.reason = response.reason
+    result.headers = CaseInsensitiveDict(response.headers)
+    result.url = url
+    result.request = prepared
+    result._content = body
+    result.encoding = response.charset
+    return result
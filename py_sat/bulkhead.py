@@ -0,0 +1,227 @@
+"""
+bulkhead package contains the bulkheads isolating checkout traffic from read traffic in HTTPClient.
+
+Every endpoint class gets its own connection pool and its own limit of in-flight requests,
+so a catalog refresh or a flood of check status polls can never take the sockets checkout needs.
+Time spent queueing for a slot is recorded per class.
+"""
+
+import enum
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Dict, FrozenSet, List, Optional
+
+import requests
+
+from py_sat.constant import Endpoint
+from py_sat.exceptions import BulkheadFullException, DeadlineExceededException
+from py_sat.pool import PoolConfig, PooledHTTPAdapter, PoolStats
+from py_sat.timeout import Deadline
+
+
+class BulkheadClass(enum.Enum):
+    CHECKOUT = "checkout"
+    READ = "read"
+
+
+# Inquiry precedes checkout for inquiry products, it is part of the purchase
+DEFAULT_CHECKOUT_ENDPOINTS = frozenset({Endpoint.CHECKOUT, Endpoint.INQUIRY})
+
+
+@dataclass
+class BulkheadConfig:
+    """
+    BulkheadConfig configures the bulkheads of HTTPClient
+
+    :param checkout_max_in_flight: concurrent requests and pooled connections of the checkout class
+    :param read_max_in_flight: concurrent requests and pooled connections of the read class
+    :param max_queue_wait: seconds a request may wait for a slot, None waits as long as the deadline allows
+    :param checkout_endpoints: endpoints of the checkout class, every other endpoint is a read
+    """
+
+    checkout_max_in_flight: int = 10
+    read_max_in_flight: int = 5
+    max_queue_wait: Optional[float] = None
+    checkout_endpoints: FrozenSet[Endpoint] = field(
+        default_factory=lambda: DEFAULT_CHECKOUT_ENDPOINTS
+    )
+
+    def classify(self, endpoint: Endpoint) -> BulkheadClass:
+        if endpoint in self.checkout_endpoints:
+            return BulkheadClass.CHECKOUT
+        return BulkheadClass.READ
+
+    def max_in_flight(self, bulkhead_class: BulkheadClass) -> int:
+        if bulkhead_class == BulkheadClass.CHECKOUT:
+            return self.checkout_max_in_flight
+        return self.read_max_in_flight
+
+
+@dataclass
+class BulkheadStats:
+    """
+    BulkheadStats is a snapshot of the usage of one bulkhead
+
+    :param max_in_flight: configured limit of concurrent requests
+    :param in_flight: requests currently holding a slot
+    :param calls: requests that got a slot
+    :param queued: requests that had to wait for a slot
+    :param rejected: requests that gave up waiting for a slot
+    :param queue_wait_total: cumulative seconds spent waiting for a slot
+    :param queue_wait_max: longest wait for a slot in seconds
+    :param pool: connection pool usage of the bulkhead
+    """
+
+    max_in_flight: int = 0
+    in_flight: int = 0
+    calls: int = 0
+    queued: int = 0
+    rejected: int = 0
+    queue_wait_total: float = 0.0
+    queue_wait_max: float = 0.0
+    pool: PoolStats = field(default_factory=PoolStats)
+
+    @property
+    def queue_wait_avg(self) -> float:
+        return self.queue_wait_total / self.calls if self.calls else 0.0
+
+
+class Bulkhead:
+    """
+    Bulkhead limits the in-flight requests of one endpoint class and owns its connection pool, thread-safe
+    """
+
+    bulkhead_class: BulkheadClass
+    adapter: PooledHTTPAdapter
+    _max_queue_wait: Optional[float]
+    _slots: threading.BoundedSemaphore
+    _lock: threading.Lock
+    _stats: BulkheadStats
+
+    def __init__(
+        self,
+        bulkhead_class: BulkheadClass,
+        max_in_flight: int,
+        max_queue_wait: Optional[float],
+        pool_config: PoolConfig,
+    ):
+        """
+        :param bulkhead_class: endpoint class guarded by the bulkhead
+        :param max_in_flight: concurrent requests allowed, also the size of the connection pool
+        :param max_queue_wait: seconds a request may wait for a slot, None for no bound
+        :param pool_config: connection pool settings, the pool size is replaced by max_in_flight
+        """
+        self.bulkhead_class = bulkhead_class
+        self.adapter = PooledHTTPAdapter(
+            replace(pool_config, pool_maxsize=max_in_flight)
+        )
+        self._max_queue_wait = max_queue_wait
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._stats = BulkheadStats(max_in_flight=max_in_flight)
+
+    def acquire(self, endpoint: Endpoint, deadline: Optional[Deadline] = None):
+        """
+        Take a slot, to be given back with release once the connection is back in the pool
+               :param endpoint: endpoint of the request
+               :param deadline: deadline of the call, the wait never outlives it
+               :raise BulkheadFullException: if no slot freed up within max_queue_wait
+               :raise DeadlineExceededException: if the deadline passed while waiting
+        """
+        if self._slots.acquire(blocking=False):
+            self._record(0.0, queued=False)
+            return
+
+        timeout = self._max_queue_wait
+        if deadline is not None:
+            remaining = deadline.remaining()
+            timeout = remaining if timeout is None else min(timeout, remaining)
+
+        started = time.monotonic()
+        acquired = self._slots.acquire(timeout=timeout)
+        waited = time.monotonic() - started
+        if acquired:
+            self._record(waited, queued=True)
+            return
+
+        with self._lock:
+            self._stats.rejected += 1
+        if deadline is not None and deadline.expired():
+            raise DeadlineExceededException(
+                f"{endpoint.value} waited {waited:.3f}s for a {self.bulkhead_class.value} slot"
+            )
+        raise BulkheadFullException(self.bulkhead_class, waited)
+
+    def release(self):
+        with self._lock:
+            self._stats.in_flight -= 1
+        self._slots.release()
+
+    def release_on_close(self, response: requests.Response):
+        """
+        Keep the slot of a streamed response until the response is closed,
+        the connection only goes back to the pool at that point
+               :param response: streamed response
+        """
+        close = response.close
+        released = threading.Event()
+
+        def close_and_release():
+            try:
+                close()
+            finally:
+                if not released.is_set():
+                    released.set()
+                    self.release()
+
+        response.close = close_and_release
+
+    def get_stats(self) -> BulkheadStats:
+        with self._lock:
+            stats = replace(self._stats)
+        stats.pool = self.adapter.get_stats()
+        return stats
+
+    def _record(self, waited: float, queued: bool):
+        with self._lock:
+            stats = self._stats
+            stats.in_flight += 1
+            stats.calls += 1
+            if queued:
+                stats.queued += 1
+                stats.queue_wait_total += waited
+                stats.queue_wait_max = max(stats.queue_wait_max, waited)
+
+
+class BulkheadRegistry:
+    """
+    BulkheadRegistry holds the bulkhead of every endpoint class
+    """
+
+    _config: BulkheadConfig
+    _bulkheads: Dict[BulkheadClass, Bulkhead]
+
+    def __init__(self, config: BulkheadConfig, pool_config: PoolConfig):
+        self._config = config
+        self._bulkheads = {
+            bulkhead_class: Bulkhead(
+                bulkhead_class,
+                config.max_in_flight(bulkhead_class),
+                config.max_queue_wait,
+                pool_config,
+            )
+            for bulkhead_class in BulkheadClass
+        }
+
+    def get(self, endpoint: Endpoint) -> Bulkhead:
+        return self._bulkheads[self._config.classify(endpoint)]
+
+    def all(self) -> List[Bulkhead]:
+        return list(self._bulkheads.values())
+
+    def get_stats(self) -> Dict[BulkheadClass, BulkheadStats]:
+        return {
+            bulkhead_class: bulkhead.get_stats()
+            for bulkhead_class, bulkhead in self._bulkheads.items()
+        }
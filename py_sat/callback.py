@@ -0,0 +1,301 @@
+"""
+callback package contains the helpers shared by the SAT webhook handlers of SATClient and AsyncSATClient.
+
+SAT delivers a callback again when it is not acknowledged in time. The dedup cache remembers the callbacks
+already verified and handled, by the SHA-256 of their body and their signature, so a redelivery is
+recognized without an RSA verification and without handling the order twice. A redelivery arriving while
+the first delivery is still being handled is rejected with CallbackInFlightException, it is never
+acknowledged before the outcome of the first delivery is known.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator, Mapping, Optional, Tuple, Union
+
+from py_sat.constant import SIGNATURE_HEADER_KEY
+from py_sat.exceptions import CallbackInFlightException, InvalidInputException
+from py_sat.models import OrderDetail
+from py_sat.utils import parse_json_api_response
+
+
+def get_callback_signature(headers: Mapping[str, Any]) -> str:
+    """
+    Get the signature header of a SAT webhook
+
+    :param headers: HTTP headers from SAT webhook
+    :return: the signature
+    :raise InvalidInputException: if the header does not contain the signature
+    """
+    signature: Optional[str] = headers.get(SIGNATURE_HEADER_KEY) or headers.get(
+        SIGNATURE_HEADER_KEY.capitalize()
+    )
+    if signature is None:
+        raise InvalidInputException(
+            "Signature is not present in the header, please check the request"
+        )
+    return signature
+
+
+def get_callback_key_id(
+    headers: Mapping[str, Any], header: Optional[str]
+) -> Optional[str]:
+    """
+    Get the key id hint of a SAT webhook, the header name is matched case-insensitively
+
+    :param headers: HTTP headers from SAT webhook
+    :param header: key id header name, None when no hint is used
+    :return: the key id, None when absent
+    """
+    if not header:
+        return None
+
+    key_id = headers.get(header)
+    if key_id is None:
+        lowered = header.lower()
+        key_id = next(
+            (value for name, value in headers.items() if name.lower() == lowered),
+            None,
+        )
+    return key_id
+
+
+def parse_callback_body(body: bytes) -> OrderDetail:
+    """
+    Parse the raw body of a SAT webhook, once its signature is verified
+
+    :param body: raw HTTP body of the SAT webhook
+    :return: OrderDetail
+    :raise InvalidInputException: if the body is not valid JSON
+    """
+    try:
+        sat_response_data = json.loads(body)
+    except ValueError as exc:
+        raise InvalidInputException(f"Callback body is not valid JSON: {exc}")
+
+    return OrderDetail.from_dict(parse_json_api_response(sat_response_data))
+
+
+DEFAULT_CALLBACK_DEDUP_SIZE = 10000
+DEFAULT_CALLBACK_DEDUP_TTL = 600.0
+
+CallbackKey = Tuple[bytes, str]
+
+
+@dataclass
+class CallbackDedupConfig:
+    """
+    CallbackDedupConfig configures the callback dedup cache
+
+    :param max_size: callbacks remembered, the least recently seen ones are evicted first
+    :param ttl: seconds a callback is remembered, should cover the SAT redelivery window
+    :param skip_redelivery: True to not call the handler on a redelivery, False to call it
+        with an OrderDetail flagged by is_redelivery()
+    """
+
+    max_size: int = DEFAULT_CALLBACK_DEDUP_SIZE
+    ttl: float = DEFAULT_CALLBACK_DEDUP_TTL
+    skip_redelivery: bool = True
+
+
+@dataclass
+class CallbackDedupStats:
+    """
+    CallbackDedupStats is a snapshot of the callback dedup cache
+
+    :param hits: redeliveries recognized, including the ones rejected while the first delivery was
+        being handled, without an RSA verification unless they arrived while it was being verified
+    :param misses: callbacks not seen before, or seen longer than the TTL ago
+    :param size: callbacks remembered
+    """
+
+    hits: int = 0
+    misses: int = 0
+    size: int = 0
+
+
+class CallbackDedupCache:
+    """
+    CallbackDedupCache is a bounded LRU of the claimed and handled callbacks with a TTL, thread-safe
+    """
+
+    _config: CallbackDedupConfig
+    _lock: threading.Lock
+    # order id, expiry and whether the handler completed
+    _entries: "OrderedDict[CallbackKey, Tuple[str, float, bool]]"
+    _hits: int
+    _misses: int
+
+    def __init__(self, config: CallbackDedupConfig):
+        self._config = config
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def skip_redelivery(self) -> bool:
+        return self._config.skip_redelivery
+
+    @staticmethod
+    def key(body: Union[str, bytes], signature: str) -> CallbackKey:
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return hashlib.sha256(body).digest(), signature
+
+    def get(self, key: CallbackKey) -> Optional[str]:
+        """
+        Get the order id of a callback already handled
+               :param key: callback key
+               :return: the order id, None when the callback was not handled within the TTL
+               :raise CallbackInFlightException: if a delivery of the callback is still being handled
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            if not entry[2]:
+                raise CallbackInFlightException(entry[0])
+            return entry[0]
+
+    def claim(self, key: CallbackKey, order_id: str) -> bool:
+        """
+        Remember a callback once it is verified, before it is handled, so a redelivery arriving
+        while the handler runs is recognized. When a concurrent delivery of the same callback claimed
+        it first, the miss counted by get for this one turns into a hit
+               :param key: callback key
+               :param order_id: id of the order of the callback
+               :return: True if claimed, False if the callback was handled meanwhile
+               :raise CallbackInFlightException: if a concurrent delivery claimed it and is still handling it
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                self._misses = max(self._misses - 1, 0)
+                if not entry[2]:
+                    raise CallbackInFlightException(entry[0])
+                return False
+
+            self._entries[key] = (order_id, now + self._config.ttl, False)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._config.max_size:
+                self._entries.popitem(last=False)
+            return True
+
+    def complete(self, key: CallbackKey):
+        """
+        Mark a claimed callback as handled, its redeliveries are skipped or flagged from now on
+               :param key: callback key
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], entry[1], True)
+
+    def release(self, key: CallbackKey):
+        """
+        Forget a claimed callback whose handler failed, so its redelivery is handled again
+               :param key: callback key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_stats(self) -> CallbackDedupStats:
+        with self._lock:
+            return CallbackDedupStats(
+                hits=self._hits, misses=self._misses, size=len(self._entries)
+            )
+
+
+class CallbackDelivery:
+    """
+    CallbackDelivery is one delivery of a SAT webhook going through the dedup cache, the steps shared by
+    SATClient and AsyncSATClient around their own signature verification and handler call
+    """
+
+    signature: str
+    key_id: Optional[str]
+    redelivery: bool
+    _dedup: Optional[CallbackDedupCache]
+    _key: Optional[CallbackKey]
+    _claimed: bool
+
+    def __init__(
+        self,
+        body: Union[str, bytes],
+        headers: Mapping[str, Any],
+        key_id_header: Optional[str],
+        dedup: Optional[CallbackDedupCache],
+    ):
+        """
+        :param body: body the signature is verified on
+        :param headers: HTTP headers from SAT webhook
+        :param key_id_header: key id header name, None when no hint is used
+        :param dedup: dedup cache, None when it is not enabled
+        :raise InvalidInputException: if the header does not contain the signature
+        :raise CallbackInFlightException: if another delivery of the callback is still being handled
+        """
+        self.signature = get_callback_signature(headers)
+        self.key_id = get_callback_key_id(headers, key_id_header)
+        self.redelivery = False
+        self._dedup = dedup
+        self._key = None
+        self._claimed = False
+        if dedup is not None:
+            self._key = dedup.key(body, self.signature)
+            self.redelivery = dedup.get(self._key) is not None
+
+    @property
+    def skipped(self) -> bool:
+        """
+        True when the handler must not be called, the callback was already handled
+        """
+        return self.redelivery and self._dedup.skip_redelivery
+
+    @property
+    def needs_verification(self) -> bool:
+        # A redelivery has the body and the signature of a callback already verified
+        return not self.redelivery
+
+    def claim(self, order_detail: OrderDetail) -> Optional[OrderDetail]:
+        """
+        Claim the verified callback before its handler runs, so a redelivery arriving meanwhile is not handled twice
+               :param order_detail: parsed callback
+               :return: the order detail to handle, flagged when a redelivery, None when skipped
+               :raise CallbackInFlightException: if a concurrent delivery claimed it and is still handling it
+        """
+        if self._key is not None and not self.redelivery:
+            self._claimed = self._dedup.claim(self._key, order_detail.id)
+            self.redelivery = not self._claimed
+        if self.skipped:
+            return None
+        return order_detail.with_redelivery(self.redelivery)
+
+    @contextmanager
+    def handling(self) -> Iterator[None]:
+        """
+        Wrap the handler call, the claim is completed when it returns and released when it raises,
+        a callback whose handler failed is handled again on redelivery
+        """
+        try:
+            yield
+        except BaseException:
+            if self._claimed:
+                self._dedup.release(self._key)
+            raise
+        if self._claimed:
+            self._dedup.complete(self._key)
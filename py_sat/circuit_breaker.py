@@ -0,0 +1,264 @@
+"""
+circuit_breaker package contains the per-endpoint circuit breakers of HTTPClient.
+With several SAT base URLs every base URL gets its own breakers, a dead one never blocks the others.
+
+A breaker opens when the failure rate or the slow call rate of the last calls crosses its threshold,
+calls then fail fast with CircuitOpenException instead of waiting on a degraded SAT.
+After open_duration a few probe calls are let through, their outcome closes or reopens the breaker.
+"""
+
+import enum
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, FrozenSet, List, Optional, Tuple
+
+from py_sat.constant import Endpoint
+from py_sat.exceptions import CircuitOpenException
+
+DEFAULT_FAILURE_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class CircuitState(enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# From the most to the least available
+_STATE_ORDER = [CircuitState.CLOSED, CircuitState.HALF_OPEN, CircuitState.OPEN]
+
+StateChangeHook = Callable[[Endpoint, Optional[str], CircuitState, CircuitState], None]
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """
+    CircuitBreakerConfig configures the circuit breaker of every endpoint
+
+    :param failure_rate_threshold: open when this fraction of the window failed
+    :param slow_call_rate_threshold: open when this fraction of the window was slow
+    :param slow_call_duration: seconds after which a call is slow, None disables slow call tracking
+    :param window_size: number of most recent calls the rates are computed on
+    :param minimum_calls: calls needed in the window before the rates are evaluated
+    :param open_duration: seconds the breaker stays open before probing
+    :param half_open_max_calls: probe calls allowed while half-open, all must succeed to close
+    :param failure_statuses: HTTP statuses counted as failures, transport errors always are
+    :param on_state_change: hooks called with the endpoint, the base URL or None, the old and the new state
+    """
+
+    failure_rate_threshold: float = 0.5
+    slow_call_rate_threshold: float = 1.0
+    slow_call_duration: Optional[float] = None
+    window_size: int = 20
+    minimum_calls: int = 10
+    open_duration: float = 30.0
+    half_open_max_calls: int = 3
+    failure_statuses: FrozenSet[int] = field(
+        default_factory=lambda: DEFAULT_FAILURE_STATUSES
+    )
+    on_state_change: List[StateChangeHook] = field(default_factory=list)
+
+
+class CircuitBreaker:
+    """
+    CircuitBreaker guards one endpoint, of one base URL when failover is enabled, thread-safe
+    """
+
+    _endpoint: Endpoint
+    _base_url: Optional[str]
+    _config: CircuitBreakerConfig
+    _logger: logging.Logger
+    _lock: threading.Lock
+    _state: CircuitState
+    _window: Deque[Tuple[bool, bool]]
+    _opened_at: float
+    _generation: int
+    _probes_in_flight: int
+    _probes_succeeded: int
+
+    def __init__(
+        self,
+        endpoint: Endpoint,
+        config: CircuitBreakerConfig,
+        logger: logging.Logger,
+        base_url: Optional[str] = None,
+    ):
+        self._endpoint = endpoint
+        self._base_url = base_url
+        self._config = config
+        self._logger = logger
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._window = deque(maxlen=config.window_size)
+        self._opened_at = 0.0
+        self._generation = 0
+        self._probes_in_flight = 0
+        self._probes_succeeded = 0
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def before_call(self) -> int:
+        """
+        Reserve a call, to be followed by exactly one of on_success, on_failure or on_ignored
+               :return: admission token, to be passed back with the outcome of the call
+               :raise CircuitOpenException: if the breaker is open or all probes are in flight
+        """
+        transition = None
+        with self._lock:
+            if self._state == CircuitState.OPEN:
+                remaining = (
+                    self._opened_at + self._config.open_duration - time.monotonic()
+                )
+                if remaining > 0:
+                    raise CircuitOpenException(
+                        self._endpoint, remaining, self._base_url
+                    )
+                transition = self._transition(CircuitState.HALF_OPEN)
+
+            if self._state == CircuitState.HALF_OPEN:
+                if self._probes_in_flight >= self._config.half_open_max_calls:
+                    raise CircuitOpenException(self._endpoint, 0.0, self._base_url)
+                self._probes_in_flight += 1
+            admission = self._generation
+
+        self._notify(transition)
+        return admission
+
+    def on_success(self, admission: int, duration: float):
+        self._record(admission, failed=False, duration=duration)
+
+    def on_failure(self, admission: int, duration: float):
+        self._record(admission, failed=True, duration=duration)
+
+    def on_ignored(self, admission: int):
+        """
+        Release a call whose outcome says nothing about SAT health
+        """
+        with self._lock:
+            if admission == self._generation and self._state == CircuitState.HALF_OPEN:
+                self._probes_in_flight -= 1
+
+    def is_failure_status(self, status_code: int) -> bool:
+        return status_code in self._config.failure_statuses
+
+    def _record(self, admission: int, failed: bool, duration: float):
+        config = self._config
+        slow = (
+            config.slow_call_duration is not None
+            and duration >= config.slow_call_duration
+        )
+        transition = None
+        with self._lock:
+            # A call admitted before the last transition says nothing about the current state,
+            # e.g. a call admitted while closed is not a probe when it ends during half-open
+            if admission != self._generation:
+                pass
+            elif self._state == CircuitState.HALF_OPEN:
+                self._probes_in_flight -= 1
+                if failed or slow:
+                    transition = self._transition(CircuitState.OPEN)
+                else:
+                    self._probes_succeeded += 1
+                    if self._probes_succeeded >= config.half_open_max_calls:
+                        transition = self._transition(CircuitState.CLOSED)
+            elif self._state == CircuitState.CLOSED:
+                self._window.append((failed, slow))
+                if self._should_open():
+                    transition = self._transition(CircuitState.OPEN)
+
+        self._notify(transition)
+
+    def _should_open(self) -> bool:
+        calls = len(self._window)
+        if calls < self._config.minimum_calls:
+            return False
+
+        failures = sum(1 for failed, _ in self._window if failed)
+        slow_calls = sum(1 for _, slow in self._window if slow)
+        return (
+            failures / calls >= self._config.failure_rate_threshold
+            or slow_calls / calls >= self._config.slow_call_rate_threshold
+        )
+
+    def _transition(
+        self, state: CircuitState
+    ) -> Optional[Tuple[CircuitState, CircuitState]]:
+        previous, self._state = self._state, state
+        self._generation += 1
+        self._window.clear()
+        self._probes_in_flight = 0
+        self._probes_succeeded = 0
+        if state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        return previous, state
+
+    def _notify(self, transition: Optional[Tuple[CircuitState, CircuitState]]):
+        # Hooks run outside the lock, a slow or failing hook never blocks the breaker
+        if transition is None:
+            return
+
+        previous, state = transition
+        self._logger.warning(
+            "Circuit breaker of %s%s changed from %s to %s",
+            self._endpoint.value,
+            f" on {self._base_url}" if self._base_url else "",
+            previous.value,
+            state.value,
+        )
+        for hook in self._config.on_state_change:
+            try:
+                hook(self._endpoint, self._base_url, previous, state)
+            except Exception as exc:
+                self._logger.warning("Error in circuit breaker hook: %s", exc)
+
+
+class CircuitBreakerRegistry:
+    """
+    CircuitBreakerRegistry holds one CircuitBreaker per endpoint and base URL, created on first use
+    """
+
+    _config: CircuitBreakerConfig
+    _logger: logging.Logger
+    _lock: threading.Lock
+    _breakers: Dict[Tuple[Endpoint, Optional[str]], CircuitBreaker]
+
+    def __init__(self, config: CircuitBreakerConfig, logger: logging.Logger):
+        self._config = config
+        self._logger = logger
+        self._lock = threading.Lock()
+        self._breakers = {}
+
+    def get(self, endpoint: Endpoint, base_url: Optional[str] = None) -> CircuitBreaker:
+        key = (endpoint, base_url)
+        breaker = self._breakers.get(key)
+        if breaker is not None:
+            return breaker
+
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(
+                    endpoint, self._config, self._logger, base_url
+                )
+            return self._breakers[key]
+
+    def get_state(
+        self, endpoint: Endpoint, base_url: Optional[str] = None
+    ) -> CircuitState:
+        if base_url is not None:
+            breaker = self._breakers.get((endpoint, base_url))
+            return breaker.state if breaker is not None else CircuitState.CLOSED
+
+        # The endpoint is only unavailable when it is unavailable on every base URL
+        states = [
+            breaker.state
+            for (breaker_endpoint, _), breaker in list(self._breakers.items())
+            if breaker_endpoint == endpoint
+        ]
+        if not states:
+            return CircuitState.CLOSED
+        return min(states, key=_STATE_ORDER.index)
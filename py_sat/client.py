@@ -4,25 +4,79 @@ client package contains the main class to interact with the SAT service.
 
 import json
 import logging
-from typing import Any, Callable, Dict, Optional, Union
+import os
+import time
+from typing import (Any, Callable, Dict, FrozenSet, Iterator, List, Mapping,
+                    Optional, Tuple, Union)
 
 import requests
 from requests.exceptions import HTTPError
 
+from py_sat.bulkhead import DEFAULT_CHECKOUT_ENDPOINTS, BulkheadConfig
+from py_sat.callback import (DEFAULT_CALLBACK_DEDUP_SIZE,
+                             DEFAULT_CALLBACK_DEDUP_TTL, CallbackDedupCache,
+                             CallbackDedupConfig, CallbackDedupStats,
+                             CallbackDelivery, parse_callback_body)
+from py_sat.circuit_breaker import CircuitBreakerConfig, StateChangeHook
+from py_sat.compression import (SUPPORTED_REQUEST_ENCODINGS,
+                                SUPPORTED_RESPONSE_ENCODINGS,
+                                CompressionConfig)
 from py_sat.constant import (ACCESS_TOKEN_URL, ACCOUNT_PATH, CHECK_STATUS_PATH,
                              CHECKOUT_PATH, INQUIRY_PATH, PING_PATH,
-                             PLAYGROUND_SAT_BASE_URL, PRODUCT_LIST_PATH)
-from py_sat.exceptions import (GeneralException, InvalidInputException,
+                             PLAYGROUND_SAT_BASE_URL, PRODUCT_LIST_PATH,
+                             PRODUCT_STREAM_CHUNK_SIZE, SIGNATURE_HEADER_KEY,
+                             SIGNATURE_KEY_ID_HEADER_KEY,
+                             SIGNED_BODY_ATTRIBUTE, Endpoint)
+from py_sat.exceptions import (BulkheadFullException, CircuitOpenException,
+                               DeadlineExceededException, GeneralException,
+                               InvalidInputException,
+                               RateLimitExceededException,
                                ResponseGeneralException,
                                UnauthenticatedException)
+from py_sat.failover import FailoverConfig
+from py_sat.hedge import DEFAULT_HEDGED_ENDPOINTS, HedgePolicy
 from py_sat.http_client import HTTPClient
 from py_sat.models import (Account, ErrorResponse, InquiryRequest,
                            InquiryResponse, OrderDetail, OrderRequest,
                            PartnerProduct, PingResponse, ProductListResponse)
-from py_sat.signature import Signature, SignatureType
-from py_sat.utils import (generate_json_api_request,
+from py_sat.pool import PoolConfig
+from py_sat.rate_limit import RateLimit, RateLimitConfig
+from py_sat.request_log import RequestLogConfig
+from py_sat.retry import IDEMPOTENT_ENDPOINTS, RetryPolicy
+from py_sat.signature import Signature, SignatureBackend, SignatureType
+from py_sat.signature.keys import KeySource
+from py_sat.signature.pool import DEFAULT_CHUNK_SIZE, SignaturePoolConfig
+from py_sat.timeout import Deadline, Timeout, TimeoutConfig
+from py_sat.token import DEFAULT_REFRESH_RATIO
+from py_sat.token_store import TokenStore
+from py_sat.utils import (encode_json_request, generate_json_api_request,
+                          iter_json_api_list_response,
                           parse_json_api_list_response,
                           parse_json_api_response)
+from py_sat.warmup import (DEFAULT_WARMUP_CONNECTIONS, WARMUP_MESSAGE,
+                           WarmupReport, warm_up_decoders)
+
+# Raised by the resilience layers without a SAT response, the client methods let them through
+# instead of wrapping them in GeneralException
+_PASSTHROUGH_EXCEPTIONS = (
+    DeadlineExceededException,
+    CircuitOpenException,
+    RateLimitExceededException,
+    BulkheadFullException,
+)
+
+
+def _handle_http_error(exc: HTTPError, logger: logging.Logger) -> ErrorResponse:
+    # Shared by SATClient and AsyncSATClient, SAT answers errors with a JSON API error body
+    try:
+        status = exc.response.status_code
+        message = exc.response.text
+        logger.debug("HTTP Error: %s, %s", status, message)
+
+        data = exc.response.json()
+        return ErrorResponse.from_dict(data).with_raw_response(exc.response)
+    except Exception:
+        raise ResponseGeneralException(exc)
 
 
 class SATClientConfig:
@@ -33,23 +87,40 @@ class SATClientConfig:
     # Required
     client_id: str
     client_secret: str
-    private_key: str
-    sat_public_key: str
+    private_key: KeySource
+    sat_public_key: KeySource
 
     # Optional
     padding_type: SignatureType
+    signature_backend: SignatureBackend
+    sat_public_keys: Dict[str, KeySource]
+    sat_key_id_header: Optional[str]
+    signature_pool_config: Optional[SignaturePoolConfig]
+    callback_dedup_config: Optional[CallbackDedupConfig]
     is_debug: bool
     sat_base_url: str
     access_token_base_url: str
     timeout: int
+    endpoint_timeouts: Dict[Endpoint, Timeout]
     logger: logging.Logger
+    pool_config: PoolConfig
+    retry_policy: Optional[RetryPolicy]
+    token_refresh_ratio: float
+    token_store: Optional[TokenStore]
+    request_log_config: RequestLogConfig
+    compression_config: Optional[CompressionConfig]
+    circuit_breaker_config: Optional[CircuitBreakerConfig]
+    hedge_policy: Optional[HedgePolicy]
+    rate_limit_config: Optional[RateLimitConfig]
+    bulkhead_config: Optional[BulkheadConfig]
+    failover_config: Optional[FailoverConfig]
 
     def __init__(
         self,
         client_id: str,
         client_secret: str,
-        private_key: str,
-        sat_public_key: str,
+        private_key: KeySource,
+        sat_public_key: KeySource,
     ):
         if not client_id or not isinstance(client_id, str):
             raise InvalidInputException("Client ID are required and must be a string")
@@ -59,11 +130,17 @@ class SATClientConfig:
                 "Client Secret are required and must be a string"
             )
 
-        if not private_key or not isinstance(private_key, str):
-            raise InvalidInputException("Private key is required and must be a string")
+        if not private_key or not isinstance(private_key, (str, bytes, os.PathLike)):
+            raise InvalidInputException(
+                "Private key is required and must be a PEM string, PEM or DER bytes or a file path"
+            )
 
-        if not sat_public_key or not isinstance(sat_public_key, str):
-            raise InvalidInputException("Public key is required and must be a string")
+        if not sat_public_key or not isinstance(
+            sat_public_key, (str, bytes, os.PathLike)
+        ):
+            raise InvalidInputException(
+                "Public key is required and must be a PEM string, PEM or DER bytes or a file path"
+            )
 
         self.client_id = client_id
         self.client_secret = client_secret
@@ -73,16 +150,31 @@ class SATClientConfig:
         self._set_default_value()
 
     def _set_default_value(self):
-        logger: logging.Logger
-        logger = logging.getLogger(__name__)
-        logger.setLevel(logging.DEBUG)
-        self.logger = logger
+        # The level is left to the application logging configuration
+        self.logger = logging.getLogger(__name__)
 
         self.padding_type = SignatureType.PSS
+        self.signature_backend = SignatureBackend.AUTO
+        self.sat_public_keys = {}
+        self.sat_key_id_header = SIGNATURE_KEY_ID_HEADER_KEY
+        self.signature_pool_config = None
+        self.callback_dedup_config = None
         self.is_debug = False
         self.sat_base_url = PLAYGROUND_SAT_BASE_URL
         self.access_token_base_url = ACCESS_TOKEN_URL
         self.timeout = 30
+        self.endpoint_timeouts = {}
+        self.pool_config = PoolConfig()
+        self.retry_policy = None
+        self.token_refresh_ratio = DEFAULT_REFRESH_RATIO
+        self.token_store = None
+        self.request_log_config = RequestLogConfig()
+        self.compression_config = None
+        self.circuit_breaker_config = None
+        self.hedge_policy = None
+        self.rate_limit_config = None
+        self.bulkhead_config = None
+        self.failover_config = None
 
     def with_logger(self, logger: logging.Logger):
         self.logger = logger
@@ -92,22 +184,444 @@ class SATClientConfig:
         self.padding_type = padding_type
         return self
 
+    def with_signature_backend(self, backend: SignatureBackend):
+        """
+        Select the library running the RSA operations, both produce and accept the same signatures
+               :param backend: OPENSSL requires the cryptography package, AUTO uses it when installed
+                and falls back to pycryptodome otherwise
+        """
+        if not isinstance(backend, SignatureBackend):
+            raise InvalidInputException(f"Unknown signature backend: {backend}")
+        self.signature_backend = backend
+        return self
+
+    def with_sat_public_keys(
+        self,
+        sat_public_keys: Dict[str, KeySource],
+        key_id_header: Optional[str] = SIGNATURE_KEY_ID_HEADER_KEY,
+    ):
+        """
+        Verify SAT signatures with a keyring, to accept both keys during a SAT key rotation.
+        The keys are tried most recently successful first, so a settled rotation costs one verification again
+               :param sat_public_keys: SAT public keys by key id, in addition to sat_public_key
+               :param key_id_header: header naming the key SAT signed with, tried first when present,
+                None to always try the keys in order
+        """
+        if not isinstance(sat_public_keys, dict) or not all(
+            key_id
+            and isinstance(key_id, str)
+            and key
+            and isinstance(key, (str, bytes, os.PathLike))
+            for key_id, key in sat_public_keys.items()
+        ):
+            raise InvalidInputException(
+                "SAT public keys must be a dictionary of key id to keys"
+            )
+
+        if key_id_header is not None and (
+            not key_id_header or not isinstance(key_id_header, str)
+        ):
+            raise InvalidInputException("Key id header must be a non-empty string")
+
+        self.sat_public_keys = dict(sat_public_keys)
+        self.sat_key_id_header = key_id_header
+        return self
+
+    def with_signature_pool(
+        self, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        """
+        Run Signature.sign_many and Signature.verify_many in a pool of worker processes,
+        each worker loads the keys once. The workers start on the first bulk operation
+               :param workers: worker processes, None uses one per CPU
+               :param chunk_size: messages sent to a worker at once
+        """
+        if workers is not None and workers <= 0:
+            raise InvalidInputException("Workers must be greater than zero")
+
+        if chunk_size <= 0:
+            raise InvalidInputException("Chunk size must be greater than zero")
+
+        self.signature_pool_config = SignaturePoolConfig(
+            workers=workers, chunk_size=chunk_size
+        )
+        return self
+
+    def with_callback_dedup(
+        self,
+        max_size: int = DEFAULT_CALLBACK_DEDUP_SIZE,
+        ttl: float = DEFAULT_CALLBACK_DEDUP_TTL,
+        skip_redelivery: bool = True,
+    ):
+        """
+        Recognize the callbacks SAT delivers again, by the SHA-256 of their body and their signature,
+        a redelivery is not verified again and the handler is skipped or told it is a redelivery
+               :param max_size: callbacks remembered, the least recently seen ones are evicted first
+               :param ttl: seconds a handled callback is remembered
+               :param skip_redelivery: True to not call the handler on a redelivery, False to call it
+                with an OrderDetail whose is_redelivery() is True
+        """
+        if max_size <= 0:
+            raise InvalidInputException("Max size must be greater than zero")
+
+        if ttl <= 0:
+            raise InvalidInputException("TTL must be greater than zero")
+
+        self.callback_dedup_config = CallbackDedupConfig(
+            max_size=max_size, ttl=ttl, skip_redelivery=skip_redelivery
+        )
+        return self
+
     def with_is_debug(self, is_debug: bool):
         self.is_debug = is_debug
         return self
 
     def with_sat_base_url(self, sat_base_url: str):
         self.sat_base_url = sat_base_url
+        self.failover_config = None
+        return self
+
+    def with_sat_base_urls(
+        self,
+        sat_base_urls: List[str],
+        probe_interval: Optional[float] = 10.0,
+        probe_timeout: float = 2.0,
+    ):
+        """
+        Send requests to several SAT base URLs, each request goes to the healthiest one by rolling latency
+        and error rate. Idempotent requests failing with a transport error or 502, 503 and 504 are sent again
+        to the next base URL, checkout only when the connection could not be established
+               :param sat_base_urls: SAT base URLs, the first one is used until the others are measured
+               :param probe_interval: seconds between two background pings of every base URL, None disables them
+               :param probe_timeout: connect and read timeout of a ping in seconds
+        """
+        if not sat_base_urls or not all(
+            url and isinstance(url, str) for url in sat_base_urls
+        ):
+            raise InvalidInputException("Base URLs must be a non-empty list of strings")
+
+        if probe_interval is not None and probe_interval <= 0:
+            raise InvalidInputException("Probe interval must be greater than zero")
+
+        if probe_timeout <= 0:
+            raise InvalidInputException("Probe timeout must be greater than zero")
+
+        self.sat_base_url = sat_base_urls[0]
+        self.failover_config = FailoverConfig(
+            base_urls=tuple(sat_base_urls),
+            probe_interval=probe_interval,
+            probe_timeout=probe_timeout,
+        )
         return self
 
     def with_timeout(self, timeout: int):
         self.timeout = timeout
         return self
 
+    def with_endpoint_timeout(self, endpoint: Endpoint, connect: float, read: float):
+        """
+        Override the connect and read timeout of one endpoint, other endpoints keep using with_timeout value
+               :param endpoint: the endpoint to configure, Endpoint.TOKEN configures the access token fetch
+               :param connect: seconds allowed to establish the connection
+               :param read: seconds allowed between two bytes received from the server
+        """
+        if connect <= 0 or read <= 0:
+            raise InvalidInputException("Timeouts must be greater than zero")
+
+        self.endpoint_timeouts[endpoint] = Timeout(connect=connect, read=read)
+        return self
+
     def with_access_token_base_url(self, access_token_base_url: str):
         self.access_token_base_url = access_token_base_url
         return self
 
+    def with_connection_pool(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        idle_timeout: Optional[float] = None,
+    ):
+        """
+        Configure the connection pool shared by the SAT and OAuth sessions
+               :param pool_connections: number of per-host pools to keep cached
+               :param pool_maxsize: maximum number of kept-alive connections per host
+               :param pool_block: wait for a free connection instead of opening a throwaway one when the pool is full
+               :param idle_timeout: seconds an idle kept-alive connection is reused before being closed
+        """
+        if pool_connections <= 0 or pool_maxsize <= 0:
+            raise InvalidInputException("Pool sizes must be greater than zero")
+
+        self.pool_config = PoolConfig(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            idle_timeout=idle_timeout,
+        )
+        return self
+
+    def with_retry_policy(self, retry_policy: RetryPolicy):
+        """
+        Retry transient failures, ping, inquiry, check status, list product and account are retried
+        on connection errors and retryable statuses, checkout is only retried when the connection
+        could not be established or when SAT answered with one of retryable_error_codes
+               :param retry_policy: RetryPolicy
+        """
+        if retry_policy.max_attempts < 1:
+            raise InvalidInputException("Max attempts must be at least 1")
+
+        self.retry_policy = retry_policy
+        return self
+
+    def with_token_refresh_ratio(self, token_refresh_ratio: float):
+        """
+        Refresh the access token in the background once this fraction of its lifetime elapsed,
+        requests keep using the current token meanwhile
+               :param token_refresh_ratio: fraction of the token lifetime, between 0 and 1
+        """
+        if token_refresh_ratio <= 0 or token_refresh_ratio > 1:
+            raise InvalidInputException(
+                "Token refresh ratio must be greater than 0 and at most 1"
+            )
+
+        self.token_refresh_ratio = token_refresh_ratio
+        return self
+
+    def with_token_store(self, token_store: TokenStore):
+        """
+        Keep the access token in a shared store, so every client using it shares one token and one refresh,
+        use FileTokenStore to share it between the worker processes of a host
+               :param token_store: TokenStore, default to a store private to the client
+        """
+        self.token_store = token_store
+        return self
+
+    def with_request_logging(
+        self,
+        level: int = logging.DEBUG,
+        sample_rate: int = 1,
+        slow_threshold: Optional[float] = None,
+    ):
+        """
+        Configure the request logs, Authorization and signature headers are always redacted,
+        the request body is only logged when is_debug is enabled
+               :param level: level of the regular request logs
+               :param sample_rate: log 1 in sample_rate regular requests
+               :param slow_threshold: requests slower than this many seconds are logged at WARNING, never sampled
+        """
+        if sample_rate < 1:
+            raise InvalidInputException("Sample rate must be at least 1")
+
+        if slow_threshold is not None and slow_threshold < 0:
+            raise InvalidInputException("Slow threshold must not be negative")
+
+        self.request_log_config = RequestLogConfig(
+            level=level, sample_rate=sample_rate, slow_threshold=slow_threshold
+        )
+        return self
+
+    def with_compression(
+        self,
+        accept_encodings: Tuple[str, ...] = SUPPORTED_RESPONSE_ENCODINGS,
+        request_encoding: Optional[str] = None,
+        min_size: int = 1024,
+    ):
+        """
+        Enable compressed transfer, responses are negotiated with Accept-Encoding and decoded transparently,
+        checkout and inquiry bodies are compressed when request_encoding is set.
+        The checkout signature is still computed over the uncompressed body
+               :param accept_encodings: response encodings to advertise, br requires brotli to be installed
+               :param request_encoding: gzip or deflate to compress checkout and inquiry bodies, None to send them as-is
+               :param min_size: bodies smaller than this many bytes are sent uncompressed
+        """
+        unsupported = set(accept_encodings) - set(SUPPORTED_RESPONSE_ENCODINGS)
+        if unsupported:
+            raise InvalidInputException(
+                f"Unsupported response encodings: {sorted(unsupported)}"
+            )
+
+        if (
+            request_encoding is not None
+            and request_encoding not in SUPPORTED_REQUEST_ENCODINGS
+        ):
+            raise InvalidInputException(
+                f"Unsupported request encoding: {request_encoding}"
+            )
+
+        if min_size < 0:
+            raise InvalidInputException("Min size must not be negative")
+
+        self.compression_config = CompressionConfig(
+            accept_encodings=tuple(accept_encodings),
+            request_encoding=request_encoding,
+            min_size=min_size,
+        )
+        return self
+
+    def with_circuit_breaker(
+        self,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: Optional[float] = None,
+        slow_call_rate_threshold: float = 1.0,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        open_duration: float = 30.0,
+        half_open_max_calls: int = 3,
+        on_state_change: Optional[StateChangeHook] = None,
+    ):
+        """
+        Enable a circuit breaker per endpoint, while it is open calls raise CircuitOpenException
+        without reaching SAT. Transport errors and 5xx responses are failures, other responses are successes
+               :param failure_rate_threshold: open when this fraction of the window failed
+               :param slow_call_duration: seconds after which a call is slow, None disables slow call tracking
+               :param slow_call_rate_threshold: open when this fraction of the window was slow
+               :param window_size: number of most recent calls the rates are computed on
+               :param minimum_calls: calls needed in the window before the rates are evaluated
+               :param open_duration: seconds the breaker stays open before letting probe calls through
+               :param half_open_max_calls: probe calls allowed while half-open, all must succeed to close
+               :param on_state_change: called with the endpoint, the base URL or None, the old and the new CircuitState
+        """
+        if not 0 < failure_rate_threshold <= 1 or not 0 < slow_call_rate_threshold <= 1:
+            raise InvalidInputException(
+                "Rate thresholds must be greater than 0 and at most 1"
+            )
+
+        if window_size < 1 or not 1 <= minimum_calls <= window_size:
+            raise InvalidInputException(
+                "Minimum calls must be at least 1 and at most the window size"
+            )
+
+        if open_duration <= 0 or half_open_max_calls < 1:
+            raise InvalidInputException(
+                "Open duration must be greater than zero and half-open calls at least 1"
+            )
+
+        self.circuit_breaker_config = CircuitBreakerConfig(
+            failure_rate_threshold=failure_rate_threshold,
+            slow_call_rate_threshold=slow_call_rate_threshold,
+            slow_call_duration=slow_call_duration,
+            window_size=window_size,
+            minimum_calls=minimum_calls,
+            open_duration=open_duration,
+            half_open_max_calls=half_open_max_calls,
+            on_state_change=[on_state_change] if on_state_change else [],
+        )
+        return self
+
+    def with_hedging(
+        self,
+        percentile: float = 0.95,
+        initial_delay: float = 0.5,
+        min_delay: float = 0.01,
+        max_delay: float = 2.0,
+        endpoints: FrozenSet[Endpoint] = DEFAULT_HEDGED_ENDPOINTS,
+    ):
+        """
+        Hedge slow read-only calls, when no response arrived after the latency percentile of the endpoint
+        an identical request is sent on another connection and the first valid response is used.
+        Checkout is never hedged
+               :param percentile: latency percentile after which the hedge is sent
+               :param initial_delay: hedge delay in seconds until enough latencies were observed
+               :param min_delay: lower bound of the hedge delay in seconds
+               :param max_delay: upper bound of the hedge delay in seconds
+               :param endpoints: endpoints to hedge, default to check status and inquiry
+        """
+        if not 0 < percentile < 1:
+            raise InvalidInputException("Percentile must be between 0 and 1")
+
+        if not 0 <= min_delay <= max_delay or initial_delay < 0:
+            raise InvalidInputException(
+                "Delays must not be negative and min delay at most max delay"
+            )
+
+        if not set(endpoints) <= IDEMPOTENT_ENDPOINTS:
+            raise InvalidInputException("Only idempotent endpoints can be hedged")
+
+        self.hedge_policy = HedgePolicy(
+            percentile=percentile,
+            initial_delay=initial_delay,
+            min_delay=min_delay,
+            max_delay=max_delay,
+            endpoints=frozenset(endpoints),
+        )
+        return self
+
+    def with_rate_limit(
+        self,
+        rate: Optional[float] = None,
+        burst: int = 1,
+        endpoint_limits: Optional[Dict[Endpoint, Tuple[float, int]]] = None,
+        blocking: bool = True,
+        max_wait: Optional[float] = None,
+        adapt_to_headers: bool = True,
+    ):
+        """
+        Limit the calls sent to SAT with a token bucket per endpoint, so bursts stay within the SAT quota
+        instead of being rejected with 429
+               :param rate: calls per second of every endpoint without its own limit, None leaves them unlimited
+               :param burst: calls that can be sent at once after an idle period
+               :param endpoint_limits: rate and burst per endpoint
+               :param blocking: wait for the budget, otherwise raise RateLimitExceededException right away
+               :param max_wait: longest wait in seconds before raising RateLimitExceededException, None waits
+                    as long as the deadline allows
+               :param adapt_to_headers: pause on 429 Retry-After and when the rate-limit headers report no calls left
+        """
+        limits = dict(endpoint_limits or {})
+        budgets = list(limits.values())
+        if rate is not None:
+            budgets.append((rate, burst))
+        for limit_rate, limit_burst in budgets:
+            if limit_rate <= 0 or limit_burst < 1:
+                raise InvalidInputException(
+                    "Rate must be greater than zero and burst at least 1"
+                )
+
+        if max_wait is not None and max_wait < 0:
+            raise InvalidInputException("Max wait must not be negative")
+
+        self.rate_limit_config = RateLimitConfig(
+            default=RateLimit(rate=rate, burst=burst) if rate is not None else None,
+            endpoints={
+                endpoint: RateLimit(rate=limit_rate, burst=limit_burst)
+                for endpoint, (limit_rate, limit_burst) in limits.items()
+            },
+            blocking=blocking,
+            max_wait=max_wait,
+            adapt_to_headers=adapt_to_headers,
+        )
+        return self
+
+    def with_bulkheads(
+        self,
+        checkout_max_in_flight: int = 10,
+        read_max_in_flight: int = 5,
+        max_queue_wait: Optional[float] = None,
+        checkout_endpoints: FrozenSet[Endpoint] = DEFAULT_CHECKOUT_ENDPOINTS,
+    ):
+        """
+        Isolate checkout from read traffic, each class gets its own connection pool and in-flight limit
+        so list product or check status polling can never starve checkout of connections.
+        Requests over the limit queue for a slot, get_bulkhead_stats reports the queue wait per class
+               :param checkout_max_in_flight: concurrent requests and pooled connections of checkout and inquiry
+               :param read_max_in_flight: concurrent requests and pooled connections of the other endpoints
+               :param max_queue_wait: seconds a request may wait for a slot before BulkheadFullException,
+                    None waits as long as the deadline allows
+               :param checkout_endpoints: endpoints of the checkout class, default to checkout and inquiry
+        """
+        if checkout_max_in_flight < 1 or read_max_in_flight < 1:
+            raise InvalidInputException("Max in-flight requests must be at least 1")
+
+        if max_queue_wait is not None and max_queue_wait < 0:
+            raise InvalidInputException("Max queue wait must not be negative")
+
+        self.bulkhead_config = BulkheadConfig(
+            checkout_max_in_flight=checkout_max_in_flight,
+            read_max_in_flight=read_max_in_flight,
+            max_queue_wait=max_queue_wait,
+            checkout_endpoints=frozenset(checkout_endpoints),
+        )
+        return self
+
 
 class SATClient:
     """
@@ -122,7 +636,17 @@ class SATClient:
     def __init__(self, config: SATClientConfig):
         self._config = config
         self.signature = Signature(
-            config.private_key, config.sat_public_key, config.padding_type
+            config.private_key,
+            config.sat_public_key,
+            config.padding_type,
+            config.signature_backend,
+            config.sat_public_keys,
+            config.signature_pool_config,
+        )
+        self._callback_dedup = (
+            CallbackDedupCache(config.callback_dedup_config)
+            if config.callback_dedup_config
+            else None
         )
         self._logger = config.logger
         self._http_client = HTTPClient(
@@ -131,11 +655,38 @@ class SATClient:
             client_id=config.client_id,
             client_secret=config.client_secret,
             logger=config.logger,
+            is_debug=config.is_debug,
+            pool_config=config.pool_config,
+            timeout_config=TimeoutConfig(
+                default=Timeout(connect=config.timeout, read=config.timeout),
+                endpoints=dict(config.endpoint_timeouts),
+            ),
+            retry_policy=config.retry_policy,
+            token_refresh_ratio=config.token_refresh_ratio,
+            token_store=config.token_store,
+            request_log_config=config.request_log_config,
+            compression_config=config.compression_config,
+            circuit_breaker_config=config.circuit_breaker_config,
+            rate_limit_config=config.rate_limit_config,
+            bulkhead_config=config.bulkhead_config,
+            failover_config=config.failover_config,
+            hedge_policy=config.hedge_policy,
         )
 
-    def ping(self) -> Union[PingResponse, ErrorResponse]:
+    def close(self):
+        """
+        Close the underlying http client, its prober, hedge threads and connection pools,
+        and the signature worker processes
+        """
+        self._http_client.close()
+        self.signature.close()
+
+    def ping(
+        self, deadline: Optional[float] = None
+    ) -> Union[PingResponse, ErrorResponse]:
         """
         Ping is a method to check the SAT server health
+               :param deadline: optional time budget in seconds for the whole call
                :return: PingResponse or ErrorResponse
                :raise ResponseGeneralException: if there are unexpected error when hitting SAT (403 forbidden, network error)
                :raise GeneralException: if there is an unexpected exception when pinging
@@ -144,21 +695,28 @@ class SATClient:
             url = f"{self._config.sat_base_url}{PING_PATH}"
 
             req = requests.Request(method="GET", url=url)
-            response = self._http_client.send_request(req)
+            response = self._http_client.send_request(
+                req, endpoint=Endpoint.PING, deadline=Deadline.after(deadline)
+            )
             response.raise_for_status()
 
             json_response = response.json()
             return PingResponse.from_dict(json_response).with_raw_response(response)
         except HTTPError as exc:
-            return self._handle_http_error(exc)
+            return _handle_http_error(exc, self._logger)
+        except _PASSTHROUGH_EXCEPTIONS:
+            raise
         except Exception as exc:
-            self._logger.error(f"Error when pinging: {exc}")
+            self._logger.error("Error when pinging: %s", exc)
             raise GeneralException(exc)
 
-    def inquiry(self, req: InquiryRequest) -> Union[InquiryResponse, ErrorResponse]:
+    def inquiry(
+        self, req: InquiryRequest, deadline: Optional[float] = None
+    ) -> Union[InquiryResponse, ErrorResponse]:
         """
         Inquiry is a method to get user bills based on client number and product code
                :param req: InquiryRequest
+               :param deadline: optional time budget in seconds for the whole call
                :return:  InquiryBaseResponse or ErrorResponse
                :raise ResponseGeneralException: if there are unexpected error when hitting SAT (403 forbidden, network error)
                :raise GeneralException: if there is an unexpected exception when inquiring
@@ -167,8 +725,12 @@ class SATClient:
             url = f"{self._config.sat_base_url}{INQUIRY_PATH}"
 
             body = generate_json_api_request(req.to_dict())
-            http_req = requests.Request(method="POST", url=url, json=body)
-            response = self._http_client.send_request(http_req)
+            http_req = requests.Request(
+                method="POST", url=url, data=json.dumps(body).encode("utf-8")
+            )
+            response = self._http_client.send_request(
+                http_req, endpoint=Endpoint.INQUIRY, deadline=Deadline.after(deadline)
+            )
             response.raise_for_status()
 
             json_response = response.json()
@@ -176,16 +738,21 @@ class SATClient:
 
             return InquiryResponse.from_dict(data).with_raw_response(response)
         except HTTPError as exc:
-            return self._handle_http_error(exc)
+            return _handle_http_error(exc, self._logger)
+        except _PASSTHROUGH_EXCEPTIONS:
+            raise
         except Exception as exc:
-            self._logger.error(f"Error when inquiry: {exc}")
+            self._logger.error("Error when inquiry: %s", exc)
             raise GeneralException(exc)
 
-    def checkout(self, req: OrderRequest) -> Union[OrderDetail, ErrorResponse]:
+    def checkout(
+        self, req: OrderRequest, deadline: Optional[float] = None
+    ) -> Union[OrderDetail, ErrorResponse]:
         """
         Checkout is a method to do payment an order based on client number, product code and request id.
         Request ID should use unique identifier for each transaction
                :param req: OrderRequest
+               :param deadline: optional time budget in seconds for the whole call
                :return: OrderDetail or ErrorResponse
                :raise ResponseGeneralException: if there are unexpected error when hitting SAT (403 forbidden, network error)
                :raise GeneralException: if there is an unexpected exception when checking out
@@ -193,17 +760,21 @@ class SATClient:
         try:
             url = f"{self._config.sat_base_url}{CHECKOUT_PATH}"
 
-            body = generate_json_api_request(req.to_dict())
-            body_str = json.dumps(body)
-            signature = self.signature.sign(body_str)
+            # Serialized once, the signed bytes are the sent bytes
+            body = encode_json_request(generate_json_api_request(req.to_dict()))
+            signature = self.signature.sign(body)
 
             http_req = requests.Request(
                 method="POST",
                 url=url,
-                json=body,
-                headers={"signature": signature},
+                # Compression is applied on top of the signed bytes
+                data=body,
+                headers={SIGNATURE_HEADER_KEY: signature},
+            )
+            response = self._http_client.send_request(
+                http_req, endpoint=Endpoint.CHECKOUT, deadline=Deadline.after(deadline)
             )
-            response = self._http_client.send_request(http_req)
+            setattr(response, SIGNED_BODY_ATTRIBUTE, body)
             response.raise_for_status()
 
             json_response = response.json()
@@ -211,16 +782,21 @@ class SATClient:
 
             return OrderDetail.from_dict(data).with_raw_response(response)
         except HTTPError as exc:
-            return self._handle_http_error(exc)
+            return _handle_http_error(exc, self._logger)
+        except _PASSTHROUGH_EXCEPTIONS:
+            raise
         except Exception as exc:
-            self._logger.error(f"Error when checkout: {exc}")
+            self._logger.error("Error when checkout: %s", exc)
             raise GeneralException(exc)
 
-    def check_status(self, request_id: str) -> Union[OrderDetail, ErrorResponse]:
+    def check_status(
+        self, request_id: str, deadline: Optional[float] = None
+    ) -> Union[OrderDetail, ErrorResponse]:
         """
         CheckStatus is a method to check the final status of an order.
         request id is must be filled
                :param request_id: request id to check the status
+               :param deadline: optional time budget in seconds for the whole call
                :return: OrderDetail or ErrorResponse
                :raise ResponseGeneralException: if there are unexpected error when hitting SAT (403 forbidden, network error)
                :raise GeneralException: if there is an unexpected exception when checking status
@@ -232,7 +808,11 @@ class SATClient:
                 method="GET",
                 url=url,
             )
-            response = self._http_client.send_request(http_req)
+            response = self._http_client.send_request(
+                http_req,
+                endpoint=Endpoint.CHECK_STATUS,
+                deadline=Deadline.after(deadline),
+            )
             response.raise_for_status()
 
             signature = response.headers.get("signature")
@@ -241,23 +821,29 @@ class SATClient:
                     "Signature is not present in the header, please check the request"
                 )
 
-            valid = self.signature.verify(response.text, signature)
+            body = response.content
+            valid = self.signature.verify(
+                body, signature, self._response_key_id(response)
+            )
             if not valid:
                 raise UnauthenticatedException("Signature is not valid")
 
-            json_response = response.json()
+            # The verified buffer is the parsed one, no decode to text in between
+            json_response = json.loads(body)
 
             data = parse_json_api_response(json_response)
 
             return OrderDetail.from_dict(data).with_raw_response(response)
         except HTTPError as exc:
-            return self._handle_http_error(exc)
+            return _handle_http_error(exc, self._logger)
+        except _PASSTHROUGH_EXCEPTIONS:
+            raise
         except Exception as exc:
-            self._logger.error(f"Error when check status: {exc}")
+            self._logger.error("Error when check status: %s", exc)
             raise GeneralException(exc)
 
     def list_product(
-        self, code: Optional[str] = None
+        self, code: Optional[str] = None, deadline: Optional[float] = None
     ) -> Union[ProductListResponse, ErrorResponse]:
         """
         ListProduct is a method to get all the product list enabled on your credentials.
@@ -265,6 +851,7 @@ class SATClient:
         specify product code will be very beneficial to sync product status on your engine
         it will come with low bandwidth and fast response
                :param code: product code to filter the product list
+               :param deadline: optional time budget in seconds for the whole call
                :return: ProductListResponse or ErrorResponse
                :raise ResponseGeneralException: if there are unexpected error when hitting SAT (403 forbidden, network error)
                :raise GeneralException: if there is an unexpected exception when listing product
@@ -277,7 +864,11 @@ class SATClient:
                 url=url,
                 params={"product_code": code},
             )
-            response = self._http_client.send_request(http_req)
+            response = self._http_client.send_request(
+                http_req,
+                endpoint=Endpoint.PRODUCT_LIST,
+                deadline=Deadline.after(deadline),
+            )
             response.raise_for_status()
 
             json_response = response.json()
@@ -289,14 +880,79 @@ class SATClient:
 
             return ProductListResponse(products=products).with_raw_response(response)
         except HTTPError as exc:
-            return self._handle_http_error(exc)
+            return _handle_http_error(exc, self._logger)
+        except _PASSTHROUGH_EXCEPTIONS:
+            raise
+        except Exception as exc:
+            self._logger.error("Error when list product: %s", exc)
+            raise GeneralException(exc)
+
+    def iter_products(
+        self, code: Optional[str] = None, deadline: Optional[float] = None
+    ) -> Iterator[PartnerProduct]:
+        """
+        IterProducts is the streaming counterpart of list_product, each product is decoded and yielded
+        as soon as it is received, so memory stays flat for a large catalog.
+        The request is sent when the iteration starts, stop iterating early to drop the connection.
+               :param code: product code to filter the product list
+               :param deadline: optional time budget in seconds for the whole call, download included
+               :return: iterator of PartnerProduct
+               :raise ResponseGeneralException: if SAT answered with an error, the error body is on get_raw_response
+               :raise GeneralException: if there is an unexpected exception when listing product
+        """
+        call_deadline = Deadline.after(deadline)
+        try:
+            url = f"{self._config.sat_base_url}{PRODUCT_LIST_PATH}"
+
+            http_req = requests.Request(
+                method="GET",
+                url=url,
+                params={"product_code": code},
+            )
+            response = self._http_client.send_request(
+                http_req,
+                endpoint=Endpoint.PRODUCT_LIST,
+                deadline=call_deadline,
+                stream=True,
+            )
+        except _PASSTHROUGH_EXCEPTIONS:
+            raise
         except Exception as exc:
-            self._logger.error(f"Error when list product: {exc}")
+            self._logger.error("Error when iterating product: %s", exc)
             raise GeneralException(exc)
 
-    def account(self) -> Union[Account, ErrorResponse]:
+        with response:
+            try:
+                response.raise_for_status()
+                for item in iter_json_api_list_response(
+                    self._iter_chunks(response, call_deadline)
+                ):
+                    yield PartnerProduct.from_dict(item).with_raw_response(response)
+            except HTTPError as exc:
+                # Load the error body before the response is closed
+                _ = response.content
+                raise ResponseGeneralException(exc)
+            except _PASSTHROUGH_EXCEPTIONS:
+                raise
+            except Exception as exc:
+                self._logger.error("Error when iterating product: %s", exc)
+                raise GeneralException(exc)
+
+    @staticmethod
+    def _iter_chunks(
+        response: requests.Response, deadline: Optional[Deadline]
+    ) -> Iterator[bytes]:
+        for chunk in response.iter_content(chunk_size=PRODUCT_STREAM_CHUNK_SIZE):
+            if deadline is not None:
+                deadline.check(Endpoint.PRODUCT_LIST.value)
+            yield chunk
+
+    def account(
+        self, deadline: Optional[float] = None
+    ) -> Union[Account, ErrorResponse]:
         """
         Account is a method to check account balance
+               :param deadline: optional time budget in seconds for the whole call
                :return: Account or ErrorResponse
                :raise ResponseGeneralException: if there are unexpected error when hitting SAT (403 forbidden, network error)
                :raise GeneralException: if there is an unexpected exception when checking account
@@ -309,7 +965,9 @@ class SATClient:
                 method="GET",
                 url=url,
             )
-            response = self._http_client.send_request(http_req)
+            response = self._http_client.send_request(
+                http_req, endpoint=Endpoint.ACCOUNT, deadline=Deadline.after(deadline)
+            )
             response.raise_for_status()
 
             json_response = response.json()
@@ -317,9 +975,11 @@ class SATClient:
 
             return Account.from_dict(data).with_raw_response(response)
         except HTTPError as exc:
-            return self._handle_http_error(exc)
+            return _handle_http_error(exc, self._logger)
+        except _PASSTHROUGH_EXCEPTIONS:
+            raise
         except Exception as exc:
-            self._logger.error(f"Error when checking balance: {exc}")
+            self._logger.error("Error when checking balance: %s", exc)
             raise GeneralException(exc)
 
     def handle_callback(
@@ -337,23 +997,126 @@ class SATClient:
                       parameter and return void
            :raise InvalidInputException: if the header does not contain the signature
            :raise UnauthenticatedException: if the signature is not valid
+           :raise CallbackInFlightException: if the dedup cache is enabled and another delivery of the callback
+                      is still being handled, answer with a non-2xx status so SAT delivers it again
         """
-        signature: Optional[str] = sat_response_headers.get(
-            "signature"
-        ) or sat_response_headers.get("Signature")
-        if signature is None:
-            raise InvalidInputException(
-                "Signature is not present in the header, please check the request"
-            )
+        self._handle_callback(
+            json.dumps(sat_response_data),
+            sat_response_headers,
+            lambda: OrderDetail.from_dict(parse_json_api_response(sat_response_data)),
+            do,
+        )
 
-        verify = self.signature.verify(json.dumps(sat_response_data), signature)
-        if not verify:
-            raise UnauthenticatedException("Signature is not valid")
+    def handle_callback_raw(
+        self,
+        body: bytes,
+        headers: Mapping[str, Any],
+        do: Callable[[OrderDetail], None],
+    ):
+        """
+        HandleCallbackRaw is HandleCallback for the raw request body, prefer it over HandleCallback.
+        The signature is verified on the exact bytes SAT sent, and they are parsed once, after the verification
+           :param body: raw HTTP body of the SAT webhook, as received
+           :param headers: HTTP headers from SAT webhook
+           :param do: Your custom function to handle the callback, must be a function with OrderDetail as
+                      parameter and return void
+           :raise InvalidInputException: if the body is not bytes or not JSON, or the header does not contain the signature
+           :raise UnauthenticatedException: if the signature is not valid
+           :raise CallbackInFlightException: if the dedup cache is enabled and another delivery of the callback
+                      is still being handled, answer with a non-2xx status so SAT delivers it again
+        """
+        if not isinstance(body, bytes):
+            raise InvalidInputException("Callback body must be bytes")
 
-        data = parse_json_api_response(sat_response_data)
-        order_detail = OrderDetail.from_dict(data)
+        self._handle_callback(body, headers, lambda: parse_callback_body(body), do)
 
-        do(order_detail)
+    def get_callback_dedup_stats(self) -> Optional[CallbackDedupStats]:
+        """
+        Hits and misses of the callback dedup cache, None when it is not enabled
+        """
+        return self._callback_dedup.get_stats() if self._callback_dedup else None
+
+    def _handle_callback(
+        self,
+        body: Union[str, bytes],
+        headers: Mapping[str, Any],
+        parse: Callable[[], OrderDetail],
+        do: Callable[[OrderDetail], None],
+    ):
+        delivery = CallbackDelivery(
+            body, headers, self._config.sat_key_id_header, self._callback_dedup
+        )
+        if delivery.skipped:
+            return
+
+        if delivery.needs_verification:
+            if not self.signature.verify(body, delivery.signature, delivery.key_id):
+                raise UnauthenticatedException("Signature is not valid")
+
+        order_detail = delivery.claim(parse())
+        if order_detail is None:
+            return
+
+        with delivery.handling():
+            do(order_detail)
+
+    def warmup(
+        self,
+        connections: int = DEFAULT_WARMUP_CONNECTIONS,
+        deadline: Optional[float] = None,
+    ) -> WarmupReport:
+        """
+        Warmup pays upfront what the first calls would pay lazily: it fetches the access token, opens
+        connections to SAT, signs and verifies once and decodes every response model once.
+        Call it on startup and gate the readiness probe on it
+               :param connections: connections to open per connection pool, bounded by the pool size
+               :param deadline: optional time budget in seconds for the whole warm up
+               :return: WarmupReport with the seconds spent per phase
+               :raise GeneralException: if a phase failed, e.g. SAT or the OAuth server is unreachable
+        """
+        if connections < 0:
+            raise InvalidInputException("Connections must not be negative")
+
+        report = WarmupReport()
+        try:
+            call_deadline = Deadline.after(deadline)
+
+            started = time.monotonic()
+            self._http_client.ensure_access_token(call_deadline)
+            report.token = time.monotonic() - started
+
+            started = time.monotonic()
+            if connections:
+                report.opened_connections = self._http_client.open_connections(
+                    connections, call_deadline
+                )
+            report.connections = time.monotonic() - started
+
+            started = time.monotonic()
+            # The message is signed with the client key and verified with the SAT keys,
+            # only the work matters, not the verification result
+            self.signature.warm_up(WARMUP_MESSAGE)
+            report.signature = time.monotonic() - started
+
+            started = time.monotonic()
+            warm_up_decoders()
+            report.decoders = time.monotonic() - started
+        except DeadlineExceededException:
+            raise
+        except Exception as exc:
+            self._logger.error("Error when warming up: %s", exc)
+            raise GeneralException(exc)
+
+        self._logger.info(
+            "Warm up done in %.3fs: token %.3fs, %d connections %.3fs, signature %.3fs, decoders %.3fs",
+            report.total,
+            report.token,
+            report.opened_connections,
+            report.connections,
+            report.signature,
+            report.decoders,
+        )
+        return report
 
     def get_http_client(self) -> HTTPClient:
         """
@@ -371,14 +1134,6 @@ class SATClient:
         """
         return self.signature
 
-    def _handle_http_error(self, exc: HTTPError):
-        try:
-            status = exc.response.status_code
-            message = exc.response.text
-            self._logger.debug(f"HTTP Error: {status}, {message}")
-
-            data = exc.response.json()
-            resp = ErrorResponse.from_dict(data).with_raw_response(exc.response)
-            return resp
-        except Exception as e:
-            raise ResponseGeneralException(exc)
+    def _response_key_id(self, response: requests.Response) -> Optional[str]:
+        header = self._config.sat_key_id_header
+        return response.headers.get(header) if header else None
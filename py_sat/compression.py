@@ -0,0 +1,92 @@
+"""
+compression package contains the opt-in compressed transfer of HTTPClient and AsyncHTTPClient.
+
+Responses are negotiated with Accept-Encoding and decoded transparently by the transport,
+request bodies of checkout and inquiry can be compressed with Content-Encoding.
+Signatures are always computed over the uncompressed body, which is what SAT verifies.
+"""
+
+import gzip
+import io
+import zlib
+from dataclasses import dataclass, field
+from typing import FrozenSet, Optional, Tuple
+
+from py_sat.constant import Endpoint
+
+try:
+    import brotli  # noqa: F401
+
+    BROTLI_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    try:
+        import brotlicffi  # noqa: F401
+
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+SUPPORTED_RESPONSE_ENCODINGS = ("gzip", "deflate", "br")
+
+SUPPORTED_REQUEST_ENCODINGS = ("gzip", "deflate")
+
+COMPRESSIBLE_ENDPOINTS = frozenset({Endpoint.CHECKOUT, Endpoint.INQUIRY})
+
+
+@dataclass(frozen=True)
+class CompressionConfig:
+    """
+    CompressionConfig configures the compressed transfer with SAT
+
+    :param accept_encodings: response encodings advertised, br is dropped when brotli is not installed
+    :param request_encoding: encoding of checkout and inquiry bodies, None sends them uncompressed
+    :param min_size: bodies smaller than this many bytes are sent uncompressed
+    :param level: compression level of the request bodies
+    :param endpoints: endpoints whose request body may be compressed
+    """
+
+    accept_encodings: Tuple[str, ...] = SUPPORTED_RESPONSE_ENCODINGS
+    request_encoding: Optional[str] = None
+    min_size: int = 1024
+    level: int = 6
+    endpoints: FrozenSet[Endpoint] = field(
+        default_factory=lambda: COMPRESSIBLE_ENDPOINTS
+    )
+
+    def accept_encoding_header(self) -> str:
+        """
+        Accept-Encoding header value, limited to the encodings the transport can decode
+               :return: comma separated encodings
+        """
+        return ", ".join(
+            encoding
+            for encoding in self.accept_encodings
+            if encoding != "br" or BROTLI_AVAILABLE
+        )
+
+    def should_compress(self, endpoint: Optional[Endpoint], body: Optional[bytes]):
+        return (
+            self.request_encoding is not None
+            and endpoint in self.endpoints
+            and isinstance(body, bytes)
+            and len(body) >= self.min_size
+        )
+
+    def compress(self, body: bytes) -> bytes:
+        """
+        Compress a request body with request_encoding
+               :param body: uncompressed body
+               :return: compressed body
+        """
+        if self.request_encoding == "gzip":
+            # mtime is fixed so the same body always compresses to the same bytes,
+            # gzip.compress only takes mtime from Python 3.8
+            buffer = io.BytesIO()
+            with gzip.GzipFile(
+                fileobj=buffer, mode="wb", compresslevel=self.level, mtime=0
+            ) as stream:
+                stream.write(body)
+            return buffer.getvalue()
+        if self.request_encoding == "deflate":
+            return zlib.compress(body, self.level)
+        raise ValueError(f"Unsupported request encoding: {self.request_encoding}")
@@ -1,3 +1,5 @@
+from enum import Enum
+
 # Base URL
 ACCESS_TOKEN_URL = "https://accounts.tokopedia.com/token"
 PLAYGROUND_SAT_BASE_URL = "https://b2b-playground.tokopedia.com/api"
@@ -10,8 +12,31 @@ CHECK_STATUS_PATH = "/v2/order/{request_id}"
 PRODUCT_LIST_PATH = "/v2/product-list"
 ACCOUNT_PATH = "/v2/account"
 
+
+class Endpoint(str, Enum):
+    """
+    Endpoint identifies each SAT operation, used as key for per endpoint settings
+    """
+
+    TOKEN = "token"
+    PING = "ping"
+    INQUIRY = "inquiry"
+    CHECKOUT = "checkout"
+    CHECK_STATUS = "check_status"
+    PRODUCT_LIST = "list_product"
+    ACCOUNT = "account"
+
+
+PRODUCT_STREAM_CHUNK_SIZE = 16 * 1024
+
 SIGNATURE_HEADER_KEY = "signature"
 
+# Header naming the SAT public key a response or a callback was signed with, during key rotation
+SIGNATURE_KEY_ID_HEADER_KEY = "signature-key-id"
+
+# Attribute of the HTTP response holding the exact request body bytes the signature was computed on
+SIGNED_BODY_ATTRIBUTE = "sat_signed_body"
+
 SDK_NAME = "py_sat"
 SDK_VERSION = "v1.0.0"
 SDK_LABEL = f"{SDK_NAME}@{SDK_VERSION}"
@@ -36,3 +36,60 @@ class GeneralException(Exception):
     ):
         self.message = f"{message}: {original_exception}"
         super().__init__(self.message)
+
+
+class DeadlineExceededException(GeneralException):
+    def __init__(self, message: str):
+        super().__init__(message, message="Deadline exceeded")
+
+
+class CircuitOpenException(Exception):
+    """
+    Raised without calling SAT while the circuit breaker of the endpoint is open
+    """
+
+    def __init__(self, endpoint, retry_after: float, base_url=None):
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        self.base_url = base_url
+        on = f" on {base_url}" if base_url else ""
+        super().__init__(
+            f"Circuit breaker of {endpoint.value}{on} is open, retry in {retry_after:.1f}s"
+        )
+
+
+class RateLimitExceededException(Exception):
+    """
+    Raised without calling SAT when the rate limit budget of the endpoint is exhausted
+    """
+
+    def __init__(self, endpoint, retry_after: float):
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        super().__init__(
+            f"Rate limit of {endpoint.value} exhausted, retry in {retry_after:.3f}s"
+        )
+
+
+class BulkheadFullException(Exception):
+    """
+    Raised without calling SAT when every slot of the endpoint class stayed busy for max_queue_wait
+    """
+
+    def __init__(self, bulkhead_class, waited: float):
+        self.bulkhead_class = bulkhead_class
+        self.waited = waited
+        super().__init__(
+            f"Bulkhead {bulkhead_class.value} is full, waited {waited:.3f}s for a slot"
+        )
+
+
+class CallbackInFlightException(Exception):
+    """
+    Raised when another delivery of the same callback is still being handled, answer the webhook
+    with a non-2xx status so SAT delivers it again once the outcome of the first delivery is known
+    """
+
+    def __init__(self, order_id: str):
+        self.order_id = order_id
+        super().__init__(f"Callback of order {order_id} is still being handled")
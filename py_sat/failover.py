@@ -0,0 +1,200 @@
+"""
+failover package contains the selection of SAT base URLs used by HTTPClient.
+
+Every base URL tracks a rolling latency and error rate, fed by the requests sent to it and by
+a background prober pinging every base URL. Requests go to the healthiest base URL,
+and a request that failed without side effects is sent again to the next one.
+"""
+
+import logging
+import math
+import threading
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, FrozenSet, List, Optional, Tuple
+
+DEFAULT_FAILOVER_STATUSES = frozenset({502, 503, 504})
+
+
+@dataclass
+class FailoverConfig:
+    """
+    FailoverConfig configures the base URLs of HTTPClient
+
+    :param base_urls: SAT base URLs, the first one is the one requests are built with
+    :param probe_interval: seconds between two pings of every base URL, None disables the prober
+    :param probe_timeout: connect and read timeout of a ping in seconds
+    :param window_size: number of most recent outcomes the error rate is computed on
+    :param latency_smoothing: weight of the newest latency in the moving average, between 0 and 1
+    :param error_rate_step: error rates are compared in steps of this fraction, any step outweighs latency
+    :param failover_statuses: HTTP statuses an idempotent request is sent again for
+    """
+
+    base_urls: Tuple[str, ...]
+    probe_interval: Optional[float] = 10.0
+    probe_timeout: float = 2.0
+    window_size: int = 20
+    latency_smoothing: float = 0.2
+    error_rate_step: float = 0.1
+    failover_statuses: FrozenSet[int] = field(
+        default_factory=lambda: DEFAULT_FAILOVER_STATUSES
+    )
+
+
+@dataclass
+class BaseURLStats:
+    """
+    BaseURLStats is a snapshot of the health of one base URL
+
+    :param base_url: the base URL
+    :param latency: moving average of the latency in seconds, None until a call succeeded
+    :param error_rate: fraction of failed calls in the window
+    :param calls: calls and pings sent to the base URL
+    """
+
+    base_url: str
+    latency: Optional[float] = None
+    error_rate: float = 0.0
+    calls: int = 0
+
+
+class _BaseURLHealth:
+    def __init__(self, window_size: int):
+        self.latency: Optional[float] = None
+        self.outcomes: Deque[bool] = deque(maxlen=window_size)
+        self.calls = 0
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(1 for failed in self.outcomes if failed) / len(self.outcomes)
+
+
+class BaseURLSelector:
+    """
+    BaseURLSelector ranks the base URLs by health, thread-safe
+    """
+
+    _config: FailoverConfig
+    _lock: threading.Lock
+    _health: Dict[str, _BaseURLHealth]
+
+    def __init__(self, config: FailoverConfig):
+        self._config = config
+        self._lock = threading.Lock()
+        self._health = {
+            base_url: _BaseURLHealth(config.window_size)
+            for base_url in config.base_urls
+        }
+
+    @property
+    def primary(self) -> str:
+        return self._config.base_urls[0]
+
+    def ordered(self) -> List[str]:
+        """
+        Rank the base URLs, healthiest first, ties keep the configured order
+               :return: base URLs
+        """
+        with self._lock:
+            scores = {
+                base_url: self._score(health)
+                for base_url, health in self._health.items()
+            }
+        return sorted(self._config.base_urls, key=scores.__getitem__)
+
+    def record(self, base_url: str, latency: float, failed: bool):
+        health = self._health.get(base_url)
+        if health is None:
+            return
+
+        smoothing = self._config.latency_smoothing
+        with self._lock:
+            health.calls += 1
+            health.outcomes.append(failed)
+            if not failed:
+                health.latency = (
+                    latency
+                    if health.latency is None
+                    else smoothing * latency + (1 - smoothing) * health.latency
+                )
+
+    def should_fail_over(self, status_code: int) -> bool:
+        return status_code in self._config.failover_statuses
+
+    def get_stats(self) -> List[BaseURLStats]:
+        with self._lock:
+            return [
+                BaseURLStats(
+                    base_url=base_url,
+                    latency=health.latency,
+                    error_rate=health.error_rate(),
+                    calls=health.calls,
+                )
+                for base_url, health in self._health.items()
+            ]
+
+    def _score(self, health: _BaseURLHealth) -> Tuple[int, float]:
+        # The error rate outweighs latency, a base URL never measured successfully ranks after
+        # the measured healthy ones and before the failing ones, the prober measures it meanwhile
+        errors = int(health.error_rate() / self._config.error_rate_step + 1e-9)
+        latency = health.latency if health.latency is not None else math.inf
+        return errors, latency
+
+
+class Prober:
+    """
+    Prober pings every base URL in a daemon thread, it stops when the probed client is garbage collected
+    """
+
+    _probe: "weakref.WeakMethod"
+    _base_urls: Tuple[str, ...]
+    _interval: float
+    _logger: logging.Logger
+    _stopped: threading.Event
+    _thread: Optional[threading.Thread]
+
+    def __init__(
+        self,
+        probe: Callable[[str], None],
+        base_urls: Tuple[str, ...],
+        interval: float,
+        logger: logging.Logger,
+    ):
+        """
+        :param probe: bound method pinging one base URL and recording its health
+        :param base_urls: base URLs to ping
+        :param interval: seconds between two rounds of pings
+        :param logger: logger of failed pings
+        """
+        self._probe = weakref.WeakMethod(probe)
+        self._base_urls = base_urls
+        self._interval = interval
+        self._logger = logger
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="py-sat-prober", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            # A ping in progress is bounded by the probe timeout
+            self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            probe = self._probe()
+            if probe is None:
+                return
+            for base_url in self._base_urls:
+                try:
+                    probe(base_url)
+                except Exception as exc:
+                    self._logger.debug("Ping of %s failed: %s", base_url, exc)
+            del probe
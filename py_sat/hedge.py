@@ -0,0 +1,235 @@
+"""
+hedge package contains the request hedging of HTTPClient.
+
+When a read-only call has no response after a delay derived from the recent latency percentile,
+an identical request is sent on another pooled connection and the first valid response wins.
+Only idempotent endpoints are hedged, checkout never is.
+"""
+
+import copy
+import threading
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, Future, ThreadPoolExecutor,
+                                wait)
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, FrozenSet, Optional
+
+import requests
+
+from py_sat.constant import Endpoint
+from py_sat.retry import IDEMPOTENT_ENDPOINTS
+
+DEFAULT_HEDGED_ENDPOINTS = frozenset({Endpoint.CHECK_STATUS, Endpoint.INQUIRY})
+
+
+@dataclass
+class HedgePolicy:
+    """
+    HedgePolicy configures the hedged requests of HTTPClient
+
+    :param percentile: latency percentile of the endpoint after which the hedge is sent
+    :param initial_delay: hedge delay in seconds until min_samples latencies were observed
+    :param min_delay: lower bound of the hedge delay in seconds
+    :param max_delay: upper bound of the hedge delay in seconds
+    :param sample_size: number of most recent latencies the percentile is computed on
+    :param min_samples: latencies needed before the percentile is used
+    :param endpoints: endpoints to hedge, restricted to idempotent ones
+    """
+
+    percentile: float = 0.95
+    initial_delay: float = 0.5
+    min_delay: float = 0.01
+    max_delay: float = 2.0
+    sample_size: int = 200
+    min_samples: int = 20
+    endpoints: FrozenSet[Endpoint] = field(
+        default_factory=lambda: DEFAULT_HEDGED_ENDPOINTS
+    )
+
+
+@dataclass
+class HedgeStats:
+    """
+    HedgeStats counts the hedged requests
+
+    :param fired: hedge requests sent because the first one was too slow
+    :param won: hedge requests whose response was used
+    """
+
+    fired: int = 0
+    won: int = 0
+
+
+class _LatencyWindow:
+    def __init__(self, size: int):
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, latency: float):
+        self._samples.append(latency)
+
+    def percentile(self, percentile: float, min_samples: int) -> Optional[float]:
+        samples = sorted(self._samples)
+        if len(samples) < min_samples:
+            return None
+        return samples[min(int(len(samples) * percentile), len(samples) - 1)]
+
+
+class Hedger:
+    """
+    Hedger sends the hedged requests of HTTPClient, thread-safe
+    """
+
+    _policy: HedgePolicy
+    _executor: ThreadPoolExecutor
+    _max_workers: int
+    _lock: threading.Lock
+    _latencies: Dict[Endpoint, _LatencyWindow]
+    _stats: HedgeStats
+    _active: int
+
+    def __init__(self, policy: HedgePolicy, max_workers: int):
+        """
+        :param policy: HedgePolicy
+        :param max_workers: threads sending the hedged requests, two per concurrent hedged call
+        """
+        self._policy = policy
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="py-sat-hedge"
+        )
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._stats = HedgeStats()
+        self._active = 0
+
+    def applies(self, endpoint: Optional[Endpoint]) -> bool:
+        return endpoint in self._policy.endpoints and endpoint in IDEMPOTENT_ENDPOINTS
+
+    def get_stats(self) -> HedgeStats:
+        with self._lock:
+            return HedgeStats(fired=self._stats.fired, won=self._stats.won)
+
+    def delay(self, endpoint: Endpoint) -> float:
+        policy = self._policy
+        with self._lock:
+            window = self._latencies.get(endpoint)
+            observed = (
+                window.percentile(policy.percentile, policy.min_samples)
+                if window
+                else None
+            )
+        delay = policy.initial_delay if observed is None else observed
+        return min(max(delay, policy.min_delay), policy.max_delay)
+
+    def send(
+        self,
+        send: Callable[[requests.Request], requests.Response],
+        request: requests.Request,
+        endpoint: Endpoint,
+    ) -> requests.Response:
+        """
+        Send the request, and an identical one if no response arrived within the hedge delay
+        after the request started. While every thread is busy the request is sent unhedged
+        on the caller's thread, neither it nor a hedge ever waits in a queue, a saturated
+        pool would only delay the calls and amplify the load
+               :param send: function sending one request
+               :param request: request to send, never mutated
+               :param endpoint: endpoint of the request
+               :return: the first valid response, the other one is cancelled or discarded
+        """
+        delay = self.delay(endpoint)
+        if not self._reserve(hedge=False):
+            return self._timed(send, _copy_request(request), endpoint)
+
+        primary = self._submit(send, request, endpoint)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._reserve(hedge=True):
+            return primary.result()
+        hedge = self._submit(send, request, endpoint)
+
+        pending = {primary, hedge}
+        winner = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            valid = [future for future in done if _is_valid(future)]
+            if valid:
+                winner = primary if primary in valid else hedge
+                break
+
+        if winner is None:
+            # Both failed, surface the outcome of the original request
+            winner = primary
+
+        loser = hedge if winner is primary else primary
+        # A loser still queued is never sent, a running one has its response closed
+        loser.cancel()
+        loser.add_done_callback(_discard)
+        if winner is hedge:
+            with self._lock:
+                self._stats.won += 1
+        return winner.result()
+
+    def close(self):
+        """
+        Stop the threads once the requests in flight are done
+        """
+        self._executor.shutdown(wait=False)
+
+    def _reserve(self, hedge: bool) -> bool:
+        # A request is only submitted when a thread is free to send it right away
+        with self._lock:
+            if self._active >= self._max_workers:
+                return False
+            if hedge:
+                self._stats.fired += 1
+            self._active += 1
+            return True
+
+    def _release(self, future: Future):
+        with self._lock:
+            self._active -= 1
+
+    def _submit(
+        self,
+        send: Callable[[requests.Request], requests.Response],
+        request: requests.Request,
+        endpoint: Endpoint,
+    ) -> Future:
+        future = self._executor.submit(
+            self._timed, send, _copy_request(request), endpoint
+        )
+        future.add_done_callback(self._release)
+        return future
+
+    def _timed(
+        self,
+        send: Callable[[requests.Request], requests.Response],
+        request: requests.Request,
+        endpoint: Endpoint,
+    ) -> requests.Response:
+        response = send(request)
+        latency = response.elapsed.total_seconds()
+        with self._lock:
+            window = self._latencies.get(endpoint)
+            if window is None:
+                window = self._latencies[endpoint] = _LatencyWindow(
+                    self._policy.sample_size
+                )
+            window.add(latency)
+        return response
+
+
+def _copy_request(request: requests.Request) -> requests.Request:
+    # Each attempt gets its own copy, headers are set while sending
+    attempt = copy.copy(request)
+    attempt.headers = dict(request.headers)
+    return attempt
+
+
+def _is_valid(future: Future) -> bool:
+    return future.exception() is None and future.result().status_code < 500
+
+
+def _discard(future: Future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
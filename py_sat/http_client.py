@@ -1,23 +1,59 @@
 import logging
+import time
 from datetime import datetime, timezone
+from typing import Dict, List, Optional
 
 import requests
 from oauthlib.oauth2 import BackendApplicationClient
 from requests_oauthlib import OAuth2Session
 
-from py_sat.constant import DATE_TIME_FORMAT, SDK_LABEL
+from py_sat.bulkhead import (Bulkhead, BulkheadClass, BulkheadConfig,
+                             BulkheadRegistry, BulkheadStats)
+from py_sat.circuit_breaker import (CircuitBreaker, CircuitBreakerConfig,
+                                    CircuitBreakerRegistry, CircuitState)
+from py_sat.compression import CompressionConfig
+from py_sat.constant import DATE_TIME_FORMAT, PING_PATH, SDK_LABEL, Endpoint
+from py_sat.exceptions import CircuitOpenException, DeadlineExceededException
+from py_sat.failover import (BaseURLSelector, BaseURLStats, FailoverConfig,
+                             Prober)
+from py_sat.hedge import HedgePolicy, Hedger, HedgeStats
+from py_sat.pool import (PoolConfig, PooledHTTPAdapter, PoolStats,
+                         sum_pool_stats)
+from py_sat.rate_limit import RateLimitConfig, RateLimiter
+from py_sat.request_log import RequestLogConfig, RequestLogger
+from py_sat.retry import (IDEMPOTENT_ENDPOINTS, RETRY_STATE_ATTRIBUTE,
+                          RetryPolicy, RetryState, is_connect_failure)
+from py_sat.timeout import Deadline, Timeout, TimeoutConfig
+from py_sat.token import DEFAULT_REFRESH_RATIO, AccessToken, TokenManager
+from py_sat.token_store import InMemoryTokenStore, TokenStore
+
+DEFAULT_TIMEOUT = 30
 
 
 class HTTPClient:
     _base_url: str
     _oauth_base_url: str
-    _access_token: str
+    _token_manager: TokenManager
+    _token_refresh_ratio: float
     _client_id: str
     _client_secret: str
     _session: requests.Session
     _auth: OAuth2Session
+    _adapter: PooledHTTPAdapter
     _logger: logging.Logger
     _is_debug: bool
+    _request_logger: RequestLogger
+    _timeout_config: TimeoutConfig
+    _retry_policy: Optional[RetryPolicy]
+    _compression_config: Optional[CompressionConfig]
+    _circuit_breakers: Optional[CircuitBreakerRegistry]
+    _hedger: Optional[Hedger]
+    _rate_limiter: Optional[RateLimiter]
+    _bulkheads: Optional[BulkheadRegistry]
+    _bulkhead_sessions: Dict[BulkheadClass, requests.Session]
+    _failover_config: Optional[FailoverConfig]
+    _base_url_selector: Optional[BaseURLSelector]
+    _prober: Optional[Prober]
 
     def __init__(
         self,
@@ -27,14 +63,61 @@ class HTTPClient:
         client_secret: str,
         logger: logging.Logger,
         is_debug: bool = False,
+        pool_config: Optional[PoolConfig] = None,
+        timeout_config: Optional[TimeoutConfig] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        token_refresh_ratio: float = DEFAULT_REFRESH_RATIO,
+        token_store: Optional[TokenStore] = None,
+        request_log_config: Optional[RequestLogConfig] = None,
+        compression_config: Optional[CompressionConfig] = None,
+        circuit_breaker_config: Optional[CircuitBreakerConfig] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        rate_limit_config: Optional[RateLimitConfig] = None,
+        bulkhead_config: Optional[BulkheadConfig] = None,
+        failover_config: Optional[FailoverConfig] = None,
     ):
         self._base_url = base_url
         self._oauth_base_url = oauth_base_url
         self._client_id = client_id
         self._client_secret = client_secret
-        self._session = self._prepare_session()
+        pool_config = pool_config or PoolConfig()
+        self._adapter = PooledHTTPAdapter(pool_config)
+        self._session = self._prepare_session(self._adapter)
         self._logger = logger
         self._is_debug = is_debug
+        self._request_logger = RequestLogger(
+            logger, request_log_config, log_body=is_debug
+        )
+        self._timeout_config = timeout_config or TimeoutConfig(
+            default=Timeout(connect=DEFAULT_TIMEOUT, read=DEFAULT_TIMEOUT)
+        )
+        self._retry_policy = retry_policy
+        self._compression_config = compression_config
+        # Two threads per hedged call, one per pooled connection it may use
+        self._hedger = (
+            Hedger(hedge_policy, max_workers=pool_config.pool_maxsize * 2)
+            if hedge_policy is not None
+            else None
+        )
+        self._circuit_breakers = (
+            CircuitBreakerRegistry(circuit_breaker_config, logger)
+            if circuit_breaker_config is not None
+            else None
+        )
+        self._rate_limiter = (
+            RateLimiter(rate_limit_config) if rate_limit_config is not None else None
+        )
+        self._bulkheads = (
+            BulkheadRegistry(bulkhead_config, pool_config)
+            if bulkhead_config is not None
+            else None
+        )
+        # Each endpoint class sends through its own session and connection pool
+        self._bulkhead_sessions = {
+            bulkhead.bulkhead_class: self._prepare_session(bulkhead.adapter)
+            for bulkhead in (self._bulkheads.all() if self._bulkheads else [])
+        }
+        self._token_refresh_ratio = token_refresh_ratio
 
         self._auth = OAuth2Session(
             client=BackendApplicationClient(client_id),
@@ -46,41 +129,498 @@ class HTTPClient:
                 "client_secret": client_secret,
             },
         )
-        self._access_token = self.get_access_token()
+        self._mount_adapter(self._auth, self._adapter)
+        # The token is fetched on the first request or by ensure_access_token,
+        # so building the client never does network I/O
+        self._token_manager = TokenManager(
+            self._fetch_token, token_store or InMemoryTokenStore(), logger
+        )
+
+        self._failover_config = failover_config
+        self._base_url_selector = None
+        self._prober = None
+        if failover_config is not None and len(failover_config.base_urls) > 1:
+            self._base_url_selector = BaseURLSelector(failover_config)
+            if failover_config.probe_interval is not None:
+                self._prober = Prober(
+                    self._probe,
+                    failover_config.base_urls,
+                    failover_config.probe_interval,
+                    logger,
+                )
+                self._prober.start()
 
     def _save_token(self, token):
-        self._access_token = token
+        self._token_manager.set(
+            AccessToken.from_response(token, self._token_refresh_ratio)
+        )
 
     @staticmethod
-    def _prepare_session():
+    def _prepare_session(adapter: PooledHTTPAdapter):
         session = requests.Session()
         session.headers.update({})
+        HTTPClient._mount_adapter(session, adapter)
 
         return session
 
-    def get_access_token(self):
-        token = self._auth.fetch_token(
-            token_url=self._oauth_base_url,
-            client_id=self._client_id,
-            client_secret=self._client_secret,
+    @staticmethod
+    def _mount_adapter(session: requests.Session, adapter: PooledHTTPAdapter):
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    def close(self):
+        """
+        Stop the failover prober and the hedge threads, and close the connection pools
+        """
+        if self._prober is not None:
+            self._prober.stop()
+        if self._hedger is not None:
+            self._hedger.close()
+        for session in [self._session, self._auth, *self._bulkhead_sessions.values()]:
+            session.close()
+
+    def get_pool_stats(self) -> PoolStats:
+        """
+        GetPoolStats returns the live connection pool usage of the client: the pool shared by the SAT
+        and OAuth sessions, plus the pool of every bulkhead when bulkheads are enabled, since SAT
+        requests then go through the bulkhead pools. The usage per endpoint class is in get_bulkhead_stats
+                :return: PoolStats
+        """
+        adapters = [self._adapter]
+        if self._bulkheads is not None:
+            adapters += [bulkhead.adapter for bulkhead in self._bulkheads.all()]
+        return sum_pool_stats(adapter.get_stats() for adapter in adapters)
+
+    def open_connections(self, count: int, deadline: Optional[Deadline] = None) -> int:
+        """
+        Open connections to SAT ahead of the first request and keep them idle in the pool,
+        every base URL and every bulkhead pool gets its own connections
+                :param count: connections wanted per pool, bounded by the pool size
+                :param deadline: deadline of the warm up
+                :return: number of connections opened
+        """
+        base_urls = (
+            self._failover_config.base_urls
+            if self._failover_config is not None
+            else (self._base_url,)
+        )
+        adapters = (
+            [bulkhead.adapter for bulkhead in self._bulkheads.all()]
+            if self._bulkheads is not None
+            else [self._adapter]
+        )
+
+        opened = 0
+        for url in base_urls:
+            settings = self._session.merge_environment_settings(
+                url, {}, None, None, None
+            )
+            for adapter in adapters:
+                timeout = self._resolve_timeout(None, deadline)
+                opened += adapter.open_connections(
+                    url, count, settings, timeout.connect
+                )
+        return opened
+
+    def get_access_token(self, deadline: Optional[Deadline] = None) -> str:
+        """
+        Fetch a new access token from the OAuth server, bypassing the cached one
+                :param deadline: deadline of the call that needs the token
+                :return: the access token
+        """
+        return self._fetch_token(deadline).access_token
+
+    def _fetch_token(self, deadline: Optional[Deadline] = None) -> AccessToken:
+        timeout = self._resolve_timeout(Endpoint.TOKEN, deadline)
+        try:
+            token = self._auth.fetch_token(
+                token_url=self._oauth_base_url,
+                client_id=self._client_id,
+                client_secret=self._client_secret,
+                timeout=timeout.as_tuple(),
+            )
+        except requests.exceptions.Timeout as exc:
+            self._raise_if_deadline_exceeded(deadline, Endpoint.TOKEN, exc)
+            raise
+
+        return AccessToken.from_response(token, self._token_refresh_ratio)
+
+    def ensure_access_token(self, deadline: Optional[Deadline] = None) -> str:
+        """
+        Return a valid access token, fetching it when missing or expired and refreshing it
+        in the background once it is close to expiry, call it on startup to warm up the client
+                :param deadline: deadline of the call that needs the token
+                :return: the access token
+        """
+        return self._token_manager.get(deadline)
+
+    def send_request(
+        self,
+        request: requests.Request,
+        endpoint: Optional[Endpoint] = None,
+        deadline: Optional[Deadline] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Sends a prepared Request object and returns the response.
+                :param request: request to send
+                :param endpoint: SAT endpoint of the request, used to pick the endpoint timeout
+                :param deadline: deadline of the whole call, the socket timeouts and backoffs never outlive it
+                :param stream: do not download the body upfront, the caller must consume or close the response
+                :return: requests.Response, retries done are recorded on the sat_retry_state attribute
+                :raise DeadlineExceededException: if the deadline passed before a response arrived
+        """
+        self._compress_body(request, endpoint)
+
+        if self._retry_policy is None or endpoint is None:
+            return self._send(request, endpoint, deadline, stream)
+
+        policy = self._retry_policy
+        state = RetryState()
+        attempt = 1
+        while True:
+            try:
+                response = self._send(request, endpoint, deadline, stream)
+            except DeadlineExceededException:
+                raise
+            except requests.exceptions.RequestException as exc:
+                if attempt >= policy.max_attempts or not policy.should_retry_exception(
+                    endpoint, exc
+                ):
+                    raise
+                wait = policy.backoff(attempt)
+                if deadline is not None and deadline.remaining() <= wait:
+                    raise
+                self._logger.debug(
+                    "Retrying %s after %s, attempt %d", endpoint.value, exc, attempt
+                )
+            else:
+                if attempt >= policy.max_attempts or not policy.should_retry_response(
+                    endpoint, response
+                ):
+                    setattr(response, RETRY_STATE_ATTRIBUTE, state)
+                    return response
+                wait = policy.wait_for_response(response, attempt)
+                if deadline is not None and deadline.remaining() <= wait:
+                    setattr(response, RETRY_STATE_ATTRIBUTE, state)
+                    return response
+                self._logger.debug(
+                    "Retrying %s after status %d, attempt %d",
+                    endpoint.value,
+                    response.status_code,
+                    attempt,
+                )
+                response.close()
+
+            time.sleep(wait)
+            state.retries += 1
+            state.backoff += wait
+            attempt += 1
+
+    def _send(
+        self,
+        request: requests.Request,
+        endpoint: Optional[Endpoint],
+        deadline: Optional[Deadline],
+        stream: bool = False,
+    ) -> requests.Response:
+        if self._hedger is not None and not stream and self._hedger.applies(endpoint):
+            return self._hedger.send(
+                lambda attempt: self._send_with_replay(attempt, endpoint, deadline),
+                request,
+                endpoint,
+            )
+        return self._send_with_replay(request, endpoint, deadline, stream)
+
+    def _send_with_replay(
+        self,
+        request: requests.Request,
+        endpoint: Optional[Endpoint],
+        deadline: Optional[Deadline],
+        stream: bool = False,
+    ) -> requests.Response:
+        access_token = self.ensure_access_token(deadline)
+        response = self._send_authorized(
+            request, endpoint, deadline, access_token, stream
         )
+        if response.status_code != 401:
+            return response
 
-        return token.get("access_token")
+        # The token was revoked or expired early, refresh it once and replay the request
+        self._logger.debug("Access token rejected, replaying request with a new token")
+        response.close()
+        self._token_manager.invalidate(access_token)
+        access_token = self.ensure_access_token(deadline)
+        return self._send_authorized(request, endpoint, deadline, access_token, stream)
+
+    def _send_authorized(
+        self,
+        request: requests.Request,
+        endpoint: Optional[Endpoint],
+        deadline: Optional[Deadline],
+        access_token: str,
+        stream: bool = False,
+    ) -> requests.Response:
 
-    def send_request(self, request: requests.Request) -> requests.Response:
-        """Sends a prepared Request object and returns the response."""
-        request.headers["Date"] = datetime.now(timezone.utc).strftime(DATE_TIME_FORMAT)
         request.headers["Content-Type"] = "application/json"
         request.headers["Accept"] = "application/json"
         request.headers["X-Sat-Sdk-Version"] = SDK_LABEL
-        request.headers["Authorization"] = f"Bearer {self._access_token}"
+        request.headers["Authorization"] = f"Bearer {access_token}"
+        if self._compression_config is not None:
+            request.headers["Accept-Encoding"] = (
+                self._compression_config.accept_encoding_header()
+            )
 
         prepared_request = self._auth.prepare_request(request)
 
-        response = self._session.send(prepared_request)
+        if self._rate_limiter is not None:
+            wait = self._rate_limiter.reserve(endpoint, deadline)
+            if wait > 0:
+                time.sleep(wait)
 
-        self._logger.info(
-            f"Request: {response.request.url}, {response.request.method} {response.request.body} {response.request.headers}"
+        if self._base_url_selector is None:
+            return self._send_isolated(prepared_request, endpoint, deadline, stream)
+        return self._send_routed(prepared_request, endpoint, deadline, stream)
+
+    def _send_routed(
+        self,
+        prepared_request: requests.PreparedRequest,
+        endpoint: Optional[Endpoint],
+        deadline: Optional[Deadline],
+        stream: bool,
+    ) -> requests.Response:
+        selector = self._base_url_selector
+        url = prepared_request.url
+        if not url.startswith(selector.primary):
+            return self._send_isolated(prepared_request, endpoint, deadline, stream)
+
+        path = url[len(selector.primary) :]
+        base_urls = selector.ordered()
+        for index, base_url in enumerate(base_urls):
+            is_last = index == len(base_urls) - 1
+            prepared_request.url = f"{base_url}{path}"
+            started = time.monotonic()
+            try:
+                response = self._send_isolated(
+                    prepared_request, endpoint, deadline, stream, base_url
+                )
+            except CircuitOpenException as exc:
+                # Nothing was sent, any endpoint can go to the next base URL
+                if is_last:
+                    raise
+                self._logger.warning("Failing over from %s: %s", base_url, exc)
+                continue
+            except requests.exceptions.RequestException as exc:
+                selector.record(base_url, time.monotonic() - started, failed=True)
+                # Only a request that provably never reached SAT, or an idempotent one, is sent again
+                if is_last or not (
+                    endpoint in IDEMPOTENT_ENDPOINTS or is_connect_failure(exc)
+                ):
+                    raise
+                self._logger.warning("Failing over from %s: %s", base_url, exc)
+                continue
+
+            failed = response.status_code >= 500
+            selector.record(base_url, time.monotonic() - started, failed=failed)
+            if (
+                is_last
+                or endpoint not in IDEMPOTENT_ENDPOINTS
+                or not selector.should_fail_over(response.status_code)
+            ):
+                return response
+            self._logger.warning(
+                "Failing over from %s after status %s", base_url, response.status_code
+            )
+            response.close()
+
+    def _send_isolated(
+        self,
+        prepared_request: requests.PreparedRequest,
+        endpoint: Optional[Endpoint],
+        deadline: Optional[Deadline],
+        stream: bool,
+        base_url: Optional[str] = None,
+    ) -> requests.Response:
+        bulkhead = self._get_bulkhead(endpoint)
+        if bulkhead is None:
+            return self._send_prepared(
+                self._session, prepared_request, endpoint, deadline, stream, base_url
+            )
+
+        bulkhead.acquire(endpoint, deadline)
+        try:
+            response = self._send_prepared(
+                self._bulkhead_sessions[bulkhead.bulkhead_class],
+                prepared_request,
+                endpoint,
+                deadline,
+                stream,
+                base_url,
+            )
+        except BaseException:
+            bulkhead.release()
+            raise
+
+        if stream:
+            # The connection goes back to the pool only once the body is consumed
+            bulkhead.release_on_close(response)
+        else:
+            bulkhead.release()
+        return response
+
+    def _send_prepared(
+        self,
+        session: requests.Session,
+        prepared_request: requests.PreparedRequest,
+        endpoint: Optional[Endpoint],
+        deadline: Optional[Deadline],
+        stream: bool,
+        base_url: Optional[str] = None,
+    ) -> requests.Response:
+        timeout = self._resolve_timeout(endpoint, deadline)
+        breaker = self._get_circuit_breaker(endpoint, base_url)
+        if breaker is not None:
+            admission = breaker.before_call()
+
+        # Stamped after the rate limiter and bulkhead waits, Date is the time the request leaves
+        prepared_request.headers["Date"] = datetime.now(timezone.utc).strftime(
+            DATE_TIME_FORMAT
         )
+        started = time.monotonic()
+        try:
+            response = session.send(
+                prepared_request, timeout=timeout.as_tuple(), stream=stream
+            )
+        except requests.exceptions.RequestException as exc:
+            if breaker is not None:
+                breaker.on_failure(admission, time.monotonic() - started)
+            if isinstance(exc, requests.exceptions.Timeout):
+                self._raise_if_deadline_exceeded(deadline, endpoint, exc)
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.on_ignored(admission)
+            raise
+
+        elapsed = time.monotonic() - started
+        if breaker is not None:
+            if breaker.is_failure_status(response.status_code):
+                breaker.on_failure(admission, elapsed)
+            else:
+                breaker.on_success(admission, elapsed)
+        if self._rate_limiter is not None:
+            self._rate_limiter.observe(endpoint, response)
+        self._request_logger.log(response, endpoint, elapsed)
 
         return response
+
+    def _probe(self, base_url: str):
+        # The ping bypasses breakers, bulkheads and rate limits, it measures the base URL alone
+        timeout = self._failover_config.probe_timeout
+        access_token = self._token_manager.get(Deadline.after(timeout))
+        request = requests.Request(
+            method="GET",
+            url=f"{base_url}{PING_PATH}",
+            headers={
+                "Accept": "application/json",
+                "X-Sat-Sdk-Version": SDK_LABEL,
+                "Authorization": f"Bearer {access_token}",
+            },
+        )
+        started = time.monotonic()
+        try:
+            response = self._session.send(
+                self._session.prepare_request(request), timeout=(timeout, timeout)
+            )
+        except requests.exceptions.RequestException:
+            self._base_url_selector.record(
+                base_url, time.monotonic() - started, failed=True
+            )
+            raise
+
+        response.close()
+        self._base_url_selector.record(
+            base_url, time.monotonic() - started, failed=response.status_code >= 500
+        )
+
+    def get_base_url_stats(self) -> List[BaseURLStats]:
+        """
+        GetBaseURLStats returns the latency and error rate tracked for every SAT base URL
+                :return: BaseURLStats per base URL, empty when a single base URL is configured
+        """
+        if self._base_url_selector is None:
+            return []
+        return self._base_url_selector.get_stats()
+
+    def get_hedge_stats(self) -> HedgeStats:
+        """
+        GetHedgeStats returns how many hedge requests were sent and how many of them won
+                :return: HedgeStats, zero when hedging is disabled
+        """
+        if self._hedger is None:
+            return HedgeStats()
+        return self._hedger.get_stats()
+
+    def get_bulkhead_stats(self) -> Dict[BulkheadClass, BulkheadStats]:
+        """
+        GetBulkheadStats returns the in-flight requests, queue waits and pool usage of every endpoint class
+                :return: BulkheadStats per BulkheadClass, empty when bulkheads are disabled
+        """
+        if self._bulkheads is None:
+            return {}
+        return self._bulkheads.get_stats()
+
+    def _get_bulkhead(self, endpoint: Optional[Endpoint]) -> Optional[Bulkhead]:
+        if self._bulkheads is None or endpoint is None:
+            return None
+        return self._bulkheads.get(endpoint)
+
+    def get_circuit_state(
+        self, endpoint: Endpoint, base_url: Optional[str] = None
+    ) -> CircuitState:
+        """
+        GetCircuitState returns the circuit breaker state of the endpoint, CLOSED when breakers are disabled
+                :param endpoint: the endpoint
+                :param base_url: with several SAT base URLs, the base URL of the breaker,
+                    by default the most available state across the base URLs
+                :return: CircuitState
+        """
+        if self._circuit_breakers is None:
+            return CircuitState.CLOSED
+        return self._circuit_breakers.get_state(endpoint, base_url)
+
+    def _get_circuit_breaker(
+        self, endpoint: Optional[Endpoint], base_url: Optional[str] = None
+    ) -> Optional[CircuitBreaker]:
+        if self._circuit_breakers is None or endpoint is None:
+            return None
+        return self._circuit_breakers.get(endpoint, base_url)
+
+    def _compress_body(self, request: requests.Request, endpoint: Optional[Endpoint]):
+        # Compressed once, retries and replays send the same bytes
+        config = self._compression_config
+        if config is None or not config.should_compress(endpoint, request.data):
+            return
+
+        request.data = config.compress(request.data)
+        request.headers["Content-Encoding"] = config.request_encoding
+
+    def _resolve_timeout(
+        self, endpoint: Optional[Endpoint], deadline: Optional[Deadline]
+    ) -> Timeout:
+        timeout = self._timeout_config.for_endpoint(endpoint)
+        if deadline is None:
+            return timeout
+
+        deadline.check(endpoint.value if endpoint else "request")
+        return deadline.bound(timeout)
+
+    @staticmethod
+    def _raise_if_deadline_exceeded(
+        deadline: Optional[Deadline], endpoint: Optional[Endpoint], exc: Exception
+    ):
+        if deadline is not None and deadline.expired():
+            operation = endpoint.value if endpoint else "request"
+            raise DeadlineExceededException(
+                f"{operation} timed out before the deadline: {exc}"
+            ) from exc
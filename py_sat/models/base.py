@@ -7,6 +7,9 @@ import requests
 from dataclasses_json import (DataClassJsonMixin, Undefined, config,
                               dataclass_json)
 
+from py_sat.constant import SIGNED_BODY_ATTRIBUTE
+from py_sat.retry import RETRY_STATE_ATTRIBUTE
+
 
 class BaseResponse(DataClassJsonMixin):
     _raw_response: requests.Response
@@ -21,6 +24,27 @@ class BaseResponse(DataClassJsonMixin):
     def is_success(self):
         return 200 <= self._raw_response.status_code < 300
 
+    def get_retry_count(self) -> int:
+        """
+        Number of retries done by the SDK before this response was received
+        """
+        state = getattr(self._raw_response, RETRY_STATE_ATTRIBUTE, None)
+        return state.retries if state else 0
+
+    def get_retry_backoff(self) -> float:
+        """
+        Cumulative seconds waited between the attempts of this call
+        """
+        state = getattr(self._raw_response, RETRY_STATE_ATTRIBUTE, None)
+        return state.backoff if state else 0.0
+
+    def get_signed_body(self) -> Optional[bytes]:
+        """
+        Exact request body bytes the signature header was computed on, before compression,
+        None when the request was not signed
+        """
+        return getattr(self._raw_response, SIGNED_BODY_ATTRIBUTE, None)
+
 
 class BaseRequest(DataClassJsonMixin):
     pass
@@ -42,3 +42,13 @@ class OrderDetail(BaseResponse):
     client_number: str = field(default="")
     voucher_code: str = field(default="")
     serial_number: str = field(default="")
+
+    def with_redelivery(self, redelivery: bool):
+        self._redelivery = redelivery
+        return self
+
+    def is_redelivery(self) -> bool:
+        """
+        True when the callback was already verified and handled, SAT delivered it again
+        """
+        return getattr(self, "_redelivery", False)
@@ -0,0 +1,268 @@
+"""
+pool package contains the connection pool configuration and the instrumented
+requests adapter used by HTTPClient to keep connections to SAT alive and measurable.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager
+
+
+@dataclass
+class PoolConfig:
+    """
+    PoolConfig holds the connection pool settings applied to every session of HTTPClient
+
+    :param pool_connections: number of per-host pools to keep cached
+    :param pool_maxsize: maximum number of connections kept alive per host
+    :param pool_block: block when the pool is exhausted instead of opening a throwaway connection
+    :param idle_timeout: seconds a kept-alive connection may stay idle before it is closed, None keeps it forever
+    """
+
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    idle_timeout: Optional[float] = None
+
+
+@dataclass
+class PoolStats:
+    """
+    PoolStats is a snapshot of the connection pool usage
+
+    :param open: connections currently connected, either idle or in use
+    :param idle: connections connected and waiting in the pool
+    :param in_use: connections checked out by an in-flight request
+    :param handshakes: connections established (TCP and TLS handshakes) since the pool was created
+    """
+
+    open: int = 0
+    idle: int = 0
+    in_use: int = 0
+    handshakes: int = 0
+
+
+def sum_pool_stats(stats: Iterable[PoolStats]) -> PoolStats:
+    """
+    Sum the usage of several connection pools
+
+    :param stats: PoolStats of every pool
+    :return: PoolStats of all the pools together
+    """
+    total = PoolStats()
+    for pool in stats:
+        total.open += pool.open
+        total.idle += pool.idle
+        total.in_use += pool.in_use
+        total.handshakes += pool.handshakes
+    return total
+
+
+class _PoolCounters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.handshakes = 0
+
+    def acquired(self):
+        with self._lock:
+            self.in_use += 1
+
+    def released(self):
+        with self._lock:
+            self.in_use = max(self.in_use - 1, 0)
+
+    def connected(self):
+        with self._lock:
+            self.handshakes += 1
+
+
+class _InstrumentedConnectionMixin:
+    _py_sat_counters: Optional[_PoolCounters] = None
+    _py_sat_last_used: Optional[float] = None
+
+    def connect(self):
+        super().connect()
+        if self._py_sat_counters is not None:
+            self._py_sat_counters.connected()
+
+
+class _InstrumentedHTTPConnection(_InstrumentedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _InstrumentedHTTPSConnection(_InstrumentedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _InstrumentedPoolMixin:
+    _py_sat_counters: Optional[_PoolCounters] = None
+    _py_sat_idle_timeout: Optional[float] = None
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        conn._py_sat_counters = self._py_sat_counters
+        return conn
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        last_used = getattr(conn, "_py_sat_last_used", None)
+        if (
+            self._py_sat_idle_timeout is not None
+            and last_used is not None
+            and time.monotonic() - last_used > self._py_sat_idle_timeout
+        ):
+            # Evict the stale keep-alive socket, urllib3 reconnects on the next use
+            conn.close()
+
+        if self._py_sat_counters is not None:
+            self._py_sat_counters.acquired()
+        return conn
+
+    def _put_conn(self, conn):
+        if conn is not None:
+            conn._py_sat_last_used = time.monotonic()
+        if self._py_sat_counters is not None:
+            self._py_sat_counters.released()
+        super()._put_conn(conn)
+
+    def _idle_connections(self) -> int:
+        if self.pool is None:
+            return 0
+        return sum(
+            1
+            for conn in list(self.pool.queue)
+            if conn is not None and getattr(conn, "sock", None) is not None
+        )
+
+
+class _InstrumentedHTTPConnectionPool(_InstrumentedPoolMixin, HTTPConnectionPool):
+    ConnectionCls = _InstrumentedHTTPConnection
+
+
+class _InstrumentedHTTPSConnectionPool(_InstrumentedPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = _InstrumentedHTTPSConnection
+
+
+class _InstrumentedPoolManager(PoolManager):
+    def __init__(
+        self,
+        counters: _PoolCounters,
+        idle_timeout: Optional[float],
+        *args,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._counters = counters
+        self._idle_timeout = idle_timeout
+        self.pool_classes_by_scheme = {
+            "http": _InstrumentedHTTPConnectionPool,
+            "https": _InstrumentedHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool._py_sat_counters = self._counters
+        pool._py_sat_idle_timeout = self._idle_timeout
+        return pool
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    PooledHTTPAdapter is a requests adapter that applies PoolConfig and tracks the pool usage
+    """
+
+    _pool_config: PoolConfig
+    _counters: _PoolCounters
+
+    def __init__(self, pool_config: PoolConfig):
+        self._pool_config = pool_config
+        self._counters = _PoolCounters()
+        super().__init__(
+            pool_connections=pool_config.pool_connections,
+            pool_maxsize=pool_config.pool_maxsize,
+            pool_block=pool_config.pool_block,
+        )
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+
+        self.poolmanager = _InstrumentedPoolManager(
+            self._counters,
+            self._pool_config.idle_timeout,
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            **pool_kwargs,
+        )
+
+    def get_stats(self) -> PoolStats:
+        """
+        GetStats returns the live usage of every host pool opened by this adapter
+                :return: PoolStats
+        """
+        pools = self.poolmanager.pools
+        idle = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                idle += pool._idle_connections()
+
+        in_use = self._counters.in_use
+        return PoolStats(
+            open=idle + in_use,
+            idle=idle,
+            in_use=in_use,
+            handshakes=self._counters.handshakes,
+        )
+
+    def open_connections(
+        self,
+        url: str,
+        count: int,
+        settings: Dict[str, Any],
+        connect_timeout: Optional[float] = None,
+    ) -> int:
+        """
+        Open connections to the host of the url ahead of the first request, and keep them idle in the pool
+                :param url: url whose host to connect to
+                :param count: connections wanted in the pool, bounded by pool_maxsize
+                :param settings: verify, cert and proxies the session would send the url with
+                :param connect_timeout: timeout of each TCP and TLS handshake in seconds
+                :return: number of connections opened, connections already open are not counted
+        """
+        prepared = requests.Request(method="GET", url=url).prepare()
+        if hasattr(self, "get_connection_with_tls_context"):
+            pool = self.get_connection_with_tls_context(
+                prepared,
+                verify=settings.get("verify", True),
+                proxies=settings.get("proxies"),
+                cert=settings.get("cert"),
+            )
+        else:  # pragma: no cover, requests < 2.32
+            pool = self.get_connection(url, settings.get("proxies"))
+
+        conns = []
+        opened = 0
+        try:
+            for _ in range(min(count, self._pool_config.pool_maxsize)):
+                conn = pool._get_conn(timeout=connect_timeout)
+                conns.append(conn)
+                if getattr(conn, "sock", None) is None:
+                    if connect_timeout is not None:
+                        conn.timeout = connect_timeout
+                    conn.connect()
+                    opened += 1
+        finally:
+            for conn in conns:
+                pool._put_conn(conn)
+        return opened
@@ -0,0 +1,253 @@
+"""
+rate_limit package contains the client-side rate limiter of HTTPClient.
+
+Every endpoint gets a token bucket refilled at its budget, a call takes one token before reaching SAT.
+When SAT answers 429 or advertises an exhausted quota through its rate-limit headers,
+the bucket is drained until the advertised reset so the burst is not sent only to be rejected.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from py_sat.constant import Endpoint
+from py_sat.exceptions import (DeadlineExceededException,
+                               RateLimitExceededException)
+from py_sat.retry import parse_retry_after
+from py_sat.timeout import Deadline
+
+RATE_LIMIT_REMAINING_HEADERS = ("X-RateLimit-Remaining", "RateLimit-Remaining")
+RATE_LIMIT_RESET_HEADERS = ("X-RateLimit-Reset", "RateLimit-Reset")
+
+# Reset values above this are epoch timestamps, below are seconds from now
+_EPOCH_THRESHOLD = 10**9
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    RateLimit is the budget of one endpoint
+
+    :param rate: calls per second the bucket is refilled with
+    :param burst: calls that can be sent at once after an idle period
+    """
+
+    rate: float
+    burst: int = 1
+
+
+@dataclass
+class RateLimitConfig:
+    """
+    RateLimitConfig configures the rate limiter of HTTPClient
+
+    :param default: budget of the endpoints without their own, None leaves them unlimited
+    :param endpoints: budget per endpoint
+    :param blocking: wait for a token when the budget is exhausted, otherwise fail fast
+    :param max_wait: upper bound in seconds of a blocking wait, None waits as long as the deadline allows
+    :param adapt_to_headers: pause the bucket on 429 Retry-After and exhausted rate-limit headers
+    :param max_pause: upper bound in seconds of a pause requested by SAT
+    """
+
+    default: Optional[RateLimit] = None
+    endpoints: Dict[Endpoint, RateLimit] = field(default_factory=dict)
+    blocking: bool = True
+    max_wait: Optional[float] = None
+    adapt_to_headers: bool = True
+    max_pause: float = 60.0
+
+    def for_endpoint(self, endpoint: Endpoint) -> Optional[RateLimit]:
+        return self.endpoints.get(endpoint, self.default)
+
+
+class TokenBucket:
+    """
+    TokenBucket holds the budget of one endpoint, thread-safe.
+
+    Tokens are reserved rather than waited for under the lock, a caller that has to wait
+    takes a token in advance and sleeps outside the lock until its slot
+    """
+
+    _rate: float
+    _burst: int
+    _lock: threading.Lock
+    _tokens: float
+    _updated_at: float
+
+    def __init__(self, limit: RateLimit):
+        self._rate = limit.rate
+        self._burst = limit.burst
+        self._lock = threading.Lock()
+        self._tokens = float(limit.burst)
+        self._updated_at = time.monotonic()
+
+    def reserve(self, max_wait: Optional[float] = None) -> Tuple[bool, float]:
+        """
+        Take a token, possibly ahead of time
+               :param max_wait: longest acceptable wait in seconds, None for no bound
+               :return: whether a token was taken, and the seconds to wait before sending
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(
+                self._updated_at + max(1.0 - self._tokens, 0.0) / self._rate - now,
+                0.0,
+            )
+            if max_wait is not None and wait > max_wait:
+                return False, wait
+            self._tokens -= 1
+            return True, wait
+
+    def pause(self, seconds: float):
+        """
+        Drain the bucket, refilling starts again after the given seconds with a single token
+               :param seconds: seconds until the quota resets
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 1.0)
+            self._updated_at = max(self._updated_at, now + seconds)
+
+    def limit_to(self, remaining: int):
+        """
+        Never hold more tokens than the calls SAT says are left
+               :param remaining: calls left in the current SAT window
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, float(remaining))
+
+    def _refill(self, now: float):
+        # A paused bucket has its refill start in the future
+        if now <= self._updated_at:
+            return
+        self._tokens = min(
+            self._tokens + (now - self._updated_at) * self._rate, float(self._burst)
+        )
+        self._updated_at = now
+
+
+class RateLimiter:
+    """
+    RateLimiter holds one TokenBucket per endpoint, created on first use
+    """
+
+    _config: RateLimitConfig
+    _lock: threading.Lock
+    _buckets: Dict[Endpoint, Optional[TokenBucket]]
+
+    def __init__(self, config: RateLimitConfig):
+        self._config = config
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def reserve(
+        self, endpoint: Optional[Endpoint], deadline: Optional[Deadline] = None
+    ) -> float:
+        """
+        Take a token for the endpoint, the caller sleeps the returned seconds before sending
+               :param endpoint: endpoint of the call, None is never limited
+               :param deadline: deadline of the call, a wait never outlives it
+               :return: seconds to wait before sending
+               :raise RateLimitExceededException: if the budget is exhausted and waiting is not allowed
+               :raise DeadlineExceededException: if the wait would outlive the deadline
+        """
+        bucket = self._get_bucket(endpoint)
+        if bucket is None:
+            return 0.0
+
+        config = self._config
+        allowed = config.max_wait if config.blocking else 0.0
+        max_wait = allowed
+        if deadline is not None:
+            remaining = deadline.remaining()
+            max_wait = remaining if max_wait is None else min(max_wait, remaining)
+
+        reserved, wait = bucket.reserve(max_wait)
+        if reserved:
+            return wait
+        if allowed is None or wait <= allowed:
+            raise DeadlineExceededException(
+                f"{endpoint.value} rate limited for {wait:.3f}s, beyond the deadline"
+            )
+        raise RateLimitExceededException(endpoint, wait)
+
+    def observe(self, endpoint: Optional[Endpoint], response: requests.Response):
+        """
+        Adapt the bucket of the endpoint to the quota advertised by SAT
+               :param endpoint: endpoint of the call
+               :param response: response of the call
+        """
+        if not self._config.adapt_to_headers:
+            return
+
+        bucket = self._get_bucket(endpoint)
+        if bucket is None:
+            return
+
+        headers = response.headers
+        pause = None
+        if response.status_code == 429:
+            pause = parse_retry_after(headers.get("Retry-After"))
+            if pause is None:
+                pause = _parse_reset(_first_header(headers, RATE_LIMIT_RESET_HEADERS))
+
+        remaining = _parse_int(_first_header(headers, RATE_LIMIT_REMAINING_HEADERS))
+        if remaining is not None:
+            bucket.limit_to(remaining)
+            if remaining == 0 and pause is None:
+                pause = _parse_reset(_first_header(headers, RATE_LIMIT_RESET_HEADERS))
+
+        if pause is not None:
+            bucket.pause(min(pause, self._config.max_pause))
+
+    def _get_bucket(self, endpoint: Optional[Endpoint]) -> Optional[TokenBucket]:
+        if endpoint is None:
+            return None
+
+        try:
+            return self._buckets[endpoint]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if endpoint not in self._buckets:
+                limit = self._config.for_endpoint(endpoint)
+                self._buckets[endpoint] = (
+                    TokenBucket(limit) if limit is not None else None
+                )
+            return self._buckets[endpoint]
+
+
+def _first_header(headers, names) -> Optional[str]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return max(int(value.strip()), 0)
+    except ValueError:
+        return None
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        reset = float(value.strip())
+    except ValueError:
+        return None
+    if reset > _EPOCH_THRESHOLD:
+        reset -= time.time()
+    return max(reset, 0.0)
@@ -0,0 +1,137 @@
+"""
+request_log package contains the request logging of HTTPClient and AsyncHTTPClient.
+
+Messages are only rendered when the logger level is enabled, regular requests can be sampled,
+slow requests are always reported and credentials never reach the log.
+"""
+
+import itertools
+import logging
+from dataclasses import dataclass, field
+from typing import FrozenSet, Mapping, Optional
+
+import requests
+
+from py_sat.constant import SIGNATURE_HEADER_KEY, Endpoint
+
+REDACTED = "[REDACTED]"
+
+DEFAULT_REDACTED_HEADERS = frozenset({"authorization", SIGNATURE_HEADER_KEY})
+
+
+@dataclass
+class RequestLogConfig:
+    """
+    RequestLogConfig configures how requests sent to SAT are logged
+
+    :param level: level of the regular request logs
+    :param sample_rate: log 1 in sample_rate regular requests, 1 logs all of them
+    :param slow_threshold: requests slower than this many seconds are logged at WARNING, never sampled
+    :param redacted_headers: header names, case-insensitive, whose value is never logged
+    """
+
+    level: int = logging.DEBUG
+    sample_rate: int = 1
+    slow_threshold: Optional[float] = None
+    redacted_headers: FrozenSet[str] = field(
+        default_factory=lambda: DEFAULT_REDACTED_HEADERS
+    )
+
+
+class _RedactedHeaders:
+    """Renders the headers on demand, only when the record is emitted"""
+
+    __slots__ = ("_headers", "_redacted")
+
+    def __init__(self, headers: Mapping[str, str], redacted: FrozenSet[str]):
+        self._headers = headers
+        self._redacted = redacted
+
+    def __str__(self):
+        return str(
+            {
+                key: REDACTED if key.lower() in self._redacted else value
+                for key, value in self._headers.items()
+            }
+        )
+
+
+class RequestLogger:
+    """
+    RequestLogger logs the requests sent to SAT, thread-safe
+    """
+
+    _logger: logging.Logger
+    _config: RequestLogConfig
+    _log_body: bool
+    _redacted: FrozenSet[str]
+    _counter: "itertools.count"
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        config: Optional[RequestLogConfig] = None,
+        log_body: bool = False,
+    ):
+        """
+        :param logger: logger to write to
+        :param config: RequestLogConfig, default logs every request at DEBUG
+        :param log_body: include the request body, it may contain customer data
+        """
+        self._logger = logger
+        self._config = config or RequestLogConfig()
+        self._log_body = log_body
+        self._redacted = frozenset(h.lower() for h in self._config.redacted_headers)
+        # next() on itertools.count is atomic under the GIL
+        self._counter = itertools.count()
+
+    def log(
+        self,
+        response: requests.Response,
+        endpoint: Optional[Endpoint],
+        elapsed: float,
+    ):
+        """
+        Log the request of the response if the level is enabled and the request is sampled
+               :param response: response received from SAT
+               :param endpoint: SAT endpoint of the request
+               :param elapsed: seconds the request took
+        """
+        config = self._config
+        if config.slow_threshold is not None and elapsed >= config.slow_threshold:
+            level = logging.WARNING
+            message = "Slow request: %s %s %s in %.3fs headers=%s"
+        else:
+            level = config.level
+            message = "Request: %s %s %s in %.3fs headers=%s"
+            if not self._logger.isEnabledFor(level):
+                return
+            if config.sample_rate > 1 and next(self._counter) % config.sample_rate:
+                return
+
+        if not self._logger.isEnabledFor(level):
+            return
+
+        request = response.request
+        args = [
+            request.method,
+            request.url,
+            response.status_code,
+            elapsed,
+            _RedactedHeaders(request.headers, self._redacted),
+        ]
+        if self._log_body:
+            message += " body=%r"
+            args.append(request.body)
+
+        self._logger.log(
+            level,
+            message,
+            *args,
+            extra={
+                "sat_endpoint": endpoint.value if endpoint else None,
+                "sat_method": request.method,
+                "sat_status": response.status_code,
+                "sat_elapsed": elapsed,
+            },
+        )
@@ -0,0 +1,174 @@
+"""
+retry package contains the retry policy applied by HTTPClient.
+
+Retries are safe by construction: idempotent endpoints retry on transient failures,
+while checkout only retries when the request provably never reached SAT
+or when SAT answered with an error code declared retryable.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, List, Optional
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError
+
+from py_sat.constant import Endpoint
+
+IDEMPOTENT_ENDPOINTS = frozenset(
+    {
+        Endpoint.PING,
+        Endpoint.INQUIRY,
+        Endpoint.CHECK_STATUS,
+        Endpoint.PRODUCT_LIST,
+        Endpoint.ACCOUNT,
+    }
+)
+
+DEFAULT_RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+
+RETRY_STATE_ATTRIBUTE = "sat_retry_state"
+
+
+@dataclass
+class RetryState:
+    """
+    RetryState records the retries done for one call
+
+    :param retries: number of retries after the first attempt
+    :param backoff: cumulative seconds slept between attempts
+    """
+
+    retries: int = 0
+    backoff: float = 0.0
+
+
+@dataclass
+class RetryPolicy:
+    """
+    RetryPolicy configures the retries done by HTTPClient
+
+    :param max_attempts: maximum number of attempts, including the first one
+    :param backoff_base: backoff of the first retry in seconds, doubled on every retry
+    :param backoff_max: upper bound of a single backoff in seconds
+    :param retryable_statuses: HTTP statuses retried for idempotent endpoints
+    :param retryable_error_codes: SAT error codes retried for every endpoint, checkout included
+    :param respect_retry_after: wait at least the Retry-After header sent by the server
+    :param max_retry_after: upper bound in seconds of a honored Retry-After
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 0.1
+    backoff_max: float = 2.0
+    retryable_statuses: FrozenSet[int] = field(
+        default_factory=lambda: DEFAULT_RETRYABLE_STATUSES
+    )
+    retryable_error_codes: FrozenSet[str] = field(default_factory=frozenset)
+    respect_retry_after: bool = True
+    max_retry_after: float = 30.0
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Exponential backoff with full jitter
+               :param attempt: the attempt that just failed, starting from 1
+               :return: seconds to wait before the next attempt
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def wait_for_response(self, response: requests.Response, attempt: int) -> float:
+        wait = self.backoff(attempt)
+        if not self.respect_retry_after:
+            return wait
+
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is None:
+            return wait
+        return max(wait, min(retry_after, self.max_retry_after))
+
+    def should_retry_exception(self, endpoint: Endpoint, exc: Exception) -> bool:
+        if not isinstance(
+            exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+        ):
+            return False
+
+        return self.should_retry_failure(endpoint, is_connect_failure(exc))
+
+    def should_retry_failure(self, endpoint: Endpoint, connect_failure: bool) -> bool:
+        """
+        Decide whether a transport failure is retried
+               :param endpoint: endpoint of the failed request
+               :param connect_failure: True if the connection could not be established
+               :return: True if the request can safely be sent again
+        """
+        return connect_failure or endpoint in IDEMPOTENT_ENDPOINTS
+
+    def should_retry_response(
+        self, endpoint: Endpoint, response: requests.Response
+    ) -> bool:
+        if response.status_code < 400:
+            return False
+
+        if (
+            endpoint in IDEMPOTENT_ENDPOINTS
+            and response.status_code in self.retryable_statuses
+        ):
+            return True
+
+        if not self.retryable_error_codes:
+            return False
+        return any(
+            code in self.retryable_error_codes for code in _error_codes(response)
+        )
+
+
+def is_connect_failure(exc: Exception) -> bool:
+    """
+    Check whether the request failed before the connection was established,
+    meaning the request provably never reached the server
+           :param exc: exception raised by requests
+           :return: True if the connection could not be established
+    """
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+
+    if not isinstance(exc, requests.exceptions.ConnectionError) or not exc.args:
+        return False
+
+    reason = exc.args[0]
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    # NewConnectionError and NameResolutionError inherit ConnectTimeoutError
+    return isinstance(reason, ConnectTimeoutError)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header, either delay in seconds or HTTP date
+           :param value: header value
+           :return: seconds to wait, or None if absent or malformed
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _error_codes(response: requests.Response) -> List[str]:
+    try:
+        errors = response.json().get("errors") or []
+        return [error.get("code", "") for error in errors if isinstance(error, dict)]
+    except (ValueError, AttributeError):
+        return []
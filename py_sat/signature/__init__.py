@@ -1,10 +1,16 @@
+import threading
 from enum import Enum
-from typing import Optional
-
-from Crypto.PublicKey import RSA
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 from py_sat.exceptions import InvalidInputException, SignatureErrorException
-from py_sat.signature.interface import SignatureAlgorithm
+from py_sat.signature.interface import SignatureAlgorithm, Signer, Verifier
+from py_sat.signature.keyring import DEFAULT_KEY_ID, Keyring, KeyringStats
+from py_sat.signature.keys import KeyMaterial, KeySource
+from py_sat.signature.openssl import (OPENSSL_AVAILABLE,
+                                      OpenSSLPSSPaddingAlgorithm)
+from py_sat.signature.pool import (BulkResult, SignaturePool,
+                                   SignaturePoolConfig, WorkerKeys, run_item,
+                                   sign_chunk, verify_chunk, verify_pair)
 from py_sat.signature.pss import PSSPaddingAlgorithm
 
 
@@ -12,104 +18,294 @@ class SignatureType(Enum):
     PSS = "PSS"
 
 
+class SignatureBackend(Enum):
+    """
+    SignatureBackend selects the library running the RSA operations, both produce the same signatures.
+    AUTO uses OpenSSL when the cryptography package is installed, pycryptodome otherwise
+    """
+
+    AUTO = "auto"
+    PYCRYPTODOME = "pycryptodome"
+    OPENSSL = "openssl"
+
+
 class Signature:
     """
-    Signature to hold that signature needs, and contain parsed public and private key
+    Signature to hold that signature needs, and contain public and private key.
+    Parsed keys are shared process-wide. Public keys are parsed upfront, every client verifies,
+    the private key on first use, a Signature that only verifies never parses it
     """
 
-    _private_key: Optional[RSA.RsaKey]
-    _public_key: Optional[RSA.RsaKey]
     _algorithm: SignatureAlgorithm
+    _backend: SignatureBackend
+    _signer: Optional[Signer]
+    _keyring: Optional[Keyring]
+    _pool: Optional[SignaturePool]
 
     def __init__(
         self,
-        private_key_str: Optional[str],
-        sat_public_key_str: Optional[str],
+        private_key_str: Optional[KeySource],
+        sat_public_key_str: Optional[KeySource],
         padding_type: SignatureType,
+        backend: SignatureBackend = SignatureBackend.AUTO,
+        sat_public_keys: Optional[Dict[str, KeySource]] = None,
+        pool_config: Optional[SignaturePoolConfig] = None,
     ):
+        """
+        Every key is a PEM string, PEM or DER bytes, or the path of a file holding one of them
+
+        :param private_key_str: client private key, used to sign
+        :param sat_public_key_str: SAT public key, used to verify, keyed by "default" in the keyring
+        :param padding_type: signature padding
+        :param backend: library running the RSA operations
+        :param sat_public_keys: additional SAT public keys by key id, for key rotation
+        :param pool_config: process pool of sign_many and verify_many, None runs them in this process
+        """
         if not padding_type:
             raise InvalidInputException("Padding type is required")
 
-        self._private_key = self._parse_rsa_private_key_from_pem_str(private_key_str)
-        self._public_key = self._parse_public_key(sat_public_key_str)
-        self._algorithm = self.__decide_padding_algorithm(padding_type)
+        self._backend = self.__decide_backend(backend)
 
-    def verify(self, msg: str, signature: str) -> bool:
+        private_key = self._parse_private_key(private_key_str)
+        public_keys = self._parse_public_keys(
+            self._parse_public_key(sat_public_key_str), sat_public_keys
+        )
+        self._algorithm = self.__decide_padding_algorithm(padding_type, self._backend)
+        # Bound once to the keys, so nothing key dependent is recomputed per message
+        self._signer = (
+            _LazySigner(self._algorithm, private_key) if private_key else None
+        )
+        self._keyring = (
+            Keyring(
+                {
+                    key_id: self.__bind_verifier(key_id, public_key)
+                    for key_id, public_key in public_keys.items()
+                }
+            )
+            if public_keys
+            else None
+        )
+        self._pool = (
+            SignaturePool(
+                pool_config,
+                WorkerKeys(
+                    private_key=private_key.data if private_key else None,
+                    public_keys={
+                        key_id: public_key.data
+                        for key_id, public_key in public_keys.items()
+                    },
+                    padding_type=padding_type.value,
+                    backend=self._backend.value,
+                ),
+            )
+            if pool_config
+            else None
+        )
+
+    @property
+    def backend(self) -> SignatureBackend:
+        """The backend in use, never AUTO"""
+        return self._backend
+
+    def verify(
+        self, msg: Union[str, bytes], signature: str, key_id: Optional[str] = None
+    ) -> bool:
         """
-        Verify the signature of the message, return True if the signature is valid, False otherwise
+        Verify the signature of the message, return True if the signature is valid, False otherwise.
+        Every key of the keyring is tried, the hinted one and the most recently successful ones first
 
-        :param msg: message to verify, must be a string
+        :param msg: message to verify, a string or the raw bytes received
         :param signature: signature to verify, must be a string
+        :param key_id: optional id of the key SAT signed with
         :return: True if the signature is valid, False otherwise
-        :raise InvalidInputException: if the message or signature is not a string or public key is not set
+        :raise InvalidInputException: if the message or signature has an invalid type or public key is not set
         :raise SignatureErrorException: if there is an error verifying the signature
         """
-        if not isinstance(msg, str) or not isinstance(signature, str):
-            raise InvalidInputException("Message and signature must be strings")
+        if not isinstance(msg, (str, bytes)) or not isinstance(signature, str):
+            raise InvalidInputException(
+                "Message must be a string or bytes and signature must be a string"
+            )
 
-        if not self._public_key:
+        if not self._keyring:
             raise InvalidInputException("Public key not set")
 
         try:
-            return self._algorithm.verify(self._public_key, msg, signature)
+            return self._keyring.verify(msg, signature, key_id) is not None
         except Exception as exc:
             raise SignatureErrorException(f"Error verifying signature: {exc}")
 
-    def sign(self, msg: str) -> str:
+    def sign_many(self, messages: Iterable[Union[str, bytes]]) -> List[BulkResult[str]]:
+        """
+        Sign every message, in the process pool when one is configured
+
+        :param messages: messages to sign
+        :return: one result per message, in order, holding the signature or the error of that message
+        """
+        messages = list(messages)
+        if self._pool is None:
+            return [run_item(self.sign, message) for message in messages]
+        return self._pool.map(sign_chunk, messages)
+
+    def verify_many(
+        self, pairs: Iterable[Tuple[Union[str, bytes], str]]
+    ) -> List[BulkResult[bool]]:
+        """
+        Verify every message and signature pair, in the process pool when one is configured.
+        The keyring stats only count the verifications done in this process
+
+        :param pairs: message and signature pairs to verify
+        :return: one result per pair, in order, holding whether the signature is valid or the error of that pair
+        """
+        pairs = list(pairs)
+        if self._pool is None:
+            return [run_item(verify_pair, self, pair) for pair in pairs]
+        return self._pool.map(verify_chunk, pairs)
+
+    def close(self):
+        """
+        Stop the worker processes of the pool, they are started again by the next bulk operation
+        """
+        if self._pool is not None:
+            self._pool.close()
+
+    def get_keyring_stats(self) -> KeyringStats:
+        """
+        Which key verified the signatures and how many RSA verifications each verification took
+        """
+        return self._keyring.get_stats() if self._keyring else KeyringStats()
+
+    def warm_up(self, msg: Union[str, bytes]):
+        """
+        Sign and verify once with every key, the verification results are discarded and not counted
+        """
+        signature = self._signer.sign(msg) if self._signer else ""
+        if self._keyring and signature:
+            for verifier in self._keyring.verifiers().values():
+                verifier.verify(msg, signature)
+
+    def sign(self, msg: Union[str, bytes]) -> str:
         """
         Sign the message and return the signature
 
-        :param msg: to sign, must be a string
+        :param msg: to sign, a string or the exact bytes that are sent
         :return: the signature as a string
-        :raises InvalidInputException: if the message is not a string or private key is not set
+        :raises InvalidInputException: if the message is not a string or bytes or private key is not set
         :raises SignatureErrorException: if there is an error signing the message
         """
-        if not isinstance(msg, str):
-            raise InvalidInputException("Message must be a string")
+        if not isinstance(msg, (str, bytes)):
+            raise InvalidInputException("Message must be a string or bytes")
 
-        if not self._private_key:
+        if not self._signer:
             raise InvalidInputException("Private key not set")
 
         try:
-            return self._algorithm.sign(self._private_key, msg)
+            return self._signer.sign(msg)
         except Exception as exc:
             raise SignatureErrorException(f"Error signing message: {exc}")
 
     @staticmethod
-    def __decide_padding_algorithm(padding_type: SignatureType) -> SignatureAlgorithm:
+    def __decide_backend(backend: SignatureBackend) -> SignatureBackend:
+        if backend == SignatureBackend.AUTO:
+            return (
+                SignatureBackend.OPENSSL
+                if OPENSSL_AVAILABLE
+                else SignatureBackend.PYCRYPTODOME
+            )
+        if backend == SignatureBackend.OPENSSL and not OPENSSL_AVAILABLE:
+            raise InvalidInputException(
+                "OpenSSL signature backend requires the cryptography package, "
+                "install py_sat_sdk[openssl]"
+            )
+        if not isinstance(backend, SignatureBackend):
+            raise InvalidInputException(f"Unknown signature backend: {backend}")
+        return backend
+
+    @staticmethod
+    def __decide_padding_algorithm(
+        padding_type: SignatureType, backend: SignatureBackend
+    ) -> SignatureAlgorithm:
         if padding_type == SignatureType.PSS:
+            if backend == SignatureBackend.OPENSSL:
+                return OpenSSLPSSPaddingAlgorithm()
             return PSSPaddingAlgorithm()
         else:
             raise InvalidInputException(f"Unknown padding type: {padding_type}")
 
+    def __bind_verifier(self, key_id: str, public_key: KeyMaterial) -> Verifier:
+        try:
+            return self._algorithm.verifier(public_key.parse())
+        except (ValueError, TypeError, IndexError) as exc:
+            raise InvalidInputException(f"Invalid RSA public key {key_id}: {exc}")
+
     @staticmethod
-    def _parse_rsa_private_key_from_pem_str(
-        private_key_pem: Optional[str],
-    ) -> Optional[RSA.RsaKey]:
+    def _parse_private_key(
+        private_key: Optional[KeySource],
+    ) -> Optional[KeyMaterial]:
+        """Checks the format of an RSA private key, it is parsed on first use."""
         try:
-            """Parses an RSA private key from a PEM-encoded string."""
-            if not private_key_pem:
+            if not private_key:
                 return None
 
-            private_key = RSA.import_key(private_key_pem.encode())
-            if not isinstance(private_key, RSA.RsaKey):
-                raise InvalidInputException("Key is not a valid RSA public key")
+            return KeyMaterial(private_key)
+        except (ValueError, TypeError) as exc:
+            raise InvalidInputException(f"Invalid RSA private key: {exc}")
 
-            return private_key
-        except (ValueError, IndexError, TypeError) as exc:
-            raise InvalidInputException(f"Invalid RSA private key PEM: {exc}")
+    @classmethod
+    def _parse_public_keys(
+        cls,
+        public_key: Optional[KeyMaterial],
+        public_keys: Optional[Dict[str, KeySource]],
+    ) -> Dict[str, KeyMaterial]:
+        materials = {}
+        for key_id, source in (public_keys or {}).items():
+            if not key_id or not isinstance(key_id, str):
+                raise InvalidInputException("Key id must be a non-empty string")
+            material = cls._parse_public_key(source)
+            if material is None:
+                raise InvalidInputException(f"Public key {key_id} is empty")
+            materials[key_id] = material
+
+        if public_key is None:
+            return materials
+
+        # The main key is tried first, under its own id when it is also in the keyring
+        main_key_id = next(
+            (
+                key_id
+                for key_id, material in materials.items()
+                if material.digest == public_key.digest
+            ),
+            DEFAULT_KEY_ID,
+        )
+        if main_key_id == DEFAULT_KEY_ID and DEFAULT_KEY_ID in materials:
+            raise InvalidInputException(
+                f"Key id {DEFAULT_KEY_ID} is reserved for the main SAT public key"
+            )
+        materials.pop(main_key_id, None)
+        return {main_key_id: public_key, **materials}
 
     @staticmethod
-    def _parse_public_key(public_key_pem: Optional[str]) -> Optional[RSA.RsaKey]:
-        """Parses an RSA public key from a PEM-encoded string."""
+    def _parse_public_key(public_key: Optional[KeySource]) -> Optional[KeyMaterial]:
+        """Checks the format of an RSA public key, it is parsed once the keyring is built."""
         try:
-            if not public_key_pem:
+            if not public_key:
                 return None
 
-            public_key = RSA.import_key(public_key_pem.encode())
+            return KeyMaterial(public_key)
+        except (ValueError, TypeError) as exc:
+            raise InvalidInputException(f"Invalid RSA public key: {exc}")
+
+
+class _LazySigner(Signer):
+    def __init__(self, algorithm: SignatureAlgorithm, private_key: KeyMaterial):
+        self._algorithm = algorithm
+        self._private_key = private_key
+        self._signer: Optional[Signer] = None
+        self._lock = threading.Lock()
 
-            if not isinstance(public_key, RSA.RsaKey):
-                raise InvalidInputException("Key is not a valid RSA public key")
-            return public_key
-        except (ValueError, IndexError, TypeError) as exc:
-            raise InvalidInputException(f"Invalid RSA public key PEM: {exc}")
+    def sign(self, msg: Union[str, bytes]) -> str:
+        if self._signer is None:
+            with self._lock:
+                if self._signer is None:
+                    self._signer = self._algorithm.signer(self._private_key.parse())
+        return self._signer.sign(msg)
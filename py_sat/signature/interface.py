@@ -4,6 +4,28 @@ from typing import Union
 from Crypto.PublicKey import RSA
 
 
+class Signer(ABC):
+    """
+    Signer is bound to one private key, it holds everything that does not depend on the message
+    """
+
+    @abstractmethod
+    def sign(self, msg: Union[str, bytes]) -> str:
+        """Signs a message"""
+        pass
+
+
+class Verifier(ABC):
+    """
+    Verifier is bound to one public key, it holds everything that does not depend on the message
+    """
+
+    @abstractmethod
+    def verify(self, msg: Union[str, bytes], signature: str) -> bool:
+        """Verifies a signature"""
+        pass
+
+
 class SignatureAlgorithm(ABC):
     @abstractmethod
     def verify(
@@ -16,3 +38,29 @@ class SignatureAlgorithm(ABC):
     def sign(self, private_key: RSA.RsaKey, msg: Union[str, bytes]) -> str:
         """Signs a message"""
         pass
+
+    def signer(self, private_key: RSA.RsaKey) -> Signer:
+        """Returns a signer bound to the private key, to be reused across messages"""
+        return _KeyBoundSigner(self, private_key)
+
+    def verifier(self, public_key: RSA.RsaKey) -> Verifier:
+        """Returns a verifier bound to the public key, to be reused across messages"""
+        return _KeyBoundVerifier(self, public_key)
+
+
+class _KeyBoundSigner(Signer):
+    def __init__(self, algorithm: SignatureAlgorithm, private_key: RSA.RsaKey):
+        self._algorithm = algorithm
+        self._private_key = private_key
+
+    def sign(self, msg: Union[str, bytes]) -> str:
+        return self._algorithm.sign(self._private_key, msg)
+
+
+class _KeyBoundVerifier(Verifier):
+    def __init__(self, algorithm: SignatureAlgorithm, public_key: RSA.RsaKey):
+        self._algorithm = algorithm
+        self._public_key = public_key
+
+    def verify(self, msg: Union[str, bytes], signature: str) -> bool:
+        return self._algorithm.verify(self._public_key, msg, signature)
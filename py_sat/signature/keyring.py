@@ -0,0 +1,119 @@
+"""
+keyring package contains the SAT public keys a signature is verified with.
+
+During a SAT key rotation the old and the new key are both valid. Keys are tried most recently
+successful first, so once the fleet settles on a key every verification costs one RSA operation again.
+A key id hint, sent by SAT in a header, selects the key directly.
+"""
+
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+from py_sat.signature.interface import Verifier
+
+DEFAULT_KEY_ID = "default"
+
+
+@dataclass
+class KeyringStats:
+    """
+    KeyringStats is a snapshot of the verifications done with a keyring
+
+    :param key_ids: key ids in the order they are tried, most recently successful first
+    :param verified_by: successful verifications per key id
+    :param attempts: verifications per number of RSA verifications they took, e.g. {1: 980, 2: 20}
+    :param failed: verifications no key accepted
+    :param unknown_hints: key id hints not in the keyring, the keys were tried in order instead
+    """
+
+    key_ids: List[str] = field(default_factory=list)
+    verified_by: Dict[str, int] = field(default_factory=dict)
+    attempts: Dict[int, int] = field(default_factory=dict)
+    failed: int = 0
+    unknown_hints: int = 0
+
+    @property
+    def verifications(self) -> int:
+        return sum(self.attempts.values())
+
+
+class Keyring:
+    """
+    Keyring verifies a signature with several public keys, thread-safe
+    """
+
+    _verifiers: Dict[str, Verifier]
+    _order: Tuple[str, ...]
+    _lock: threading.Lock
+    _verified_by: Counter
+    _attempts: Counter
+    _failed: int
+    _unknown_hints: int
+
+    def __init__(self, verifiers: Dict[str, Verifier]):
+        """
+        :param verifiers: verifier per key id, the first one is tried first until another one succeeds
+        """
+        self._verifiers = dict(verifiers)
+        self._order = tuple(verifiers)
+        self._lock = threading.Lock()
+        self._verified_by = Counter()
+        self._attempts = Counter()
+        self._failed = 0
+        self._unknown_hints = 0
+
+    def verify(
+        self,
+        msg: Union[str, bytes],
+        signature: str,
+        key_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Verify the signature with the hinted key first, then the others, most recently successful first
+               :param msg: message to verify
+               :param signature: base64 signature to verify
+               :param key_id: optional key id hint
+               :return: id of the key that verified the signature, None if no key did
+        """
+        # Read without the lock, the order is replaced as a whole
+        order = self._order
+        unknown_hint = key_id is not None and key_id not in self._verifiers
+        if key_id is not None and not unknown_hint and order[0] != key_id:
+            order = (key_id,) + tuple(k for k in order if k != key_id)
+
+        verified_by = None
+        attempts = 0
+        for candidate in order:
+            attempts += 1
+            if self._verifiers[candidate].verify(msg, signature):
+                verified_by = candidate
+                break
+
+        with self._lock:
+            self._attempts[attempts] += 1
+            self._unknown_hints += unknown_hint
+            if verified_by is None:
+                self._failed += 1
+                return None
+
+            self._verified_by[verified_by] += 1
+            if self._order[0] != verified_by:
+                self._order = (verified_by,) + tuple(
+                    k for k in self._order if k != verified_by
+                )
+        return verified_by
+
+    def verifiers(self) -> Dict[str, Verifier]:
+        return dict(self._verifiers)
+
+    def get_stats(self) -> KeyringStats:
+        with self._lock:
+            return KeyringStats(
+                key_ids=list(self._order),
+                verified_by=dict(self._verified_by),
+                attempts=dict(self._attempts),
+                failed=self._failed,
+                unknown_hints=self._unknown_hints,
+            )
@@ -0,0 +1,141 @@
+"""
+keys package contains the loading of RSA keys, shared by every Signature of the process.
+
+A key is given as a PEM string, PEM or DER bytes, or the path of a file holding one of them.
+Parsed keys are cached process-wide by the SHA-256 of their encoding, so the clients built
+for the same keys, e.g. one client per tenant, parse each key once.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Union
+
+from Crypto.PublicKey import RSA
+
+KeySource = Union[str, bytes, os.PathLike]
+
+KEY_CACHE_SIZE = 256
+
+_PEM_PREFIX = b"-----BEGIN "
+_OPENSSH_PREFIX = b"ssh-rsa "
+# Every DER encoded key is an ASN.1 SEQUENCE
+_DER_SEQUENCE_TAG = 0x30
+
+
+@dataclass
+class KeyCacheInfo:
+    """
+    KeyCacheInfo is a snapshot of the parsed key cache
+
+    :param hits: keys served from the cache
+    :param misses: keys parsed
+    :param size: keys in the cache
+    """
+
+    hits: int = 0
+    misses: int = 0
+    size: int = 0
+
+
+class KeyMaterial:
+    """
+    KeyMaterial is an encoded RSA key, its format is checked upfront and it is parsed by parse
+    """
+
+    data: bytes
+    digest: bytes
+
+    def __init__(self, source: KeySource):
+        """
+        :param source: PEM string, PEM or DER bytes, or path of a file holding one of them
+        :raise ValueError: if the source is neither a key nor a readable key file
+        """
+        self.data = _read(source)
+        if not _looks_like_key(self.data):
+            raise ValueError("Key is neither PEM nor DER encoded")
+        self.digest = hashlib.sha256(self.data).digest()
+
+    def parse(self) -> RSA.RsaKey:
+        """
+        Parse the key, or get it from the process-wide cache
+               :return: the parsed key
+               :raise ValueError: if the key cannot be parsed
+        """
+        return _cache.get(self)
+
+
+class _KeyCache:
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._keys: "OrderedDict[bytes, RSA.RsaKey]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, material: KeyMaterial) -> RSA.RsaKey:
+        with self._lock:
+            key = self._keys.get(material.digest)
+            if key is not None:
+                self._keys.move_to_end(material.digest)
+                self._hits += 1
+                return key
+
+        # Parsed outside the lock, two threads parsing the same new key both get a valid one
+        key = RSA.import_key(material.data)
+        with self._lock:
+            self._misses += 1
+            self._keys[material.digest] = key
+            if len(self._keys) > self._max_size:
+                self._keys.popitem(last=False)
+        return key
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> KeyCacheInfo:
+        with self._lock:
+            return KeyCacheInfo(
+                hits=self._hits, misses=self._misses, size=len(self._keys)
+            )
+
+
+_cache = _KeyCache(KEY_CACHE_SIZE)
+
+
+def get_key_cache_info() -> KeyCacheInfo:
+    return _cache.info()
+
+
+def clear_key_cache():
+    _cache.clear()
+
+
+def _read(source: KeySource) -> bytes:
+    if isinstance(source, bytes):
+        return source
+
+    if isinstance(source, str):
+        encoded = source.encode()
+        if _looks_like_key(encoded.lstrip()) or not os.path.isfile(source):
+            return encoded
+
+    try:
+        with open(source, "rb") as key_file:
+            return key_file.read()
+    except OSError as exc:
+        raise ValueError(f"Key file cannot be read: {exc}")
+
+
+def _looks_like_key(data: bytes) -> bool:
+    stripped = data.lstrip()
+    return (
+        stripped.startswith(_PEM_PREFIX)
+        or stripped.startswith(_OPENSSH_PREFIX)
+        or (len(data) > 0 and data[0] == _DER_SEQUENCE_TAG)
+    )
@@ -0,0 +1,130 @@
+"""
+openssl package contains the RSA-PSS signature backed by OpenSSL through the cryptography package.
+
+It produces and accepts the same signatures as the pycryptodome backend: SHA-256, MGF1 with SHA-256
+and the same salt length, only the RSA arithmetic runs in OpenSSL instead of pure Python big integers.
+"""
+
+import base64
+from typing import Union
+
+from Crypto.PublicKey import RSA
+
+from py_sat.signature.interface import SignatureAlgorithm, Signer, Verifier
+from py_sat.signature.pss import pss_salt_length
+
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import padding
+
+    OPENSSL_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    OPENSSL_AVAILABLE = False
+
+
+def _pss_padding(key: RSA.RsaKey) -> "padding.PSS":
+    return padding.PSS(
+        mgf=padding.MGF1(hashes.SHA256()), salt_length=pss_salt_length(key)
+    )
+
+
+class OpenSSLPSSSigner(Signer):
+    """
+    OpenSSLPSSSigner signs with one private key, the key is loaded into OpenSSL once
+    """
+
+    def __init__(self, private_key: RSA.RsaKey):
+        self._key = serialization.load_der_private_key(
+            private_key.export_key(format="DER"), password=None
+        )
+        self._padding = _pss_padding(private_key)
+
+    def sign(self, msg: Union[str, bytes]) -> str:
+        """Signs a message using PSS padding and RSA algorithm.
+
+        Args:
+            msg: The message (either a string or bytes) to sign.
+
+        Returns:
+            The base64-encoded signature as a string.
+        """
+        if isinstance(msg, str):
+            msg = msg.encode("utf-8")
+
+        signature = self._key.sign(msg, self._padding, hashes.SHA256())
+        return str(base64.b64encode(signature), "utf-8")
+
+
+class OpenSSLPSSVerifier(Verifier):
+    """
+    OpenSSLPSSVerifier verifies with one public key, the key is loaded into OpenSSL once
+    """
+
+    def __init__(self, public_key: RSA.RsaKey):
+        self._key = serialization.load_der_public_key(
+            public_key.export_key(format="DER")
+        )
+        self._padding = _pss_padding(public_key)
+
+    def verify(self, msg: Union[str, bytes], signature_base64: str) -> bool:
+        """Verifies a PSS signature using SHA-256.
+
+        Args:
+            msg: The message (either a string or bytes) to verify.
+            signature_base64: The base64-encoded signature to verify.
+
+        Returns:
+            True if the signature is valid, False otherwise.
+        """
+        if not signature_base64.strip():
+            raise ValueError("Signature is empty")
+
+        if isinstance(msg, str):
+            msg = msg.encode("utf-8")
+
+        try:
+            signature_bytes = base64.b64decode(signature_base64)
+        except ValueError:
+            raise ValueError("Invalid base64 signature")
+
+        try:
+            self._key.verify(signature_bytes, msg, self._padding, hashes.SHA256())
+            return True
+        except (InvalidSignature, ValueError, TypeError):
+            return False
+
+
+class OpenSSLPSSPaddingAlgorithm(SignatureAlgorithm):
+    def verify(
+        self, public_key: RSA.RsaKey, msg: Union[str, bytes], signature_base64: str
+    ) -> bool:
+        """Verifies a PSS signature using SHA-256.
+
+        Args:
+            public_key: The RSA public key used for verification.
+            msg: The message (either a string or bytes) to verify.
+            signature_base64: The base64-encoded signature to verify.
+
+        Returns:
+            True if the signature is valid, False otherwise.
+        """
+        return OpenSSLPSSVerifier(public_key).verify(msg, signature_base64)
+
+    def sign(self, private_key: RSA.RsaKey, msg: Union[str, bytes]) -> str:
+        """Signs a message using PSS padding and RSA algorithm.
+
+        Args:
+            private_key: The RSA private key used for signing.
+            msg: The message (either a string or bytes) to sign.
+
+        Returns:
+            The base64-encoded signature as a string.
+        """
+        return OpenSSLPSSSigner(private_key).sign(msg)
+
+    def signer(self, private_key: RSA.RsaKey) -> Signer:
+        return OpenSSLPSSSigner(private_key)
+
+    def verifier(self, public_key: RSA.RsaKey) -> Verifier:
+        return OpenSSLPSSVerifier(public_key)
@@ -0,0 +1,176 @@
+"""
+pool package contains the process pool behind Signature.sign_many and Signature.verify_many.
+
+RSA operations are CPU bound and a single process signs on one core. The pool fans a batch out to
+worker processes, each one loads the keys once when it starts and then signs or verifies whole chunks.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import (Any, Callable, Dict, Generic, List, Optional, Sequence,
+                    TypeVar)
+
+T = TypeVar("T")
+
+DEFAULT_CHUNK_SIZE = 16
+
+
+@dataclass
+class SignaturePoolConfig:
+    """
+    SignaturePoolConfig configures the process pool of the bulk signature operations
+
+    :param workers: worker processes, None uses one per CPU
+    :param chunk_size: messages sent to a worker at once, larger chunks lower the inter-process overhead
+    :param start_method: multiprocessing start method, spawn is safe in processes running threads
+    """
+
+    workers: Optional[int] = None
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    start_method: str = "spawn"
+
+
+@dataclass
+class BulkResult(Generic[T]):
+    """
+    BulkResult is the outcome of one item of a bulk operation
+
+    :param value: the signature for sign_many, whether the signature is valid for verify_many,
+        None when the item failed
+    :param error: the exception the item failed with, e.g. InvalidInputException or SignatureErrorException
+    """
+
+    value: Optional[T] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class WorkerKeys:
+    """
+    WorkerKeys is what a worker process needs to build its own Signature, only picklable values
+
+    :param private_key: encoded client private key
+    :param public_keys: encoded SAT public keys by key id, in keyring order
+    :param padding_type: value of the SignatureType
+    :param backend: value of the SignatureBackend
+    """
+
+    private_key: Optional[bytes]
+    public_keys: Dict[str, bytes]
+    padding_type: str
+    backend: str
+
+
+class SignaturePool:
+    """
+    SignaturePool runs bulk signature operations in worker processes, the workers start on first use
+    """
+
+    _config: SignaturePoolConfig
+    _keys: WorkerKeys
+    _lock: threading.Lock
+    _executor: Optional[ProcessPoolExecutor]
+
+    def __init__(self, config: SignaturePoolConfig, keys: WorkerKeys):
+        self._config = config
+        self._keys = keys
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def map(
+        self, operation: Callable[[Sequence[Any]], List[BulkResult]], items: List[Any]
+    ) -> List[BulkResult]:
+        """
+        Run the operation on chunks of the items in the workers. When a worker dies the pool is
+        replaced and the chunks without a result are run once more, if the new pool breaks too
+        they fail with BrokenProcessPool
+               :param operation: module level function processing one chunk in a worker
+               :param items: items to process
+               :return: one result per item, in the order of the items
+        """
+        size = self._config.chunk_size
+        chunks = [items[i : i + size] for i in range(0, len(items), size)]
+        results = []
+        done = 0
+        for _ in range(2):
+            executor = self._get_executor()
+            try:
+                for chunk_results in executor.map(operation, chunks[done:]):
+                    results.extend(chunk_results)
+                    done += 1
+                return results
+            except BrokenProcessPool as exc:
+                self._discard(executor)
+                error = exc
+
+        for chunk in chunks[done:]:
+            results.extend(BulkResult(error=error) for _ in chunk)
+        return results
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._config.workers,
+                    mp_context=multiprocessing.get_context(self._config.start_method),
+                    initializer=init_worker,
+                    initargs=(self._keys,),
+                )
+            return self._executor
+
+
+# Signature of the worker process, built once by init_worker
+_worker_signature = None
+
+
+def init_worker(keys: WorkerKeys):
+    # Imported here, the signature package imports this module
+    from py_sat.signature import Signature, SignatureBackend, SignatureType
+
+    global _worker_signature
+    _worker_signature = Signature(
+        keys.private_key,
+        None,
+        SignatureType(keys.padding_type),
+        SignatureBackend(keys.backend),
+        sat_public_keys=keys.public_keys,
+    )
+
+
+def sign_chunk(messages: Sequence[Any]) -> List[BulkResult]:
+    return [run_item(_worker_signature.sign, message) for message in messages]
+
+
+def verify_chunk(pairs: Sequence[Any]) -> List[BulkResult]:
+    return [run_item(verify_pair, _worker_signature, pair) for pair in pairs]
+
+
+def verify_pair(signature, pair) -> bool:
+    msg, sig = pair
+    return signature.verify(msg, sig)
+
+
+def run_item(operation: Callable[..., T], *args) -> BulkResult:
+    try:
+        return BulkResult(value=operation(*args))
+    except Exception as exc:
+        return BulkResult(error=exc)
@@ -5,24 +5,58 @@ from Crypto.Hash import SHA256
 from Crypto.PublicKey import RSA
 from Crypto.Signature import pss
 
-from py_sat.signature.interface import SignatureAlgorithm
+from py_sat.signature.interface import SignatureAlgorithm, Signer, Verifier
 
 
-class PSSPaddingAlgorithm(SignatureAlgorithm):
-    def verify(
-        self, public_key: RSA, msg: Union[str, bytes], signature_base64: str
-    ) -> bool:
-        """Verifies a PKCS1v15 signature using SHA-256.
+def pss_salt_length(key: RSA.RsaKey) -> int:
+    """
+    Salt length of the SAT PSS signatures, the largest one the key size allows
+    """
+    return int(key.n.bit_length() / 8) - SHA256.digest_size - 2
+
+
+class PSSSigner(Signer):
+    """
+    PSSSigner signs with one private key, the salt length and the PSS scheme are computed once
+    """
+
+    def __init__(self, private_key: RSA.RsaKey):
+        self._scheme = pss.new(private_key, salt_bytes=pss_salt_length(private_key))
+
+    def sign(self, msg: Union[str, bytes]) -> str:
+        """Signs a message using PSS padding and RSA algorithm.
+
+        Args:
+            msg: The message (either a string or bytes) to sign.
+
+        Returns:
+            The base64-encoded signature as a string.
+        """
+        if isinstance(msg, str):
+            msg = msg.encode("utf-8")
+
+        signature = self._scheme.sign(SHA256.new(msg))
+        return str(base64.b64encode(signature), "utf-8")
+
+
+class PSSVerifier(Verifier):
+    """
+    PSSVerifier verifies with one public key, the salt length and the PSS scheme are computed once
+    """
+
+    def __init__(self, public_key: RSA.RsaKey):
+        self._scheme = pss.new(public_key, salt_bytes=pss_salt_length(public_key))
+
+    def verify(self, msg: Union[str, bytes], signature_base64: str) -> bool:
+        """Verifies a PSS signature using SHA-256.
 
         Args:
-            public_key: The RSA public key used for verification.
             msg: The message (either a string or bytes) to verify.
             signature_base64: The base64-encoded signature to verify.
 
         Returns:
             True if the signature is valid, False otherwise.
         """
-
         if not signature_base64.strip():
             raise ValueError("Signature is empty")
 
@@ -34,16 +68,29 @@ class PSSPaddingAlgorithm(SignatureAlgorithm):
         except ValueError:
             raise ValueError("Invalid base64 signature")
 
-        hash_message = SHA256.new(msg)
-        salt = int(public_key.n.bit_length() / 8) - hash_message.digest_size - 2
-        verifier = pss.new(public_key, salt_bytes=salt)
-
         try:
-            verifier.verify(hash_message, signature_bytes)
+            self._scheme.verify(SHA256.new(msg), signature_bytes)
             return True
         except (ValueError, TypeError):
             return False
 
+
+class PSSPaddingAlgorithm(SignatureAlgorithm):
+    def verify(
+        self, public_key: RSA, msg: Union[str, bytes], signature_base64: str
+    ) -> bool:
+        """Verifies a PSS signature using SHA-256.
+
+        Args:
+            public_key: The RSA public key used for verification.
+            msg: The message (either a string or bytes) to verify.
+            signature_base64: The base64-encoded signature to verify.
+
+        Returns:
+            True if the signature is valid, False otherwise.
+        """
+        return PSSVerifier(public_key).verify(msg, signature_base64)
+
     def sign(self, private_key: RSA, msg: Union[str, bytes]) -> str:
         """Signs a message using PSS padding and RSA algorithm.
 
@@ -54,13 +101,10 @@ class PSSPaddingAlgorithm(SignatureAlgorithm):
         Returns:
             The base64-encoded signature as a string.
         """
-        if isinstance(msg, str):
-            msg = msg.encode("utf-8")
+        return PSSSigner(private_key).sign(msg)
 
-        hash = SHA256.new(msg)
-        salt = int(private_key.n.bit_length() / 8) - hash.digest_size - 2
-        signature = pss.new(private_key, salt_bytes=salt).sign(hash)
+    def signer(self, private_key: RSA.RsaKey) -> Signer:
+        return PSSSigner(private_key)
 
-        base64_signature = base64.b64encode(signature)
-        encoded_signature = str(base64_signature, "utf-8")
-        return encoded_signature
+    def verifier(self, public_key: RSA.RsaKey) -> Verifier:
+        return PSSVerifier(public_key)
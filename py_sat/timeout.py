@@ -0,0 +1,96 @@
+"""
+timeout package contains the connect/read timeout settings per endpoint and the deadline
+used to bound the total time spent by a single SATClient call.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from py_sat.constant import Endpoint
+from py_sat.exceptions import DeadlineExceededException
+
+
+@dataclass(frozen=True)
+class Timeout:
+    """
+    Timeout holds the socket timeouts in seconds
+
+    :param connect: time allowed to establish the connection
+    :param read: time allowed between two bytes received from the server
+    """
+
+    connect: float
+    read: float
+
+    def as_tuple(self) -> Tuple[float, float]:
+        return self.connect, self.read
+
+
+@dataclass
+class TimeoutConfig:
+    """
+    TimeoutConfig resolves the Timeout of each endpoint, falling back to the default one
+    """
+
+    default: Timeout
+    endpoints: Dict[Endpoint, Timeout] = field(default_factory=dict)
+
+    def for_endpoint(self, endpoint: Optional[Endpoint]) -> Timeout:
+        if endpoint is None:
+            return self.default
+        return self.endpoints.get(endpoint, self.default)
+
+
+class Deadline:
+    """
+    Deadline is an absolute point in time a call must complete by,
+    including token refresh and retries
+    """
+
+    _expires_at: float
+    _budget: float
+
+    def __init__(self, seconds: float):
+        self._budget = seconds
+        self._expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def after(cls, seconds: Optional[float]) -> Optional["Deadline"]:
+        """
+        Create a deadline from a budget in seconds, None means no deadline
+               :param seconds: time budget of the call
+               :return: Deadline or None
+        """
+        if seconds is None:
+            return None
+        return cls(seconds)
+
+    def remaining(self) -> float:
+        return max(self._expires_at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self._expires_at
+
+    def check(self, operation: str):
+        """
+        Check the deadline before starting an operation
+               :param operation: name of the operation, used in the error message
+               :raise DeadlineExceededException: if the deadline already passed
+        """
+        if self.expired():
+            raise DeadlineExceededException(
+                f"{operation} did not complete within {self._budget}s"
+            )
+
+    def bound(self, timeout: Timeout) -> Timeout:
+        """
+        Shrink the timeout so a single socket wait never outlives the deadline
+               :param timeout: configured timeout
+               :return: Timeout capped by the remaining time
+        """
+        remaining = self.remaining()
+        return Timeout(
+            connect=min(timeout.connect, remaining),
+            read=min(timeout.read, remaining),
+        )
@@ -0,0 +1,258 @@
+"""
+token package contains the OAuth access token bookkeeping shared by HTTPClient and AsyncHTTPClient.
+
+Tokens track their expiry, are refreshed in the background once a configurable fraction of
+their lifetime elapsed, and concurrent callers hitting an expired token share a single refresh.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional
+
+from py_sat.exceptions import DeadlineExceededException
+from py_sat.timeout import Deadline
+
+if TYPE_CHECKING:
+    from py_sat.token_store import TokenStore
+
+DEFAULT_REFRESH_RATIO = 0.8
+
+
+@dataclass(frozen=True)
+class AccessToken:
+    """
+    AccessToken is an OAuth access token with its lifetime, timestamps are epoch seconds
+
+    :param access_token: the bearer token
+    :param expires_at: when the token expires, None if the server did not send expires_in
+    :param refresh_at: when the token should be refreshed proactively
+    """
+
+    access_token: str
+    expires_at: Optional[float] = None
+    refresh_at: Optional[float] = None
+
+    @classmethod
+    def from_response(
+        cls,
+        token: Dict[str, Any],
+        refresh_ratio: float = DEFAULT_REFRESH_RATIO,
+        now: Optional[float] = None,
+    ) -> "AccessToken":
+        """
+        Build the token from the OAuth token response
+               :param token: token response, must contain access_token and may contain expires_in
+               :param refresh_ratio: fraction of the lifetime after which the token is refreshed
+               :param now: time the token was issued, default to now
+               :return: AccessToken
+        """
+        now = time.time() if now is None else now
+        expires_in = token.get("expires_in")
+        if expires_in is None:
+            return cls(access_token=token["access_token"])
+
+        expires_in = float(expires_in)
+        return cls(
+            access_token=token["access_token"],
+            expires_at=now + expires_in,
+            refresh_at=now + expires_in * refresh_ratio,
+        )
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        if self.expires_at is None:
+            return False
+        return (time.time() if now is None else now) >= self.expires_at
+
+    def needs_refresh(self, now: Optional[float] = None) -> bool:
+        if self.refresh_at is None:
+            return False
+        return (time.time() if now is None else now) >= self.refresh_at
+
+
+class TokenManager:
+    """
+    TokenManager holds the access token of HTTPClient, thread-safe. The token lives in a TokenStore,
+    a local copy is kept so the store is only read again when the token is close to expiry
+    """
+
+    _fetch: Callable[[Optional[Deadline]], AccessToken]
+    _store: "TokenStore"
+    _logger: logging.Logger
+    _token: Optional[AccessToken]
+    _background_lock: threading.Lock
+    _refreshing: bool
+
+    def __init__(
+        self,
+        fetch: Callable[[Optional[Deadline]], AccessToken],
+        store: "TokenStore",
+        logger: logging.Logger,
+    ):
+        """
+        :param fetch: function fetching a new token from the OAuth server
+        :param store: where the token is kept, shared with other clients using the same store
+        :param logger: logger used to report background refresh failures
+        """
+        self._fetch = fetch
+        self._store = store
+        self._logger = logger
+        self._token = None
+        self._background_lock = threading.Lock()
+        self._refreshing = False
+
+    def get(self, deadline: Optional[Deadline] = None) -> str:
+        """
+        Return a valid access token, fetching it when missing or expired
+               :param deadline: deadline of the call that needs the token
+               :return: the access token
+        """
+        token = self._token
+        if token is None or token.needs_refresh() or token.is_expired():
+            # Another client sharing the store may have refreshed it already
+            shared = self._store.load()
+            if shared is not None:
+                self._token = token = shared
+
+        if token is None or token.is_expired():
+            return self._refresh(token, deadline).access_token
+
+        if token.needs_refresh():
+            self._refresh_in_background(token)
+        return token.access_token
+
+    def set(self, token: AccessToken):
+        self._store.save(token)
+        self._token = token
+
+    def invalidate(self, access_token: str):
+        """
+        Drop the token rejected by the server, a no-op when it was already replaced,
+        so concurrent rejections result in a single refresh
+               :param access_token: the rejected access token
+        """
+        self._store.acquire()
+        try:
+            shared = self._store.load()
+            if shared is not None and shared.access_token == access_token:
+                self._store.delete()
+            if self._token is not None and self._token.access_token == access_token:
+                self._token = None
+        finally:
+            self._store.release()
+
+    def _refresh(
+        self, stale: Optional[AccessToken], deadline: Optional[Deadline]
+    ) -> AccessToken:
+        timeout = deadline.remaining() if deadline is not None else None
+        if not self._store.acquire(timeout):
+            raise DeadlineExceededException("token refresh did not complete in time")
+        try:
+            current = self._store.load()
+            if current is not None and current != stale and not current.is_expired():
+                # Another caller refreshed while we were waiting for the lock
+                self._token = current
+                return current
+
+            token = self._fetch(deadline)
+            self._store.save(token)
+            self._token = token
+            return token
+        finally:
+            self._store.release()
+
+    def _refresh_in_background(self, stale: AccessToken):
+        with self._background_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        thread = threading.Thread(
+            target=self._background_refresh,
+            args=(stale,),
+            name="py-sat-token-refresh",
+            daemon=True,
+        )
+        thread.start()
+
+    def _background_refresh(self, stale: AccessToken):
+        try:
+            self._refresh(stale, None)
+        except Exception as exc:
+            # The current token is still valid, the next caller will try again
+            self._logger.warning("Error when refreshing access token: %s", exc)
+        finally:
+            with self._background_lock:
+                self._refreshing = False
+
+
+class AsyncTokenManager:
+    """
+    AsyncTokenManager is the asyncio counterpart of TokenManager, bound to one event loop
+    """
+
+    _fetch: Callable[[Optional[Deadline]], Awaitable[AccessToken]]
+    _logger: logging.Logger
+    _token: Optional[AccessToken]
+    _refresh_lock: Optional[asyncio.Lock]
+    _background_task: Optional["asyncio.Task"]
+
+    def __init__(
+        self,
+        fetch: Callable[[Optional[Deadline]], Awaitable[AccessToken]],
+        logger: logging.Logger,
+    ):
+        self._fetch = fetch
+        self._logger = logger
+        self._token = None
+        # The lock is bound to the running loop, it is created on first use
+        self._refresh_lock = None
+        self._background_task = None
+
+    async def get(self, deadline: Optional[Deadline] = None) -> str:
+        token = self._token
+        if token is None or token.is_expired():
+            return (await self._refresh(token, deadline)).access_token
+
+        if token.needs_refresh() and (
+            self._background_task is None or self._background_task.done()
+        ):
+            self._background_task = asyncio.ensure_future(
+                self._background_refresh(token)
+            )
+        return token.access_token
+
+    def set(self, token: AccessToken):
+        self._token = token
+
+    def invalidate(self, access_token: str):
+        if self._token is not None and self._token.access_token == access_token:
+            self._token = None
+
+    async def _refresh(
+        self, stale: Optional[AccessToken], deadline: Optional[Deadline]
+    ) -> AccessToken:
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+
+        async with self._refresh_lock:
+            current = self._token
+            if (
+                current is not None
+                and current is not stale
+                and not current.is_expired()
+            ):
+                return current
+
+            token = await self._fetch(deadline)
+            self._token = token
+            return token
+
+    async def _background_refresh(self, stale: AccessToken):
+        try:
+            if self._token is stale:
+                await self._refresh(stale, None)
+        except Exception as exc:
+            self._logger.warning("Error when refreshing access token: %s", exc)
@@ -0,0 +1,174 @@
+"""
+token_store package contains where HTTPClient keeps its OAuth access token.
+
+The default InMemoryTokenStore keeps the token in the process, FileTokenStore shares
+one token and one refresh between every process of a host through a locked file.
+"""
+
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+from typing import Optional
+
+from py_sat.token import AccessToken
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+LOCK_POLL_INTERVAL = 0.01
+
+
+class TokenStore(ABC):
+    """
+    TokenStore holds the access token shared by the HTTPClient instances using it,
+    the lock serializes refreshes so only one of them fetches a new token
+    """
+
+    @abstractmethod
+    def load(self) -> Optional[AccessToken]:
+        """Returns the stored token, None if there is none"""
+        pass
+
+    @abstractmethod
+    def save(self, token: AccessToken):
+        """Stores the token, replacing the previous one"""
+        pass
+
+    @abstractmethod
+    def delete(self):
+        """Removes the stored token"""
+        pass
+
+    @abstractmethod
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Acquires the refresh lock, returns False if it was not acquired within timeout seconds"""
+        pass
+
+    @abstractmethod
+    def release(self):
+        """Releases the refresh lock"""
+        pass
+
+
+class InMemoryTokenStore(TokenStore):
+    """
+    InMemoryTokenStore keeps the token in the process, it is the default store
+    """
+
+    _token: Optional[AccessToken]
+    _lock: threading.Lock
+
+    def __init__(self):
+        self._token = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Optional[AccessToken]:
+        return self._token
+
+    def save(self, token: AccessToken):
+        self._token = token
+
+    def delete(self):
+        self._token = None
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        return self._lock.acquire(timeout=-1 if timeout is None else max(timeout, 0))
+
+    def release(self):
+        self._lock.release()
+
+
+class FileTokenStore(TokenStore):
+    """
+    FileTokenStore shares the token between the processes of a host through a JSON file,
+    the refresh lock is an flock on a sibling .lock file. Use one path per client id.
+    """
+
+    _path: str
+    _lock_path: str
+    _thread_lock: threading.Lock
+    _lock_fd: Optional[int]
+
+    def __init__(self, path: str):
+        """
+        :param path: file holding the token, created with owner-only permissions
+        """
+        if fcntl is None:
+            raise OSError(
+                "FileTokenStore requires fcntl, not available on this platform"
+            )
+
+        self._path = path
+        self._lock_path = f"{path}.lock"
+        # flock does not exclude threads sharing one descriptor, threads are serialized first
+        self._thread_lock = threading.Lock()
+        self._lock_fd = None
+
+    def load(self) -> Optional[AccessToken]:
+        try:
+            with open(self._path, "r", encoding="utf-8") as file:
+                return AccessToken(**json.load(file))
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError):
+            # A corrupted file is treated as a missing token and overwritten on refresh
+            return None
+
+    def save(self, token: AccessToken):
+        # Written to a temporary file then renamed, readers never see a partial token
+        tmp_path = f"{self._path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(asdict(token), file)
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def delete(self):
+        try:
+            os.unlink(self._path)
+        except FileNotFoundError:
+            pass
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._thread_lock.acquire(
+            timeout=-1 if timeout is None else max(timeout, 0)
+        ):
+            return False
+
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        os.close(fd)
+                        self._thread_lock.release()
+                        return False
+                    time.sleep(LOCK_POLL_INTERVAL)
+        except BaseException:
+            os.close(fd)
+            self._thread_lock.release()
+            raise
+
+        self._lock_fd = fd
+        return True
+
+    def release(self):
+        fd, self._lock_fd = self._lock_fd, None
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+            self._thread_lock.release()
@@ -1,4 +1,9 @@
-from typing import Any, Dict, List
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, List
+
+_JSON_WHITESPACE = " \t\n\r"
+_JSON_NUMBER_CONTINUATION = ".eE+-0123456789"
 
 
 def parse_json_api_response(response: dict) -> Dict[str, Any]:
@@ -24,6 +29,129 @@ def parse_json_api_list_response(response: dict) -> List[Dict[str, Any]]:
     return [__parse_json_api_dict(item) for item in data]
 
 
+def iter_json_api_list_response(chunks: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally parse JSON API list response, each element of data is yielded
+    as soon as it is received, without holding the whole response in memory
+
+    :param chunks: UTF-8 encoded response body, in chunks of any size
+    :return: iterator of aggregate dictionary of id, type, and attributes
+    :raise ValueError: if the response is not a valid JSON object
+    """
+    for item in iter_json_array(chunks, "data"):
+        yield __parse_json_api_dict(item)
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """
+    Incrementally parse a JSON object and yield the elements of one of its array members,
+    the other members are parsed and discarded
+
+    :param chunks: UTF-8 encoded JSON object, in chunks of any size
+    :param key: name of the array member
+    :return: iterator of the decoded array elements
+    :raise ValueError: if the input is not a valid JSON object
+    """
+    stream = _JSONStream(chunks)
+    stream.expect("{")
+    if stream.consume("}"):
+        stream.expect_end()
+        return
+
+    while True:
+        name = stream.value()
+        stream.expect(":")
+        if name == key and stream.consume("["):
+            if not stream.consume("]"):
+                while True:
+                    yield stream.value()
+                    if not stream.consume(","):
+                        stream.expect("]")
+                        break
+        else:
+            stream.value()
+
+        if not stream.consume(","):
+            stream.expect("}")
+            stream.expect_end()
+            return
+
+
+class _JSONStream:
+    """Cursor over a chunked JSON text, the consumed part of the buffer is dropped on every refill"""
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+
+        self._buffer = self._buffer[self._pos :]
+        self._pos = 0
+        for chunk in self._chunks:
+            text = self._text_decoder.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+
+        self._eof = True
+        text = self._text_decoder.decode(b"", final=True)
+        self._buffer += text
+        return bool(text)
+
+    def peek(self) -> str:
+        while True:
+            buffer, pos = self._buffer, self._pos
+            while pos < len(buffer) and buffer[pos] in _JSON_WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                return ""
+
+    def consume(self, char: str) -> bool:
+        if self.peek() != char:
+            return False
+        self._pos += 1
+        return True
+
+    def expect(self, char: str):
+        if not self.consume(char):
+            found = self.peek() or "end of input"
+            raise ValueError(f"Invalid JSON: expected {char!r}, found {found!r}")
+
+    def expect_end(self):
+        if self.peek():
+            raise ValueError("Invalid JSON: extra data after the top level object")
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number ending the buffer, or followed by what could still continue it,
+            # e.g. "1." before the fraction arrives, may continue in the next chunk
+            if (
+                end == len(self._buffer)
+                or self._buffer[end] in _JSON_NUMBER_CONTINUATION
+            ) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
 def __parse_json_api_dict(data):
     id = data.get("id", "")
     type = data.get("type", "")
@@ -54,6 +182,17 @@ def generate_json_api_request(request: dict) -> Dict[str, Any]:
     return {"data": data}
 
 
+def encode_json_request(request: dict) -> bytes:
+    """
+    Serialize a request body once, with compact separators and sorted keys,
+    so the bytes that are signed are the bytes that are sent
+
+    :param request: JSON API request
+    :return: UTF-8 encoded JSON
+    """
+    return json.dumps(request, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
 def extract_type(request):
     type = None
     if "type" in request:
@@ -0,0 +1,72 @@
+"""
+warmup package contains the warm up report of SATClient and the decoder warm up.
+
+Everything the first checkout would otherwise pay lazily on the hot path is done upfront:
+the token fetch, the TCP and TLS handshakes, the first RSA operations and the first model decodes.
+"""
+
+from dataclasses import dataclass
+
+from py_sat.models import InquiryResponse, OrderDetail, PartnerProduct
+
+DEFAULT_WARMUP_CONNECTIONS = 2
+
+WARMUP_MESSAGE = '{"data":{"type":"warmup"}}'
+
+_WARMUP_FIELDS = [{"name": "warmup", "value": "warmup"}]
+
+_WARMUP_PAYLOADS = (
+    (
+        OrderDetail,
+        {
+            "id": "warmup",
+            "fields": _WARMUP_FIELDS,
+            "fulfillment_result": _WARMUP_FIELDS,
+            "fulfilled_at": "2024-01-01T00:00:00Z",
+            "status": "Success",
+            "sales_price": 1,
+        },
+    ),
+    (
+        InquiryResponse,
+        {
+            "id": "warmup",
+            "fields": _WARMUP_FIELDS,
+            "inquiry_result": _WARMUP_FIELDS,
+            "sales_price": 1.0,
+        },
+    ),
+    (PartnerProduct, {"id": "warmup", "status": 1, "is_inquiry": True}),
+)
+
+
+@dataclass
+class WarmupReport:
+    """
+    WarmupReport holds the seconds spent in each warm up phase
+
+    :param token: access token fetch, near zero when a valid token was already cached
+    :param connections: TCP and TLS handshakes of the pre-opened connections
+    :param signature: first sign and verify with the configured keys
+    :param decoders: first decode of the response models
+    :param opened_connections: connections opened, connections already in the pool are not counted
+    """
+
+    token: float = 0.0
+    connections: float = 0.0
+    signature: float = 0.0
+    decoders: float = 0.0
+    opened_connections: int = 0
+
+    @property
+    def total(self) -> float:
+        return self.token + self.connections + self.signature + self.decoders
+
+
+def warm_up_decoders():
+    """
+    Decode a representative payload of every response model used on the checkout path,
+    so the first real response does not pay the dataclasses_json and typing lazy initialisation
+    """
+    for model, payload in _WARMUP_PAYLOADS:
+        model.from_dict(payload)
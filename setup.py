@@ -25,6 +25,14 @@ setup(
             "pytest-sugar",
             "pytest-dotenv>=0.5.2",
             "pytest-httpserver>=1.0.5",
+            "aiohttp>=3.8.0",
+            "cryptography>=3.1",
+        ],
+        "async": [
+            "aiohttp>=3.8.0",
+        ],
+        "openssl": [
+            "cryptography>=3.1",
         ],
     },
     test_suite="tests",
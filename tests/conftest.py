@@ -138,6 +138,53 @@ def local_config(make_httpserver: HTTPServer):
     return config
 
 
+@pytest.fixture
+def fresh_local_config(local_config: SATClientConfig):
+    """
+    Fresh copy of the local config, so a test can tune it without leaking into the session client
+    """
+    return (
+        SATClientConfig(
+            client_id=local_config.client_id,
+            client_secret=local_config.client_secret,
+            private_key=local_config.private_key,
+            sat_public_key=local_config.sat_public_key,
+        )
+        .with_timeout(local_config.timeout)
+        .with_sat_base_url(local_config.sat_base_url)
+        .with_access_token_base_url(local_config.access_token_base_url)
+        .with_is_debug(True)
+    )
+
+
+@pytest.fixture
+def threaded_server():
+    """
+    Dedicated threaded server, for tests that need concurrent requests in flight
+    """
+    server = HTTPServer(threaded=True)
+    server.start()
+    server.expect_request("/token", method="POST").respond_with_json(
+        response_json={
+            "access_token": "testingToken",
+            "token_type": "bearer",
+            "expires_in": 3600,
+        }
+    )
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def threaded_config(threaded_server: HTTPServer, fresh_local_config: SATClientConfig):
+    """
+    Fresh copy of the local config pointing to the threaded server
+    """
+    return fresh_local_config.with_sat_base_url(
+        threaded_server.url_for("")[:-1]
+    ).with_access_token_base_url(threaded_server.url_for("/token"))
+
+
 @pytest.fixture(scope="session")
 def sandbox_config():
     client_id = os.getenv("PY_SAT_TEST_CLIENT_ID")
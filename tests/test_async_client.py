@@ -0,0 +1,337 @@
+"""
+Test the AsyncSATClient.
+
+This example shows how to use the asyncio client from an asyncio application,
+every method of SATClient is available as a coroutine.
+"""
+
+import asyncio
+import json
+
+import pytest
+from conftest import TestUtil
+from pytest_httpserver import HTTPServer
+from pytest_httpserver.httpserver import HandlerType
+
+from py_sat import SATClientConfig
+from py_sat.constant import (ACCOUNT_PATH, CHECK_STATUS_PATH, CHECKOUT_PATH,
+                             PRODUCT_LIST_PATH, SDK_LABEL)
+from py_sat.exceptions import (CallbackInFlightException,
+                               InvalidInputException, UnauthenticatedException)
+from py_sat.models import ErrorResponse, OrderDetail, OrderRequest
+from py_sat.signature import Signature
+from py_sat.token_store import InMemoryTokenStore
+
+pytest.importorskip("aiohttp")
+
+from py_sat.async_client import AsyncSATClient  # noqa: E402
+
+
+def test_async_account(make_httpserver: HTTPServer, local_config: SATClientConfig):
+    """
+    Example of account endpoint using the async client
+
+    :param make_httpserver:
+    :param local_config:
+    """
+    make_httpserver.expect_request(
+        ACCOUNT_PATH,
+        method="GET",
+        headers={"authorization": "Bearer testingToken"},
+        handler_type=HandlerType.ONESHOT,
+    ).respond_with_json(
+        {"data": {"type": "account", "id": "2203", "attributes": {"saldo": 1000}}}
+    )
+
+    async def run():
+        async with AsyncSATClient(local_config) as sat_client:
+            return await sat_client.account()
+
+    response = asyncio.run(run())
+
+    assert response.is_success()
+    assert response.id == 2203
+    assert response.saldo == 1000
+
+
+def test_async_checkout_and_check_status(
+    make_httpserver: HTTPServer,
+    local_config: SATClientConfig,
+    sat_signer: Signature,
+    util: TestUtil,
+):
+    """
+    Example of checkout then check status using the async client
+
+    :param make_httpserver:
+    :param local_config:
+    :param sat_signer:
+    :param util:
+    """
+    request_id = "PYSAT" + util.generate_random_string(8)
+    make_httpserver.expect_request(
+        CHECKOUT_PATH,
+        method="POST",
+        headers={
+            "authorization": "Bearer testingToken",
+            "X-Sat-Sdk-Version": SDK_LABEL,
+        },
+        json={
+            "data": {
+                "type": "order",
+                "id": request_id,
+                "attributes": {
+                    "product_code": "pln-postpaid",
+                    "client_number": "2121212",
+                    "amount": 12500,
+                },
+            }
+        },
+        handler_type=HandlerType.ONESHOT,
+    ).respond_with_json(
+        {
+            "data": {
+                "type": "order",
+                "id": request_id,
+                "attributes": {"product_code": "pln-postpaid", "status": "Pending"},
+            }
+        }
+    )
+    body = json.dumps(
+        {
+            "data": {
+                "type": "order",
+                "id": request_id,
+                "attributes": {"product_code": "pln-postpaid", "status": "Success"},
+            }
+        }
+    )
+    make_httpserver.expect_request(
+        CHECK_STATUS_PATH.format(request_id=request_id),
+        method="GET",
+        handler_type=HandlerType.ONESHOT,
+    ).respond_with_data(
+        body,
+        headers={
+            "Content-Type": "application/json",
+            "signature": sat_signer.sign(body),
+        },
+    )
+
+    async def run():
+        async with AsyncSATClient(local_config) as sat_client:
+            order = await sat_client.checkout(
+                OrderRequest(
+                    id=request_id,
+                    product_code="pln-postpaid",
+                    client_number="2121212",
+                    amount=12500,
+                )
+            )
+            status = await sat_client.check_status(request_id)
+            return order, status
+
+    order, status = asyncio.run(run())
+
+    assert order.is_success()
+    assert order.status == "Pending"
+    assert isinstance(status, OrderDetail)
+    assert status.status == "Success"
+
+
+def test_async_list_product_error(
+    make_httpserver: HTTPServer, local_config: SATClientConfig
+):
+    """
+    SAT error responses are returned as ErrorResponse, same as SATClient
+
+    :param make_httpserver:
+    :param local_config:
+    """
+    make_httpserver.expect_request(
+        PRODUCT_LIST_PATH,
+        method="GET",
+        query_string="product_code=not-exists",
+        handler_type=HandlerType.ONESHOT,
+    ).respond_with_json(
+        {"errors": [{"code": "P04", "detail": "Product not found", "status": "400"}]},
+        status=400,
+    )
+
+    async def run():
+        async with AsyncSATClient(local_config) as sat_client:
+            return await sat_client.list_product("not-exists")
+
+    response = asyncio.run(run())
+
+    assert isinstance(response, ErrorResponse)
+    assert not response.is_success()
+    assert response.get_error_codes() == "P04"
+
+
+@pytest.mark.parametrize(
+    "configure",
+    [
+        lambda config: config.with_token_store(InMemoryTokenStore()),
+        lambda config: config.with_hedging(),
+        lambda config: config.with_bulkheads(),
+        lambda config: config.with_sat_base_urls(
+            ["http://a", "http://b"], probe_interval=None
+        ),
+    ],
+)
+def test_async_unsupported_options(fresh_local_config: SATClientConfig, configure):
+    """
+    Options only SATClient supports are rejected instead of being silently ignored
+
+    :param fresh_local_config:
+    :param configure: enables one SATClient only option
+    """
+    config = configure(fresh_local_config)
+
+    with pytest.raises(InvalidInputException):
+        AsyncSATClient(config)
+
+
+def test_async_handle_callback(local_config: SATClientConfig, sat_signer: Signature):
+    """
+    Example of callback handling with a coroutine function
+
+    :param local_config:
+    :param sat_signer:
+    """
+    body = {
+        "data": {
+            "type": "order",
+            "id": "1231231",
+            "attributes": {"status": "Success", "product_code": "pln-prepaid"},
+        }
+    }
+    received = []
+
+    async def do_action(order_detail: OrderDetail):
+        received.append(order_detail)
+
+    async def run():
+        async with AsyncSATClient(local_config) as sat_client:
+            await sat_client.handle_callback(
+                body, {"signature": sat_signer.sign(json.dumps(body))}, do_action
+            )
+            with pytest.raises(UnauthenticatedException):
+                await sat_client.handle_callback(
+                    body, {"signature": sat_signer.sign("tampered")}, do_action
+                )
+
+    asyncio.run(run())
+
+    assert len(received) == 1
+    assert received[0].id == "1231231"
+    assert received[0].status == "Success"
+
+
+def test_async_handle_callback_raw(
+    local_config: SATClientConfig, sat_signer: Signature
+):
+    """
+    Example of callback handling on the raw request body with a coroutine function
+
+    :param local_config:
+    :param sat_signer:
+    """
+    body = b'{"data":{"type":"order","id":"1231231","attributes":{"status":"Success"}}}'
+    received = []
+
+    async def do_action(order_detail: OrderDetail):
+        received.append(order_detail)
+
+    async def run():
+        async with AsyncSATClient(local_config) as sat_client:
+            await sat_client.handle_callback_raw(
+                body, {"Signature": sat_signer.sign(body)}, do_action
+            )
+            with pytest.raises(UnauthenticatedException):
+                await sat_client.handle_callback_raw(
+                    body, {"signature": sat_signer.sign("tampered")}, do_action
+                )
+
+    asyncio.run(run())
+
+    assert len(received) == 1
+    assert received[0].id == "1231231"
+    assert received[0].status == "Success"
+
+
+def test_async_handle_callback_dedup(
+    local_config: SATClientConfig, sat_signer: Signature
+):
+    """
+    A redelivered callback is flagged and not verified again by the async client
+
+    :param local_config:
+    :param sat_signer:
+    """
+    config = SATClientConfig(
+        client_id=local_config.client_id,
+        client_secret=local_config.client_secret,
+        private_key=local_config.private_key,
+        sat_public_key=local_config.sat_public_key,
+    ).with_callback_dedup(skip_redelivery=False)
+    body = b'{"data":{"type":"order","id":"1231231","attributes":{"status":"Success"}}}'
+    headers = {"signature": sat_signer.sign(body)}
+    received = []
+
+    async def do_action(order_detail: OrderDetail):
+        received.append(order_detail.is_redelivery())
+
+    async def run():
+        async with AsyncSATClient(config) as sat_client:
+            await sat_client.handle_callback_raw(body, headers, do_action)
+            await sat_client.handle_callback_raw(body, headers, do_action)
+            return sat_client.get_callback_dedup_stats()
+
+    stats = asyncio.run(run())
+
+    assert received == [False, True]
+    assert stats.hits == 1
+    assert stats.misses == 1
+
+
+def test_async_handle_callback_dedup_concurrent(
+    local_config: SATClientConfig, sat_signer: Signature
+):
+    """
+    Of two deliveries of the same callback handled concurrently, the one arriving while the other is
+    handled is rejected, the callback is handled once as a first delivery
+
+    :param local_config:
+    :param sat_signer:
+    """
+    config = SATClientConfig(
+        client_id=local_config.client_id,
+        client_secret=local_config.client_secret,
+        private_key=local_config.private_key,
+        sat_public_key=local_config.sat_public_key,
+    ).with_callback_dedup(skip_redelivery=False)
+    body = b'{"data":{"type":"order","id":"1231231","attributes":{"status":"Success"}}}'
+    headers = {"signature": sat_signer.sign(body)}
+    received = []
+
+    async def slow_action(order_detail: OrderDetail):
+        await asyncio.sleep(0.1)
+        received.append(order_detail.is_redelivery())
+
+    async def run():
+        async with AsyncSATClient(config) as sat_client:
+            results = await asyncio.gather(
+                sat_client.handle_callback_raw(body, headers, slow_action),
+                sat_client.handle_callback_raw(body, headers, slow_action),
+                return_exceptions=True,
+            )
+            return results, sat_client.get_callback_dedup_stats()
+
+    results, stats = asyncio.run(run())
+
+    assert sum(isinstance(result, CallbackInFlightException) for result in results) == 1
+    assert received == [False]
+    assert stats.hits == 1
+    assert stats.misses == 1
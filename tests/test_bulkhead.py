@@ -0,0 +1,129 @@
+"""
+Test the bulkheads of the SATClient.
+
+This example shows how to isolate checkout from read traffic, so slow reads never starve
+checkout of connections, and how to measure the time requests queue for a slot.
+"""
+
+import threading
+import time
+
+import pytest
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+from py_sat import SATClient, SATClientConfig
+from py_sat.bulkhead import BulkheadClass
+from py_sat.constant import ACCOUNT_PATH, INQUIRY_PATH
+from py_sat.exceptions import BulkheadFullException, InvalidInputException
+from py_sat.models import InquiryRequest
+
+ACCOUNT_RESPONSE = (
+    '{"data": {"type": "account", "id": "2203", "attributes": {"saldo": 50000000}}}'
+)
+
+INQUIRY_RESPONSE = {
+    "data": {
+        "type": "inquiry",
+        "id": "2121212",
+        "attributes": {"client_number": "2121212", "product_code": "pln-postpaid"},
+    }
+}
+
+
+def slow_account(request: Request) -> Response:
+    time.sleep(0.5)
+    return Response(ACCOUNT_RESPONSE, content_type="application/json")
+
+
+def test_bulkhead_isolates_checkout(
+    threaded_server: HTTPServer, threaded_config: SATClientConfig
+):
+    """
+    Slow reads fill the read bulkhead and queue, inquiry goes through its own pool meanwhile
+
+    :param threaded_server:
+    :param threaded_config:
+    """
+    threaded_server.expect_request(ACCOUNT_PATH).respond_with_handler(slow_account)
+    threaded_server.expect_request(INQUIRY_PATH, method="POST").respond_with_json(
+        INQUIRY_RESPONSE
+    )
+    sat_client = SATClient(
+        threaded_config.with_bulkheads(checkout_max_in_flight=2, read_max_in_flight=1)
+    )
+    http_client = sat_client.get_http_client()
+    http_client.ensure_access_token()
+
+    readers = [threading.Thread(target=sat_client.account) for _ in range(2)]
+    for reader in readers:
+        reader.start()
+    time.sleep(0.1)
+
+    started = time.monotonic()
+    response = sat_client.inquiry(
+        InquiryRequest(product_code="pln-postpaid", client_number="2121212")
+    )
+    assert response.is_success()
+    assert time.monotonic() - started < 0.3
+    assert http_client.get_bulkhead_stats()[BulkheadClass.READ].in_flight == 1
+
+    for reader in readers:
+        reader.join()
+
+    stats = http_client.get_bulkhead_stats()
+    read = stats[BulkheadClass.READ]
+    assert read.calls == 2
+    assert read.queued == 1
+    assert read.in_flight == 0
+    assert read.queue_wait_max >= 0.3
+    assert read.pool.idle <= 1
+
+    checkout = stats[BulkheadClass.CHECKOUT]
+    assert checkout.calls == 1
+    assert checkout.queued == 0
+    assert checkout.max_in_flight == 2
+
+    # SAT requests go through the bulkhead pools, the access token fetch through the shared one
+    pool = http_client.get_pool_stats()
+    assert read.pool.handshakes + checkout.pool.handshakes >= 3
+    assert pool.handshakes == 1 + read.pool.handshakes + checkout.pool.handshakes
+
+
+def test_bulkhead_max_queue_wait(
+    threaded_server: HTTPServer, threaded_config: SATClientConfig
+):
+    """
+    A request that waited max_queue_wait for a slot raises BulkheadFullException
+
+    :param threaded_server:
+    :param threaded_config:
+    """
+    threaded_server.expect_request(ACCOUNT_PATH).respond_with_handler(slow_account)
+    sat_client = SATClient(
+        threaded_config.with_bulkheads(read_max_in_flight=1, max_queue_wait=0.1)
+    )
+    sat_client.get_http_client().ensure_access_token()
+
+    reader = threading.Thread(target=sat_client.account)
+    reader.start()
+    time.sleep(0.1)
+
+    with pytest.raises(BulkheadFullException) as exc_info:
+        sat_client.account()
+    assert exc_info.value.bulkhead_class == BulkheadClass.READ
+    reader.join()
+
+    stats = sat_client.get_http_client().get_bulkhead_stats()[BulkheadClass.READ]
+    assert stats.rejected == 1
+    assert stats.calls == 1
+
+
+def test_bulkhead_invalid_input(fresh_local_config: SATClientConfig):
+    """
+    Every class needs at least one slot
+
+    :param fresh_local_config:
+    """
+    with pytest.raises(InvalidInputException):
+        fresh_local_config.with_bulkheads(read_max_in_flight=0)
@@ -13,13 +13,19 @@ For more detail, see "Callback for Partner" section in the documentation
 
 import json
 import logging
+import threading
 
+import pytest
 import requests
 from pytest_httpserver import HTTPServer
 from werkzeug.wrappers import Request, Response
 
 from py_sat import SATClient
+from py_sat.callback import (CallbackDedupCache, CallbackDedupConfig,
+                             CallbackDedupStats)
 from py_sat.client import SATClientConfig
+from py_sat.exceptions import (CallbackInFlightException,
+                               InvalidInputException, UnauthenticatedException)
 from py_sat.models import OrderDetail
 from py_sat.signature import Signature, SignatureType
 from py_sat.utils import parse_json_api_response
@@ -219,3 +225,261 @@ def create_signature_only_handler(sat_client: SATClient):
             )
 
     return handler
+
+
+def test_callback_raw(
+    make_httpserver: HTTPServer, local_config: SATClientConfig, sat_signer: Signature
+):
+    """
+    Example of how to handle the callback from SAT on the raw request body.
+    The signature is verified on the received bytes, whatever their JSON layout,
+    the payload is never serialized again
+    """
+    sat_client = SATClient(local_config)
+
+    def handler(request: Request) -> Response:
+        try:
+
+            def do_action(order_detail: OrderDetail):
+                assert order_detail.id == "1231231"
+                assert order_detail.status == "Success"
+                assert order_detail.sales_price == 102500
+
+            sat_client.handle_callback_raw(
+                body=request.get_data(),
+                headers=request.headers,
+                do=do_action,
+            )
+
+            return Response(status=200, response=json.dumps({"message": "OK"}))
+        except UnauthenticatedException as e:
+            return Response(status=401, response=json.dumps({"error": str(e)}))
+
+    make_httpserver.expect_request("/callback-raw", method="POST").respond_with_handler(
+        handler
+    )
+
+    # Compact layout, json.dumps of the parsed payload would not reproduce these bytes
+    body = (
+        b'{"data":{"type":"order","id":"1231231","attributes":'
+        b'{"product_code":"pln-prepaid-token-100k","sales_price":102500,"status":"Success"}}}'
+    )
+    url = make_httpserver.url_for("/callback-raw")
+    headers = {
+        "content-type": "application/vnd.api+json",
+        "signature": sat_signer.sign(body),
+    }
+
+    response = requests.post(url, data=body, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json() == {"message": "OK"}
+
+    response = requests.post(url, data=body.replace(b"102500", b"1"), headers=headers)
+
+    assert response.status_code == 401
+
+
+def test_callback_raw_invalid_input(
+    local_config: SATClientConfig, sat_signer: Signature
+):
+    """
+    The raw body must be bytes, carry a signature header and be JSON
+    """
+    sat_client = SATClient(local_config)
+
+    with pytest.raises(InvalidInputException):
+        sat_client.handle_callback_raw("{}", {"signature": "sig"}, lambda _: None)
+
+    with pytest.raises(InvalidInputException):
+        sat_client.handle_callback_raw(b"{}", {}, lambda _: None)
+
+    with pytest.raises(InvalidInputException):
+        sat_client.handle_callback_raw(
+            b"not json", {"signature": sat_signer.sign(b"not json")}, lambda _: None
+        )
+
+
+def dedup_callback(sat_signer: Signature, order_id: str = "1231231"):
+    body = (
+        '{"data":{"type":"order","id":"' + order_id + '",'
+        '"attributes":{"status":"Success","sales_price":102500}}}'
+    ).encode()
+    return body, {"signature": sat_signer.sign(body)}
+
+
+def test_callback_dedup_skip_redelivery(
+    local_config: SATClientConfig, sat_signer: Signature
+):
+    """
+    A redelivered callback is recognized from the cache, without verifying it again,
+    and the handler is not called twice
+    """
+    sat_client = SATClient(
+        SATClientConfig(
+            client_id=local_config.client_id,
+            client_secret=local_config.client_secret,
+            private_key=local_config.private_key,
+            sat_public_key=local_config.sat_public_key,
+        ).with_callback_dedup(max_size=100, ttl=60)
+    )
+    body, headers = dedup_callback(sat_signer)
+    handled = []
+
+    data = json.loads(body)
+    data_headers = {"signature": sat_signer.sign(json.dumps(data))}
+
+    sat_client.handle_callback_raw(body, headers, handled.append)
+    sat_client.handle_callback_raw(body, headers, handled.append)
+    sat_client.handle_callback(data, data_headers, handled.append)
+    sat_client.handle_callback(data, data_headers, handled.append)
+
+    assert [order_detail.id for order_detail in handled] == ["1231231", "1231231"]
+    assert sat_client.get_signature().get_keyring_stats().verifications == 2
+    stats = sat_client.get_callback_dedup_stats()
+    assert stats.hits == 2
+    assert stats.misses == 2
+    assert stats.size == 2
+
+    with pytest.raises(UnauthenticatedException):
+        sat_client.handle_callback_raw(
+            body, {"signature": sat_signer.sign(b"tampered")}, handled.append
+        )
+
+
+def test_callback_dedup_flag_redelivery(
+    local_config: SATClientConfig, sat_signer: Signature
+):
+    """
+    With skip_redelivery disabled the handler is called again with a flagged order detail,
+    and a callback whose handler failed is verified and handled again
+    """
+    sat_client = SATClient(
+        SATClientConfig(
+            client_id=local_config.client_id,
+            client_secret=local_config.client_secret,
+            private_key=local_config.private_key,
+            sat_public_key=local_config.sat_public_key,
+        ).with_callback_dedup(skip_redelivery=False)
+    )
+    body, headers = dedup_callback(sat_signer)
+    handled = []
+
+    def failing_action(order_detail: OrderDetail):
+        raise RuntimeError("database is down")
+
+    with pytest.raises(RuntimeError):
+        sat_client.handle_callback_raw(body, headers, failing_action)
+    sat_client.handle_callback_raw(body, headers, handled.append)
+    sat_client.handle_callback_raw(body, headers, handled.append)
+
+    assert [order_detail.is_redelivery() for order_detail in handled] == [False, True]
+    assert sat_client.get_signature().get_keyring_stats().verifications == 2
+
+
+def test_callback_dedup_cache_bounds(monkeypatch):
+    """
+    Callbacks are forgotten after the TTL, and the least recently seen ones first beyond max size
+    """
+    now = [1000.0]
+    monkeypatch.setattr("py_sat.callback.time.monotonic", lambda: now[0])
+    cache = CallbackDedupCache(CallbackDedupConfig(max_size=2, ttl=10))
+    first, second, third = (
+        CallbackDedupCache.key(f"body-{i}", "signature") for i in range(3)
+    )
+
+    for key, order_id in ((first, "order-1"), (second, "order-2")):
+        assert cache.claim(key, order_id)
+        cache.complete(key)
+    assert cache.get(first) == "order-1"
+
+    assert cache.claim(third, "order-3")
+    assert cache.get(second) is None
+    assert cache.get(first) == "order-1"
+
+    now[0] += 10
+    assert cache.get(first) is None
+    assert cache.get_stats() == CallbackDedupStats(hits=2, misses=2, size=1)
+
+
+def test_callback_dedup_concurrent_delivery(
+    local_config: SATClientConfig, sat_signer: Signature
+):
+    """
+    A redelivery arriving while the first delivery is still being handled is rejected, not acknowledged,
+    so when the first handler fails afterwards the next redelivery is handled again
+    """
+    sat_client = SATClient(
+        SATClientConfig(
+            client_id=local_config.client_id,
+            client_secret=local_config.client_secret,
+            private_key=local_config.private_key,
+            sat_public_key=local_config.sat_public_key,
+        ).with_callback_dedup(skip_redelivery=False)
+    )
+    body, headers = dedup_callback(sat_signer)
+    handled = []
+    handling = threading.Event()
+    redelivered = threading.Event()
+
+    def failing_action(order_detail: OrderDetail):
+        handling.set()
+        assert redelivered.wait(5)
+        raise RuntimeError("database unavailable")
+
+    def first_delivery():
+        with pytest.raises(RuntimeError):
+            sat_client.handle_callback_raw(body, headers, failing_action)
+
+    first = threading.Thread(target=first_delivery)
+    first.start()
+    assert handling.wait(5)
+    with pytest.raises(CallbackInFlightException) as exc_info:
+        sat_client.handle_callback_raw(body, headers, handled.append)
+    assert exc_info.value.order_id == "1231231"
+    redelivered.set()
+    first.join()
+
+    sat_client.handle_callback_raw(body, headers, handled.append)
+    assert [order_detail.is_redelivery() for order_detail in handled] == [False]
+    assert sat_client.get_signature().get_keyring_stats().verifications == 2
+    stats = sat_client.get_callback_dedup_stats()
+    assert stats.hits == 1
+    assert stats.misses == 2
+
+
+def test_callback_dedup_claim():
+    """
+    Two deliveries verified at the same time are told apart by their claim, a claim in flight rejects
+    the other deliveries, a completed one is a redelivery and a released one is forgotten
+    """
+    cache = CallbackDedupCache(CallbackDedupConfig())
+    key = CallbackDedupCache.key("body", "signature")
+
+    assert cache.get(key) is None
+    assert cache.get(key) is None
+    assert cache.claim(key, "order-1")
+    with pytest.raises(CallbackInFlightException):
+        cache.claim(key, "order-1")
+    with pytest.raises(CallbackInFlightException):
+        cache.get(key)
+    assert cache.get_stats() == CallbackDedupStats(hits=2, misses=1, size=1)
+
+    cache.complete(key)
+    assert cache.get(key) == "order-1"
+    assert not cache.claim(key, "order-1")
+
+    cache.release(key)
+    assert cache.get(key) is None
+    assert cache.claim(key, "order-1")
+
+
+def test_callback_dedup_invalid_config(local_config: SATClientConfig):
+    """
+    Invalid dedup configurations are rejected
+    """
+    with pytest.raises(InvalidInputException):
+        local_config.with_callback_dedup(max_size=0)
+
+    with pytest.raises(InvalidInputException):
+        local_config.with_callback_dedup(ttl=0)
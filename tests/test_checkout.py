@@ -11,11 +11,13 @@ import json
 from conftest import TestUtil
 from pytest_httpserver import HTTPServer
 from pytest_httpserver.httpserver import HandlerType
+from werkzeug import Request, Response
 
 from py_sat import SATClient
 from py_sat.constant import CHECKOUT_PATH, SDK_LABEL
 from py_sat.models import (ErrorObject, ErrorResponse, Field, OrderDetail,
                            OrderRequest)
+from py_sat.signature import Signature
 from py_sat.utils import generate_json_api_request
 
 
@@ -299,3 +301,56 @@ def test_checkout_duplicate_request_id(
             )
         ]
     )
+
+
+def test_checkout_sends_signed_bytes(
+    make_httpserver: HTTPServer,
+    sat_client: SATClient,
+    client_signer: Signature,
+    util: TestUtil,
+):
+    """
+    The body is serialized once with compact separators and sorted keys,
+    the signature header is computed on the exact bytes received by SAT and exposed on the response
+
+    :param make_httpserver:
+    :param sat_client:
+    :param client_signer:
+    :param util:
+    """
+    random_string = "PYSAT" + util.generate_random_string(8)
+    req = OrderRequest(
+        id=random_string,
+        product_code="pln-postpaid",
+        client_number="2121212",
+        amount=12500,
+    )
+    received = {}
+
+    def handler(request: Request) -> Response:
+        received["body"] = request.get_data()
+        received["signature"] = request.headers["signature"]
+        return Response(
+            json.dumps({"data": {"type": "order", "id": random_string}}),
+            status=200,
+            content_type="application/json",
+        )
+
+    make_httpserver.expect_request(
+        CHECKOUT_PATH, handler_type=HandlerType.ONESHOT
+    ).respond_with_handler(handler)
+
+    response = sat_client.checkout(req)
+
+    assert response.is_success()
+    assert response.get_signed_body() == received["body"]
+    assert (
+        received["body"]
+        == (
+            '{"data":{"attributes":{"amount":12500,"client_number":"2121212",'
+            '"product_code":"pln-postpaid"},"id":"'
+            + random_string
+            + '","type":"order"}}'
+        ).encode()
+    )
+    assert client_signer.verify(received["body"].decode(), received["signature"])
@@ -0,0 +1,186 @@
+"""
+Test the circuit breaker of the SATClient.
+
+This example shows how to enable the circuit breaker, fail fast while SAT is degraded,
+and observe the breaker state changes to shed load upstream.
+"""
+
+import logging
+import time
+
+import pytest
+from pytest_httpserver import HTTPServer
+from pytest_httpserver.httpserver import HandlerType
+
+from py_sat import SATClient, SATClientConfig
+from py_sat.circuit_breaker import (CircuitBreaker, CircuitBreakerConfig,
+                                    CircuitState)
+from py_sat.constant import ACCOUNT_PATH, Endpoint
+from py_sat.exceptions import CircuitOpenException, GeneralException
+
+ACCOUNT_RESPONSE = {
+    "data": {"type": "account", "id": "2203", "attributes": {"saldo": 50000000}}
+}
+
+
+def test_circuit_breaker_opens_and_recovers(
+    make_httpserver: HTTPServer, fresh_local_config: SATClientConfig
+):
+    """
+    Account opens after repeated 503, fails fast while open, then closes after a successful probe
+
+    :param make_httpserver:
+    :param fresh_local_config:
+    """
+    transitions = []
+    config = fresh_local_config.with_circuit_breaker(
+        window_size=4,
+        minimum_calls=4,
+        open_duration=0.2,
+        half_open_max_calls=1,
+        on_state_change=lambda endpoint, base_url, old, new: transitions.append(
+            (endpoint, base_url, old, new)
+        ),
+    )
+    sat_client = SATClient(config)
+    http_client = sat_client.get_http_client()
+
+    for _ in range(4):
+        make_httpserver.expect_request(
+            ACCOUNT_PATH, handler_type=HandlerType.ONESHOT
+        ).respond_with_json(
+            {"errors": [{"code": "S00", "detail": "Unavailable", "status": "503"}]},
+            status=503,
+        )
+    for _ in range(4):
+        assert not sat_client.account().is_success()
+
+    assert http_client.get_circuit_state(Endpoint.ACCOUNT) == CircuitState.OPEN
+    assert http_client.get_circuit_state(Endpoint.PING) == CircuitState.CLOSED
+
+    requests_before = len(make_httpserver.log)
+    with pytest.raises(CircuitOpenException) as exc_info:
+        sat_client.account()
+    assert not isinstance(exc_info.value, GeneralException)
+    assert exc_info.value.endpoint == Endpoint.ACCOUNT
+    assert 0 < exc_info.value.retry_after <= 0.2
+    assert len(make_httpserver.log) == requests_before
+
+    time.sleep(0.25)
+    make_httpserver.expect_request(
+        ACCOUNT_PATH, handler_type=HandlerType.ONESHOT
+    ).respond_with_json(ACCOUNT_RESPONSE)
+    assert sat_client.account().is_success()
+
+    assert http_client.get_circuit_state(Endpoint.ACCOUNT) == CircuitState.CLOSED
+    assert transitions == [
+        (Endpoint.ACCOUNT, None, CircuitState.CLOSED, CircuitState.OPEN),
+        (Endpoint.ACCOUNT, None, CircuitState.OPEN, CircuitState.HALF_OPEN),
+        (Endpoint.ACCOUNT, None, CircuitState.HALF_OPEN, CircuitState.CLOSED),
+    ]
+
+
+def test_circuit_breaker_slow_calls():
+    """
+    Slow calls open the breaker even when they succeed
+    """
+    breaker = CircuitBreaker(
+        Endpoint.INQUIRY,
+        CircuitBreakerConfig(
+            slow_call_duration=1.0,
+            slow_call_rate_threshold=0.5,
+            window_size=4,
+            minimum_calls=4,
+        ),
+        logging.getLogger(__name__),
+    )
+
+    for duration in (0.1, 1.5, 0.1, 2.0):
+        breaker.on_success(breaker.before_call(), duration)
+
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenException):
+        breaker.before_call()
+
+
+def test_circuit_breaker_half_open_failure():
+    """
+    A failed probe reopens the breaker, extra calls are rejected while the probe is in flight
+    """
+    breaker = CircuitBreaker(
+        Endpoint.CHECKOUT,
+        CircuitBreakerConfig(
+            window_size=2, minimum_calls=2, open_duration=0.05, half_open_max_calls=1
+        ),
+        logging.getLogger(__name__),
+    )
+    for _ in range(2):
+        breaker.on_failure(breaker.before_call(), 0.01)
+    assert breaker.state == CircuitState.OPEN
+
+    time.sleep(0.06)
+    probe = breaker.before_call()
+    assert breaker.state == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenException):
+        breaker.before_call()
+
+    breaker.on_failure(probe, 0.01)
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_circuit_breaker_ignores_client_errors():
+    """
+    4xx responses are SAT business errors, they keep the breaker closed
+    """
+    breaker = CircuitBreaker(
+        Endpoint.CHECKOUT,
+        CircuitBreakerConfig(window_size=2, minimum_calls=2),
+        logging.getLogger(__name__),
+    )
+
+    assert not breaker.is_failure_status(400)
+    assert breaker.is_failure_status(503)
+
+
+def test_circuit_breaker_counts_only_probes():
+    """
+    A call admitted while closed that ends during half-open is not a probe, only probes decide;
+    hooks get the base URL of the breaker
+    """
+    transitions = []
+    breaker = CircuitBreaker(
+        Endpoint.CHECKOUT,
+        CircuitBreakerConfig(
+            window_size=2,
+            minimum_calls=2,
+            open_duration=0.05,
+            half_open_max_calls=1,
+            on_state_change=[
+                lambda endpoint, base_url, old, new: transitions.append((base_url, new))
+            ],
+        ),
+        logging.getLogger(__name__),
+        base_url="https://sat.example",
+    )
+    slow_call = breaker.before_call()
+    for _ in range(2):
+        breaker.on_failure(breaker.before_call(), 0.01)
+    assert breaker.state == CircuitState.OPEN
+
+    time.sleep(0.06)
+    probe = breaker.before_call()
+    assert breaker.state == CircuitState.HALF_OPEN
+
+    breaker.on_success(slow_call, 0.01)
+    breaker.on_failure(slow_call, 0.01)
+    assert breaker.state == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenException):
+        breaker.before_call()
+
+    breaker.on_success(probe, 0.01)
+    assert breaker.state == CircuitState.CLOSED
+    assert transitions == [
+        ("https://sat.example", CircuitState.OPEN),
+        ("https://sat.example", CircuitState.HALF_OPEN),
+        ("https://sat.example", CircuitState.CLOSED),
+    ]
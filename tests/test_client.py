@@ -4,8 +4,12 @@ Test cases for SATClient class.
 This example shows how to use the SATClient class.
 """
 
+import multiprocessing
+import threading
+
 import pytest
 from conftest import TESTING_CLIENT_PRIVATE_KEY
+from pytest_httpserver import HTTPServer
 
 from py_sat import SATClient, SATClientConfig
 from py_sat.exceptions import InvalidInputException
@@ -83,3 +87,31 @@ def test_sat_client_invalid_public_key():
         _ = SATClient(config)
 
     assert "Invalid RSA public key" in str(exc_info.value)
+
+
+def test_sat_client_close(
+    threaded_server: HTTPServer, threaded_config: SATClientConfig
+):
+    """
+    Close stops the failover prober, the hedge threads and the signature worker processes
+    :param threaded_server:
+    :param threaded_config:
+    :return:
+    """
+    base_url = threaded_server.url_for("")[:-1]
+    config = (
+        threaded_config.with_sat_base_urls(
+            [base_url, base_url + "/"], probe_interval=60
+        )
+        .with_hedging()
+        .with_signature_pool(workers=1)
+    )
+    sat_client = SATClient(config)
+    assert sat_client.get_signature().sign_many(["{}"])[0].ok
+
+    sat_client.close()
+
+    thread_names = [thread.name for thread in threading.enumerate()]
+    assert "py-sat-prober" not in thread_names
+    assert not any(name.startswith("py-sat-hedge") for name in thread_names)
+    assert multiprocessing.active_children() == []
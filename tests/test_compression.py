@@ -0,0 +1,163 @@
+"""
+Test the compressed transfer of the SATClient.
+
+This example shows how to negotiate compressed responses and compress checkout bodies,
+the signature is still computed over the uncompressed body.
+"""
+
+import gzip
+import json
+import zlib
+
+from conftest import TestUtil
+from pytest_httpserver import HTTPServer
+from pytest_httpserver.httpserver import HandlerType
+from werkzeug import Request, Response
+
+from py_sat import SATClient, SATClientConfig
+from py_sat.compression import CompressionConfig
+from py_sat.constant import CHECKOUT_PATH, INQUIRY_PATH, Endpoint
+from py_sat.models import Field, InquiryRequest, OrderRequest
+from py_sat.signature import Signature
+
+
+def test_checkout_compressed(
+    make_httpserver: HTTPServer,
+    fresh_local_config: SATClientConfig,
+    client_signer: Signature,
+    util: TestUtil,
+):
+    """
+    Checkout body is gzipped, the signature verifies against the decompressed body,
+    and the gzipped response is decoded transparently
+
+    :param make_httpserver:
+    :param fresh_local_config:
+    :param client_signer:
+    :param util:
+    """
+    request_id = "PYSAT" + util.generate_random_string(8)
+    received = {}
+
+    def handler(request: Request) -> Response:
+        body = gzip.decompress(request.get_data())
+        received["content_encoding"] = request.headers.get("Content-Encoding")
+        received["accept_encoding"] = request.headers.get("Accept-Encoding")
+        received["verified"] = client_signer.verify(
+            body.decode("utf-8"), request.headers["signature"]
+        )
+        response_body = json.dumps(
+            {
+                "data": {
+                    "type": "order",
+                    "id": request_id,
+                    "attributes": {"product_code": "pln-postpaid", "status": "Pending"},
+                }
+            }
+        ).encode()
+        return Response(
+            gzip.compress(response_body),
+            content_type="application/json",
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    make_httpserver.expect_request(
+        CHECKOUT_PATH, method="POST", handler_type=HandlerType.ONESHOT
+    ).respond_with_handler(handler)
+
+    config = fresh_local_config.with_compression(request_encoding="gzip", min_size=0)
+    response = SATClient(config).checkout(
+        OrderRequest(
+            id=request_id,
+            product_code="pln-postpaid",
+            client_number="2121212",
+            amount=12500,
+            fields=[Field(name="optional", value="optional")],
+        )
+    )
+
+    assert response.is_success()
+    assert response.id == request_id
+    assert received["content_encoding"] == "gzip"
+    assert received["verified"]
+    assert received["accept_encoding"].startswith("gzip, deflate")
+
+
+def test_small_body_not_compressed():
+    """
+    Bodies below min_size and endpoints other than checkout and inquiry are sent as-is
+    """
+    config = CompressionConfig(request_encoding="gzip", min_size=100)
+
+    assert not config.should_compress(Endpoint.INQUIRY, b"{}")
+    assert config.should_compress(Endpoint.INQUIRY, b" " * 100)
+    assert not config.should_compress(Endpoint.ACCOUNT, b" " * 100)
+    assert not CompressionConfig().should_compress(Endpoint.INQUIRY, b" " * 2048)
+    assert gzip.decompress(config.compress(b"payload")) == b"payload"
+
+
+def test_compress_deterministic(monkeypatch):
+    """
+    Request bodies compress to the same bytes every time, without gzip.compress and its
+    Python 3.8 only mtime argument
+
+    :param monkeypatch:
+    """
+
+    def compress_without_mtime(data, compresslevel=9):
+        raise AssertionError("gzip.compress is not available with mtime on Python 3.7")
+
+    monkeypatch.setattr("py_sat.compression.gzip.compress", compress_without_mtime)
+    body = b'{"data":{"type":"order"}}' * 64
+
+    gzipped = CompressionConfig(request_encoding="gzip", level=9).compress(body)
+    assert gzipped == CompressionConfig(request_encoding="gzip", level=9).compress(body)
+    assert gzipped[4:8] == b"\x00\x00\x00\x00"
+    assert gzip.decompress(gzipped) == body
+
+    deflated = CompressionConfig(request_encoding="deflate").compress(body)
+    assert zlib.decompress(deflated) == body
+
+
+def test_accept_encoding_without_brotli(monkeypatch):
+    """
+    br is only advertised when brotli can decode it
+
+    :param monkeypatch:
+    """
+    monkeypatch.setattr("py_sat.compression.BROTLI_AVAILABLE", False)
+
+    assert CompressionConfig().accept_encoding_header() == "gzip, deflate"
+
+
+def test_inquiry_uncompressed_by_default(
+    make_httpserver: HTTPServer, fresh_local_config: SATClientConfig
+):
+    """
+    Without request_encoding only the response is negotiated
+
+    :param make_httpserver:
+    :param fresh_local_config:
+    """
+    received = {}
+
+    def handler(request: Request) -> Response:
+        received["content_encoding"] = request.headers.get("Content-Encoding")
+        received["body"] = json.loads(request.get_data())
+        return Response(
+            json.dumps({"data": {"type": "inquiry", "id": "1", "attributes": {}}}),
+            content_type="application/json",
+        )
+
+    make_httpserver.expect_request(
+        INQUIRY_PATH, method="POST", handler_type=HandlerType.ONESHOT
+    ).respond_with_handler(handler)
+
+    config = fresh_local_config.with_compression(accept_encodings=("gzip",))
+    response = SATClient(config).inquiry(
+        InquiryRequest(product_code="pln-postpaid", client_number="2121212")
+    )
+
+    assert response.is_success()
+    assert received["content_encoding"] is None
+    assert received["body"]["data"]["attributes"]["product_code"] == "pln-postpaid"
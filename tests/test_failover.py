@@ -0,0 +1,265 @@
+"""
+Test the multi base URL failover of the SATClient.
+
+This example shows how to spread the requests over several SAT base URLs, route each request
+to the healthiest one and fail over idempotent requests when a base URL is down.
+"""
+
+import threading
+import time
+
+import pytest
+import requests
+from pytest_httpserver import HTTPServer
+
+from py_sat import SATClient, SATClientConfig
+from py_sat.circuit_breaker import CircuitState
+from py_sat.constant import ACCOUNT_PATH, CHECKOUT_PATH, PING_PATH, Endpoint
+from py_sat.exceptions import InvalidInputException
+from py_sat.failover import BaseURLSelector, FailoverConfig
+
+ACCOUNT_RESPONSE = {
+    "data": {"type": "account", "id": "2203", "attributes": {"saldo": 50000000}}
+}
+
+UNAVAILABLE_RESPONSE = {
+    "errors": [{"code": "S00", "detail": "Unavailable", "status": "503"}]
+}
+
+PING_RESPONSE = {"buildhash": "b05b97a", "sandbox": True, "status": "ok"}
+
+
+@pytest.fixture
+def secondary_server():
+    server = HTTPServer(threaded=True)
+    server.start()
+    yield server
+    server.stop()
+
+
+def base_url(server: HTTPServer) -> str:
+    return server.url_for("")[:-1]
+
+
+def test_failover_on_unavailable(
+    threaded_server: HTTPServer,
+    secondary_server: HTTPServer,
+    threaded_config: SATClientConfig,
+):
+    """
+    Account answered 503 by the first base URL is sent again to the second one
+
+    :param threaded_server:
+    :param secondary_server:
+    :param threaded_config:
+    """
+    threaded_server.expect_request(ACCOUNT_PATH).respond_with_json(
+        UNAVAILABLE_RESPONSE, status=503
+    )
+    secondary_server.expect_request(ACCOUNT_PATH).respond_with_json(ACCOUNT_RESPONSE)
+    config = threaded_config.with_sat_base_urls(
+        [base_url(threaded_server), base_url(secondary_server)], probe_interval=None
+    )
+    sat_client = SATClient(config)
+
+    response = sat_client.account()
+
+    assert response.is_success()
+    assert response.get_raw_response().url.startswith(base_url(secondary_server))
+
+    primary, secondary = sat_client.get_http_client().get_base_url_stats()
+    assert primary.error_rate == 1.0
+    assert secondary.error_rate == 0.0
+    assert secondary.latency is not None
+
+
+def test_failover_on_unreachable(
+    secondary_server: HTTPServer, threaded_config: SATClientConfig
+):
+    """
+    An unreachable base URL is failed over, then ranked behind the healthy one
+
+    :param secondary_server:
+    :param threaded_config:
+    """
+    secondary_server.expect_request(ACCOUNT_PATH).respond_with_json(ACCOUNT_RESPONSE)
+    config = threaded_config.with_timeout(1).with_sat_base_urls(
+        ["http://127.0.0.1:1", base_url(secondary_server)], probe_interval=None
+    )
+    sat_client = SATClient(config)
+
+    assert sat_client.account().is_success()
+    assert sat_client.account().is_success()
+
+    unreachable, healthy = sat_client.get_http_client().get_base_url_stats()
+    assert unreachable.calls == 1
+    assert healthy.calls == 2
+
+
+def test_checkout_not_failed_over(
+    threaded_server: HTTPServer,
+    secondary_server: HTTPServer,
+    threaded_config: SATClientConfig,
+):
+    """
+    A 503 answered to checkout is returned as is, the order may have been processed
+
+    :param threaded_server:
+    :param secondary_server:
+    :param threaded_config:
+    """
+    config = threaded_config.with_sat_base_urls(
+        [base_url(threaded_server), base_url(secondary_server)], probe_interval=None
+    )
+    http_client = SATClient(config).get_http_client()
+    http_client.ensure_access_token()
+
+    threaded_server.expect_request(CHECKOUT_PATH, method="POST").respond_with_json(
+        UNAVAILABLE_RESPONSE, status=503
+    )
+    response = http_client.send_request(
+        requests.Request(
+            method="POST", url=f"{base_url(threaded_server)}{CHECKOUT_PATH}", data=b"{}"
+        ),
+        endpoint=Endpoint.CHECKOUT,
+    )
+
+    assert response.status_code == 503
+    assert len(secondary_server.log) == 0
+
+
+def test_prober(
+    threaded_server: HTTPServer,
+    secondary_server: HTTPServer,
+    threaded_config: SATClientConfig,
+):
+    """
+    The background prober pings every base URL and feeds their latency
+
+    :param threaded_server:
+    :param secondary_server:
+    :param threaded_config:
+    """
+    for server in (threaded_server, secondary_server):
+        server.expect_request(PING_PATH).respond_with_json(PING_RESPONSE)
+    config = threaded_config.with_sat_base_urls(
+        [base_url(threaded_server), base_url(secondary_server)], probe_interval=0.05
+    )
+    http_client = SATClient(config).get_http_client()
+
+    time.sleep(0.5)
+    http_client.close()
+
+    for stats in http_client.get_base_url_stats():
+        assert stats.calls >= 1
+        assert stats.latency is not None
+        assert stats.error_rate == 0.0
+    assert "py-sat-prober" not in [thread.name for thread in threading.enumerate()]
+
+
+def test_circuit_breaker_per_base_url(
+    secondary_server: HTTPServer, threaded_config: SATClientConfig
+):
+    """
+    An unreachable base URL opens its own breaker, the endpoint stays available on the healthy one
+
+    :param secondary_server:
+    :param threaded_config:
+    """
+    secondary_server.expect_request(ACCOUNT_PATH).respond_with_json(ACCOUNT_RESPONSE)
+    unreachable = "http://127.0.0.1:1"
+    config = (
+        threaded_config.with_timeout(1)
+        .with_sat_base_urls(
+            [unreachable, base_url(secondary_server)], probe_interval=None
+        )
+        .with_circuit_breaker(window_size=1, minimum_calls=1)
+    )
+    sat_client = SATClient(config)
+    http_client = sat_client.get_http_client()
+
+    assert sat_client.account().is_success()
+    assert sat_client.account().is_success()
+
+    healthy = base_url(secondary_server)
+    state = http_client.get_circuit_state
+    assert state(Endpoint.ACCOUNT, unreachable) == CircuitState.OPEN
+    assert state(Endpoint.ACCOUNT, healthy) == CircuitState.CLOSED
+    assert state(Endpoint.ACCOUNT) == CircuitState.CLOSED
+
+
+def test_open_circuit_failed_over(
+    threaded_server: HTTPServer,
+    secondary_server: HTTPServer,
+    threaded_config: SATClientConfig,
+):
+    """
+    A base URL whose breaker is open is skipped, even for checkout since nothing was sent to it
+
+    :param threaded_server:
+    :param secondary_server:
+    :param threaded_config:
+    """
+    config = threaded_config.with_sat_base_urls(
+        [base_url(threaded_server), base_url(secondary_server)], probe_interval=None
+    ).with_circuit_breaker(window_size=1, minimum_calls=1)
+    http_client = SATClient(config).get_http_client()
+    http_client.ensure_access_token()
+
+    breaker = http_client._get_circuit_breaker(
+        Endpoint.CHECKOUT, base_url(threaded_server)
+    )
+    breaker.on_failure(breaker.before_call(), 0.0)
+
+    secondary_server.expect_request(CHECKOUT_PATH, method="POST").respond_with_json(
+        {}, status=201
+    )
+    response = http_client.send_request(
+        requests.Request(
+            method="POST", url=f"{base_url(threaded_server)}{CHECKOUT_PATH}", data=b"{}"
+        ),
+        endpoint=Endpoint.CHECKOUT,
+    )
+
+    assert response.status_code == 201
+    assert [entry[0].path for entry in threaded_server.log] == ["/token"]
+
+
+def test_base_url_ranking():
+    """
+    A measured healthy base URL stays ahead of an unmeasured one, an unmeasured one ahead of a failing one,
+    and a higher error rate ranks behind whatever its latency
+    """
+    selector = BaseURLSelector(
+        FailoverConfig(base_urls=("http://a", "http://b", "http://c"))
+    )
+    assert selector.ordered() == ["http://a", "http://b", "http://c"]
+
+    selector.record("http://a", 0.5, failed=False)
+    assert selector.ordered() == ["http://a", "http://b", "http://c"]
+
+    selector.record("http://a", 0.0, failed=True)
+    assert selector.ordered() == ["http://b", "http://c", "http://a"]
+
+    selector.record("http://c", 2.0, failed=False)
+    assert selector.ordered() == ["http://c", "http://b", "http://a"]
+
+    for _ in range(10):
+        selector.record("http://a", 0.1, failed=False)
+    selector.record("http://c", 0.0, failed=True)
+    assert selector.ordered() == ["http://a", "http://b", "http://c"]
+
+
+def test_base_urls_invalid_input(fresh_local_config: SATClientConfig):
+    """
+    At least one base URL is required
+
+    :param fresh_local_config:
+    """
+    with pytest.raises(InvalidInputException):
+        fresh_local_config.with_sat_base_urls([])
+
+    with pytest.raises(InvalidInputException):
+        fresh_local_config.with_sat_base_urls(
+            ["http://a", "http://b"], probe_interval=0
+        )
@@ -0,0 +1,156 @@
+"""
+Test the hedged requests of the SATClient.
+
+This example shows how to hedge slow check status calls, a second identical request
+is sent when the first one is slower than usual and the first valid response wins.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+from py_sat import SATClient, SATClientConfig
+from py_sat.constant import CHECK_STATUS_PATH, Endpoint
+from py_sat.exceptions import InvalidInputException
+from py_sat.signature import Signature
+
+
+def test_hedged_check_status(
+    threaded_server: HTTPServer,
+    threaded_config: SATClientConfig,
+    sat_signer: Signature,
+):
+    """
+    The first check status hangs, the hedge sent after initial_delay answers and wins
+
+    :param threaded_server:
+    :param threaded_config:
+    :param sat_signer:
+    """
+    calls = []
+    lock = threading.Lock()
+
+    def handler(request: Request) -> Response:
+        with lock:
+            calls.append(time.monotonic())
+            first = len(calls) == 1
+        if first:
+            time.sleep(1)
+        body = json.dumps(
+            {
+                "data": {
+                    "type": "order",
+                    "id": "hedged",
+                    "attributes": {"status": "Success"},
+                }
+            }
+        )
+        return Response(
+            body,
+            content_type="application/json",
+            headers={"signature": sat_signer.sign(body)},
+        )
+
+    threaded_server.expect_request(
+        CHECK_STATUS_PATH.format(request_id="hedged")
+    ).respond_with_handler(handler)
+
+    sat_client = SATClient(threaded_config.with_hedging(initial_delay=0.1))
+    sat_client.get_http_client().ensure_access_token()
+
+    started = time.monotonic()
+    response = sat_client.check_status("hedged")
+
+    assert response.is_success()
+    assert response.status == "Success"
+    assert time.monotonic() - started < 0.9
+    assert len(calls) == 2
+
+    stats = sat_client.get_http_client().get_hedge_stats()
+    assert stats.fired == 1
+    assert stats.won == 1
+
+
+def test_checkout_never_hedged(fresh_local_config: SATClientConfig):
+    """
+    Checkout is not idempotent, it cannot be configured for hedging
+
+    :param fresh_local_config:
+    """
+    with pytest.raises(InvalidInputException):
+        fresh_local_config.with_hedging(
+            endpoints=frozenset({Endpoint.INQUIRY, Endpoint.CHECKOUT})
+        )
+
+    http_client = SATClient(fresh_local_config.with_hedging()).get_http_client()
+    assert not http_client._hedger.applies(Endpoint.CHECKOUT)
+    assert http_client._hedger.applies(Endpoint.CHECK_STATUS)
+
+
+def test_hedging_under_load_does_not_amplify(
+    threaded_server: HTTPServer,
+    threaded_config: SATClientConfig,
+    sat_signer: Signature,
+):
+    """
+    Concurrent check status calls saturating the hedge threads are not hedged, the calls
+    beyond the hedge threads are sent right away on their own thread instead of queueing
+
+    :param threaded_server:
+    :param threaded_config:
+    :param sat_signer:
+    """
+    calls = []
+    lock = threading.Lock()
+    body = json.dumps(
+        {
+            "data": {
+                "type": "order",
+                "id": "loaded",
+                "attributes": {"status": "Success"},
+            }
+        }
+    )
+
+    def handler(request: Request) -> Response:
+        with lock:
+            calls.append(time.monotonic())
+        time.sleep(0.2)
+        return Response(
+            body,
+            content_type="application/json",
+            headers={"signature": sat_signer.sign(body)},
+        )
+
+    threaded_server.expect_request(
+        CHECK_STATUS_PATH.format(request_id="loaded")
+    ).respond_with_handler(handler)
+
+    # Two hedge threads, as many as the concurrent calls they can serve without queueing
+    sat_client = SATClient(
+        threaded_config.with_connection_pool(pool_maxsize=1).with_hedging(
+            initial_delay=0.05
+        )
+    )
+    sat_client.get_http_client().ensure_access_token()
+
+    responses = []
+
+    def check_status():
+        responses.append(sat_client.check_status("loaded"))
+
+    threads = [threading.Thread(target=check_status) for _ in range(4)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [response.status for response in responses] == ["Success"] * 4
+    assert time.monotonic() - started < 0.35
+    assert len(calls) == 4
+    assert sat_client.get_http_client().get_hedge_stats().fired == 0
@@ -0,0 +1,200 @@
+"""
+Test the SAT public keyring
+
+This example shows how to accept the old and the new SAT public key during a SAT key rotation.
+The testing client key pair plays the old SAT key, the testing SAT key pair the new one.
+"""
+
+import json
+
+import pytest
+from conftest import (TESTING_CLIENT_PRIVATE_KEY, TESTING_CLIENT_PUBLIC_KEY,
+                      TESTING_SAT_PRIVATE_KEY, TESTING_SAT_PUBLIC_KEY,
+                      TestUtil)
+from pytest_httpserver import HTTPServer
+
+from py_sat import SATClient, SATClientConfig
+from py_sat.constant import CHECK_STATUS_PATH, SIGNATURE_KEY_ID_HEADER_KEY
+from py_sat.exceptions import InvalidInputException
+from py_sat.signature import Signature, SignatureType
+from py_sat.signature.keyring import DEFAULT_KEY_ID
+
+MESSAGE = '{"data":{"type":"order","id":"1231231"}}'
+
+
+@pytest.fixture
+def old_signer() -> Signature:
+    return Signature(TESTING_CLIENT_PRIVATE_KEY, None, SignatureType.PSS)
+
+
+@pytest.fixture
+def new_signer() -> Signature:
+    return Signature(TESTING_SAT_PRIVATE_KEY, None, SignatureType.PSS)
+
+
+def rotating_signature() -> Signature:
+    return Signature(
+        None,
+        TESTING_CLIENT_PUBLIC_KEY,
+        SignatureType.PSS,
+        sat_public_keys={"2025": TESTING_SAT_PUBLIC_KEY},
+    )
+
+
+def test_keyring_most_recently_successful_first(
+    old_signer: Signature, new_signer: Signature
+):
+    """
+    The key that verified last is tried first, so once SAT signs with the new key
+    only the first verification pays for the old key
+
+    :param old_signer:
+    :param new_signer:
+    """
+    signature = rotating_signature()
+
+    assert signature.verify(MESSAGE, old_signer.sign(MESSAGE))
+    assert signature.verify(MESSAGE, new_signer.sign(MESSAGE))
+    assert signature.verify(MESSAGE, new_signer.sign(MESSAGE))
+    assert not signature.verify(MESSAGE, new_signer.sign("tampered"))
+
+    stats = signature.get_keyring_stats()
+    assert stats.key_ids == ["2025", DEFAULT_KEY_ID]
+    assert stats.verified_by == {DEFAULT_KEY_ID: 1, "2025": 2}
+    assert stats.attempts == {1: 2, 2: 2}
+    assert stats.failed == 1
+    assert stats.verifications == 4
+
+
+def test_keyring_key_id_hint(old_signer: Signature, new_signer: Signature):
+    """
+    A known key id hint is tried first, an unknown one falls back to the keyring order
+
+    :param old_signer:
+    :param new_signer:
+    """
+    signature = rotating_signature()
+
+    assert signature.verify(MESSAGE, new_signer.sign(MESSAGE), key_id="2025")
+    assert signature.verify(MESSAGE, old_signer.sign(MESSAGE), key_id=DEFAULT_KEY_ID)
+    assert signature.verify(MESSAGE, old_signer.sign(MESSAGE), key_id="2030")
+
+    stats = signature.get_keyring_stats()
+    assert stats.attempts == {1: 3}
+    assert stats.unknown_hints == 1
+    assert stats.key_ids == [DEFAULT_KEY_ID, "2025"]
+
+
+def test_keyring_main_key_keeps_its_id(new_signer: Signature):
+    """
+    The main SAT public key is not duplicated when it is also in the keyring
+
+    :param new_signer:
+    """
+    signature = Signature(
+        None,
+        TESTING_SAT_PUBLIC_KEY,
+        SignatureType.PSS,
+        sat_public_keys={
+            "2024": TESTING_CLIENT_PUBLIC_KEY,
+            "2025": TESTING_SAT_PUBLIC_KEY,
+        },
+    )
+
+    assert signature.verify(MESSAGE, new_signer.sign(MESSAGE))
+    assert signature.get_keyring_stats().key_ids == ["2025", "2024"]
+    assert signature.get_keyring_stats().attempts == {1: 1}
+
+    with pytest.raises(InvalidInputException):
+        Signature(
+            None,
+            TESTING_SAT_PUBLIC_KEY,
+            SignatureType.PSS,
+            sat_public_keys={DEFAULT_KEY_ID: TESTING_CLIENT_PUBLIC_KEY},
+        )
+
+
+@pytest.mark.parametrize(
+    "sat_public_keys, key_id_header",
+    [
+        ([TESTING_SAT_PUBLIC_KEY], SIGNATURE_KEY_ID_HEADER_KEY),
+        ({"": TESTING_SAT_PUBLIC_KEY}, SIGNATURE_KEY_ID_HEADER_KEY),
+        ({"2025": None}, SIGNATURE_KEY_ID_HEADER_KEY),
+        ({"2025": TESTING_SAT_PUBLIC_KEY}, ""),
+    ],
+)
+def test_keyring_invalid_config(sat_public_keys, key_id_header):
+    """
+    Invalid keyring configurations are rejected
+
+    :param sat_public_keys:
+    :param key_id_header:
+    """
+    config = SATClientConfig(
+        client_id="client_id",
+        client_secret="client_secret",
+        private_key=TESTING_CLIENT_PRIVATE_KEY,
+        sat_public_key=TESTING_SAT_PUBLIC_KEY,
+    )
+
+    with pytest.raises(InvalidInputException):
+        config.with_sat_public_keys(sat_public_keys, key_id_header)
+
+
+def test_check_status_key_id_header(
+    make_httpserver: HTTPServer,
+    local_config: SATClientConfig,
+    new_signer: Signature,
+    util: TestUtil,
+):
+    """
+    Check status during a key rotation: SAT names the new key in the key id header,
+    it is verified with one RSA verification although the main key is the old one
+
+    :param make_httpserver:
+    :param local_config:
+    :param new_signer:
+    :param util:
+    """
+    config = (
+        SATClientConfig(
+            client_id=local_config.client_id,
+            client_secret=local_config.client_secret,
+            private_key=local_config.private_key,
+            sat_public_key=TESTING_CLIENT_PUBLIC_KEY,
+        )
+        .with_sat_base_url(local_config.sat_base_url)
+        .with_access_token_base_url(local_config.access_token_base_url)
+        .with_sat_public_keys({"2025": TESTING_SAT_PUBLIC_KEY})
+    )
+    sat_client = SATClient(config)
+
+    random_string = "PYSAT" + util.generate_random_string(8)
+    body = json.dumps(
+        {
+            "data": {
+                "type": "order",
+                "id": random_string,
+                "attributes": {"status": "Success"},
+            }
+        }
+    )
+    make_httpserver.expect_request(
+        CHECK_STATUS_PATH.format(request_id=random_string)
+    ).respond_with_data(
+        response_data=body,
+        status=200,
+        headers={
+            "Content-Type": "application/json",
+            "signature": new_signer.sign(body),
+            SIGNATURE_KEY_ID_HEADER_KEY: "2025",
+        },
+    )
+
+    response = sat_client.check_status(random_string)
+
+    assert response.is_success()
+    assert response.status == "Success"
+    stats = sat_client.get_signature().get_keyring_stats()
+    assert stats.verified_by == {"2025": 1}
+    assert stats.attempts == {1: 1}
@@ -0,0 +1,149 @@
+"""
+Test the key loading of the signature module
+
+This example shows the accepted key formats: PEM string, PEM or DER bytes and key file paths.
+Parsed keys are shared process-wide, public keys are parsed upfront and the private key on first use.
+"""
+
+from pathlib import Path
+
+import pytest
+from conftest import (TESTING_CLIENT_PRIVATE_KEY, TESTING_SAT_PRIVATE_KEY,
+                      TESTING_SAT_PUBLIC_KEY)
+from Crypto.PublicKey import RSA
+
+from py_sat.exceptions import InvalidInputException
+from py_sat.signature import Signature, SignatureType
+from py_sat.signature.keys import clear_key_cache, get_key_cache_info
+
+MESSAGE = '{"data":{"type":"order","id":"1231231"}}'
+
+CORRUPT_PUBLIC_KEY = "-----BEGIN PUBLIC KEY-----\nAAAA\n-----END PUBLIC KEY-----"
+
+
+@pytest.fixture(autouse=True)
+def empty_key_cache():
+    clear_key_cache()
+    yield
+    clear_key_cache()
+
+
+@pytest.fixture
+def sat_key_files(tmp_path: Path):
+    key = RSA.import_key(TESTING_SAT_PRIVATE_KEY)
+    files = {
+        "private_pem": tmp_path / "sat_private.pem",
+        "private_der": tmp_path / "sat_private.der",
+        "public_pem": tmp_path / "sat_public.pem",
+        "public_der": tmp_path / "sat_public.der",
+    }
+    files["private_pem"].write_bytes(key.export_key(format="PEM"))
+    files["private_der"].write_bytes(key.export_key(format="DER"))
+    files["public_pem"].write_bytes(key.public_key().export_key(format="PEM"))
+    files["public_der"].write_bytes(key.public_key().export_key(format="DER"))
+    return files
+
+
+def test_key_formats(sat_key_files):
+    """
+    PEM and DER keys, given as is or as file paths, sign and verify the same way
+
+    :param sat_key_files:
+    """
+    key = RSA.import_key(TESTING_SAT_PRIVATE_KEY)
+    sources = [
+        (TESTING_SAT_PRIVATE_KEY, TESTING_SAT_PUBLIC_KEY),
+        (TESTING_SAT_PRIVATE_KEY.encode(), TESTING_SAT_PUBLIC_KEY.encode()),
+        (key.export_key(format="DER"), key.public_key().export_key(format="DER")),
+        (sat_key_files["private_pem"], sat_key_files["public_pem"]),
+        (str(sat_key_files["private_der"]), str(sat_key_files["public_der"])),
+    ]
+    signatures = [
+        Signature(private_key, public_key, SignatureType.PSS)
+        for private_key, public_key in sources
+    ]
+
+    for signer in signatures:
+        signed = signer.sign(MESSAGE)
+        for verifier in signatures:
+            assert verifier.verify(MESSAGE, signed)
+
+
+def test_key_cache_shared_across_signatures():
+    """
+    Signatures built for the same keys parse them once
+    """
+    first = Signature(
+        TESTING_SAT_PRIVATE_KEY, TESTING_SAT_PUBLIC_KEY, SignatureType.PSS
+    )
+    second = Signature(
+        TESTING_SAT_PRIVATE_KEY, TESTING_SAT_PUBLIC_KEY, SignatureType.PSS
+    )
+
+    assert first.verify(MESSAGE, first.sign(MESSAGE))
+    assert second.verify(MESSAGE, second.sign(MESSAGE))
+
+    info = get_key_cache_info()
+    assert info.misses == 2
+    assert info.hits == 2
+    assert info.size == 2
+
+
+def test_private_key_parsed_lazily():
+    """
+    A Signature that only verifies never parses its private key, its public key is parsed upfront
+    """
+    signature = Signature(
+        TESTING_CLIENT_PRIVATE_KEY, TESTING_SAT_PUBLIC_KEY, SignatureType.PSS
+    )
+    assert get_key_cache_info().misses == 1
+
+    signer = Signature(TESTING_SAT_PRIVATE_KEY, None, SignatureType.PSS)
+    assert signature.verify(MESSAGE, signer.sign(MESSAGE))
+
+    info = get_key_cache_info()
+    assert info.misses == 2
+    assert info.size == 2
+
+
+@pytest.mark.parametrize(
+    "private_key, public_key, message",
+    [
+        ("invalid_private_key", TESTING_SAT_PUBLIC_KEY, "Invalid RSA private key"),
+        (TESTING_SAT_PRIVATE_KEY, b"invalid_public_key", "Invalid RSA public key"),
+        (
+            TESTING_SAT_PRIVATE_KEY,
+            Path("/nonexistent/sat_public.pem"),
+            "Invalid RSA public key",
+        ),
+        (TESTING_SAT_PRIVATE_KEY, CORRUPT_PUBLIC_KEY, "Invalid RSA public key"),
+    ],
+)
+def test_invalid_key_format(private_key, public_key, message):
+    """
+    Keys that are neither PEM nor DER, unreadable key files and corrupt public keys are rejected upfront
+
+    :param private_key:
+    :param public_key:
+    :param message:
+    """
+    with pytest.raises(InvalidInputException) as exc_info:
+        Signature(private_key, public_key, SignatureType.PSS)
+
+    assert message in str(exc_info.value)
+
+
+def test_corrupt_rotation_key_rejected():
+    """
+    A corrupt key of the keyring is rejected when the Signature is built,
+    it never turns the verification of a signature made with another key into an error
+    """
+    with pytest.raises(InvalidInputException) as exc_info:
+        Signature(
+            None,
+            TESTING_SAT_PUBLIC_KEY,
+            SignatureType.PSS,
+            sat_public_keys={"2025": CORRUPT_PUBLIC_KEY},
+        )
+
+    assert "Invalid RSA public key 2025" in str(exc_info.value)
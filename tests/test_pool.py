@@ -0,0 +1,63 @@
+"""
+Test connection pool configuration of the HTTPClient.
+
+This example shows how to tune the connection pool and read its live statistics
+to size it based on real numbers.
+"""
+
+import time
+
+from pytest_httpserver import HTTPServer
+
+from py_sat import SATClient, SATClientConfig
+from py_sat.constant import PING_PATH
+from py_sat.pool import PoolConfig, PooledHTTPAdapter
+
+
+def test_pool_stats(make_httpserver: HTTPServer, fresh_local_config: SATClientConfig):
+    """
+    Pool statistics are exposed through the http client of SATClient
+
+    :param make_httpserver:
+    :param fresh_local_config:
+    """
+    make_httpserver.expect_request(PING_PATH).respond_with_json(
+        response_json={"buildhash": "b05b97a", "sandbox": True, "status": "ok"},
+    )
+    config = fresh_local_config.with_connection_pool(
+        pool_connections=2, pool_maxsize=4, pool_block=True
+    )
+    sat_client = SATClient(config)
+
+    sat_client.ping()
+    sat_client.ping()
+
+    stats = sat_client.get_http_client().get_pool_stats()
+    assert stats.in_use == 0
+    assert stats.handshakes >= 1
+    assert stats.open == stats.idle
+    assert stats.idle <= 4
+
+
+def test_pool_idle_eviction(make_httpserver: HTTPServer):
+    """
+    Kept-alive connections idle longer than idle_timeout are closed before being reused
+
+    :param make_httpserver:
+    """
+    adapter = PooledHTTPAdapter(PoolConfig(pool_maxsize=1, idle_timeout=0.05))
+    pool = adapter.poolmanager.connection_from_url(make_httpserver.url_for("/"))
+
+    conn = pool._get_conn()
+    conn.connect()
+    pool._put_conn(conn)
+    assert adapter.get_stats().idle == 1
+    assert adapter.get_stats().handshakes == 1
+
+    time.sleep(0.1)
+    conn = pool._get_conn()
+    assert getattr(conn, "sock", None) is None
+    assert adapter.get_stats().in_use == 1
+
+    pool._put_conn(conn)
+    assert adapter.get_stats().in_use == 0
@@ -6,12 +6,21 @@ This example shows how to use the product list endpoint to get a list of product
 For more information, please refer to "Web Services Details" section in the SAT documentation.
 """
 
+import json
+import threading
+import time
+
+import pytest
 from pytest_httpserver import HTTPServer
 from pytest_httpserver.httpserver import HandlerType
+from werkzeug import Response
 
 from py_sat import SATClient
 from py_sat.constant import PRODUCT_LIST_PATH
+from py_sat.exceptions import ResponseGeneralException
 from py_sat.models import ErrorObject, ErrorResponse, ProductStatus
+from py_sat.utils import (iter_json_api_list_response,
+                          parse_json_api_list_response)
 
 
 def test_product_list_success(
@@ -191,3 +200,115 @@ def test_product_not_exists(
             )
         ]
     )
+
+
+def test_iter_products_streaming(
+    sat_client: SATClient,
+    make_httpserver: HTTPServer,
+):
+    """
+    Example of iterating a large product list, the first products are available before the download finishes
+
+    :param sat_client:
+    :param make_httpserver:
+    """
+    products = [
+        {
+            "attributes": {"is_inquiry": False, "price": i, "status": 1},
+            "id": f"product-{i}",
+            "type": "product",
+        }
+        for i in range(2000)
+    ]
+    first_received = threading.Event()
+
+    def generate():
+        yield b'{"data": [' + json.dumps(products[0]).encode()
+        for i, product in enumerate(products[1:], start=1):
+            if i == 500:
+                # The rest of the catalog is only sent once the client decoded the first product
+                first_received.wait(5)
+            yield b"," + json.dumps(product).encode()
+        yield b'], "meta": {"total": 2000}}'
+
+    make_httpserver.expect_request(
+        PRODUCT_LIST_PATH, method="GET", handler_type=HandlerType.ONESHOT
+    ).respond_with_handler(
+        lambda request: Response(generate(), content_type="application/json")
+    )
+
+    started = time.monotonic()
+    iterator = sat_client.iter_products()
+    first = next(iterator)
+    assert time.monotonic() - started < 4
+    first_received.set()
+
+    assert first.id == "product-0"
+    assert first.status == ProductStatus.Active
+    assert first.get_raw_response().status_code == 200
+    assert [product.id for product in [first, *iterator]] == [
+        product["id"] for product in products
+    ]
+
+
+def test_iter_products_error(
+    sat_client: SATClient,
+    make_httpserver: HTTPServer,
+):
+    """
+    Example of iterating product list when SAT answers with an error
+
+    :param sat_client:
+    :param make_httpserver:
+    """
+    make_httpserver.expect_request(
+        PRODUCT_LIST_PATH, method="GET", handler_type=HandlerType.ONESHOT
+    ).respond_with_json(
+        response_json={
+            "errors": [{"code": "P04", "detail": "Product not found", "status": "400"}]
+        },
+        status=400,
+    )
+
+    with pytest.raises(ResponseGeneralException) as exc_info:
+        list(sat_client.iter_products("not-exists-product"))
+
+    error = ErrorResponse.from_dict(exc_info.value.get_raw_response().json())
+    assert error.errors[0].code == "P04"
+
+
+def test_iter_json_api_list_response_chunks():
+    """
+    Elements split across chunks, multi-byte characters included, are decoded as one
+    """
+    body = {
+        "meta": {"page": [1, 2]},
+        "data": [
+            {"id": str(i), "type": "product", "attributes": {"product_name": "Pulsa ✓"}}
+            for i in range(50)
+        ],
+        "links": 12345,
+    }
+    raw = json.dumps(body, ensure_ascii=False).encode()
+
+    for size in (1, 3, 64):
+        chunks = [raw[i : i + size] for i in range(0, len(raw), size)]
+        assert list(iter_json_api_list_response(chunks)) == (
+            parse_json_api_list_response(body)
+        )
+
+    with pytest.raises(ValueError):
+        list(iter_json_api_list_response([b'{"data": [{"id": "1"}']))
+
+
+def test_iter_json_api_list_response_split_number():
+    """
+    Numbers split across chunks at any byte are not parsed before their last digit arrives
+    """
+    raw = b'{"data":[{"id":"a","attributes":{"price":-12.5e+3}}],"total":1.5}'
+
+    for offset in range(1, len(raw)):
+        chunks = [raw[:offset], raw[offset:]]
+        assert list(iter_json_api_list_response(chunks)) == [
+            {"id": "a", "type": "", "price": -12.5e3}
+        ]
@@ -0,0 +1,199 @@
+"""
+Test the client-side rate limiter of the SATClient.
+
+This example shows how to keep bursts within the SAT quota, either waiting for the budget
+or failing fast, and how the limiter pauses when SAT reports the quota exhausted.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from pytest_httpserver import HTTPServer
+from pytest_httpserver.httpserver import HandlerType
+
+from py_sat import SATClient, SATClientConfig, http_client
+from py_sat.constant import ACCOUNT_PATH, DATE_TIME_FORMAT, Endpoint
+from py_sat.exceptions import (DeadlineExceededException, GeneralException,
+                               InvalidInputException,
+                               RateLimitExceededException)
+from py_sat.rate_limit import RateLimit, TokenBucket
+
+ACCOUNT_RESPONSE = {
+    "data": {"type": "account", "id": "2203", "attributes": {"saldo": 50000000}}
+}
+
+RATE_LIMITED_RESPONSE = {
+    "errors": [{"code": "S00", "detail": "Too many requests", "status": "429"}]
+}
+
+
+def expect_account(server: HTTPServer, times: int = 1):
+    for _ in range(times):
+        server.expect_request(
+            ACCOUNT_PATH, handler_type=HandlerType.ONESHOT
+        ).respond_with_json(ACCOUNT_RESPONSE)
+
+
+def test_token_bucket_burst_and_refill():
+    """
+    The burst is available at once, the next token is reserved ahead of its refill
+    """
+    bucket = TokenBucket(RateLimit(rate=10, burst=2))
+
+    assert bucket.reserve() == (True, 0.0)
+    assert bucket.reserve() == (True, 0.0)
+
+    reserved, wait = bucket.reserve()
+    assert reserved
+    assert 0.05 < wait <= 0.1
+
+    reserved, wait = bucket.reserve(max_wait=0.1)
+    assert not reserved
+    assert 0.15 < wait <= 0.2
+
+
+def test_rate_limit_non_blocking(
+    make_httpserver: HTTPServer, fresh_local_config: SATClientConfig
+):
+    """
+    A non-blocking limiter raises RateLimitExceededException without calling SAT
+
+    :param make_httpserver:
+    :param fresh_local_config:
+    """
+    config = fresh_local_config.with_rate_limit(
+        endpoint_limits={Endpoint.ACCOUNT: (1, 1)}, blocking=False
+    )
+    sat_client = SATClient(config)
+
+    expect_account(make_httpserver)
+    assert sat_client.account().is_success()
+
+    requests_before = len(make_httpserver.log)
+    with pytest.raises(RateLimitExceededException) as exc_info:
+        sat_client.account()
+    assert not isinstance(exc_info.value, GeneralException)
+    assert exc_info.value.endpoint == Endpoint.ACCOUNT
+    assert 0 < exc_info.value.retry_after <= 1
+    assert len(make_httpserver.log) == requests_before
+
+
+def test_rate_limit_blocking(
+    make_httpserver: HTTPServer, fresh_local_config: SATClientConfig
+):
+    """
+    A blocking limiter spaces the calls beyond the burst at the configured rate
+
+    :param make_httpserver:
+    :param fresh_local_config:
+    """
+    sat_client = SATClient(fresh_local_config.with_rate_limit(rate=10, burst=1))
+    sat_client.get_http_client().ensure_access_token()
+
+    expect_account(make_httpserver, times=3)
+    started = time.monotonic()
+    for _ in range(3):
+        assert sat_client.account().is_success()
+
+    assert time.monotonic() - started >= 0.19
+
+
+def test_rate_limit_wait_before_date(
+    make_httpserver: HTTPServer, fresh_local_config: SATClientConfig, monkeypatch
+):
+    """
+    The Date header is stamped after the rate limiter wait, not when the call is queued
+
+    :param make_httpserver:
+    :param fresh_local_config:
+    :param monkeypatch:
+    """
+    now = [datetime(2024, 1, 1, tzinfo=timezone.utc)]
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now[0]
+
+    def sleep(seconds: float):
+        now[0] += timedelta(seconds=seconds)
+
+    monkeypatch.setattr(http_client, "datetime", FrozenDatetime)
+    monkeypatch.setattr(
+        http_client, "time", SimpleNamespace(monotonic=time.monotonic, sleep=sleep)
+    )
+    sat_client = SATClient(fresh_local_config.with_rate_limit(rate=0.5, burst=1))
+    sat_client.get_http_client().ensure_access_token()
+
+    expect_account(make_httpserver, times=2)
+    for _ in range(2):
+        assert sat_client.account().is_success()
+
+    dates = [
+        datetime.strptime(request.headers["Date"], DATE_TIME_FORMAT)
+        for request, _ in make_httpserver.log[-2:]
+    ]
+    assert dates[1] - dates[0] >= timedelta(seconds=1)
+
+
+def test_rate_limit_adapts_to_retry_after(
+    make_httpserver: HTTPServer, fresh_local_config: SATClientConfig
+):
+    """
+    A 429 with Retry-After pauses the endpoint, the wait is bounded by the deadline
+
+    :param make_httpserver:
+    :param fresh_local_config:
+    """
+    sat_client = SATClient(fresh_local_config.with_rate_limit(rate=100, burst=10))
+
+    make_httpserver.expect_request(
+        ACCOUNT_PATH, handler_type=HandlerType.ONESHOT
+    ).respond_with_json(RATE_LIMITED_RESPONSE, status=429, headers={"Retry-After": "5"})
+    assert not sat_client.account().is_success()
+
+    requests_before = len(make_httpserver.log)
+    with pytest.raises(DeadlineExceededException):
+        sat_client.account(deadline=0.5)
+    assert len(make_httpserver.log) == requests_before
+
+
+def test_rate_limit_adapts_to_remaining_header(
+    make_httpserver: HTTPServer, fresh_local_config: SATClientConfig
+):
+    """
+    An exhausted X-RateLimit-Remaining pauses the endpoint until X-RateLimit-Reset
+
+    :param make_httpserver:
+    :param fresh_local_config:
+    """
+    sat_client = SATClient(fresh_local_config.with_rate_limit(rate=100, burst=10))
+    sat_client.get_http_client().ensure_access_token()
+
+    make_httpserver.expect_request(
+        ACCOUNT_PATH, handler_type=HandlerType.ONESHOT
+    ).respond_with_json(
+        ACCOUNT_RESPONSE,
+        headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0.3"},
+    )
+    assert sat_client.account().is_success()
+
+    expect_account(make_httpserver)
+    started = time.monotonic()
+    assert sat_client.account().is_success()
+    assert time.monotonic() - started >= 0.25
+
+
+def test_rate_limit_invalid_input(fresh_local_config: SATClientConfig):
+    """
+    Rates must be positive and bursts at least 1
+
+    :param fresh_local_config:
+    """
+    with pytest.raises(InvalidInputException):
+        fresh_local_config.with_rate_limit(rate=0)
+
+    with pytest.raises(InvalidInputException):
+        fresh_local_config.with_rate_limit(endpoint_limits={Endpoint.INQUIRY: (5, 0)})
@@ -0,0 +1,118 @@
+"""
+Test the request logging of the SATClient.
+
+This example shows how to sample the request logs and report slow requests,
+credentials are never written to the log.
+"""
+
+import logging
+
+import requests
+from pytest_httpserver import HTTPServer
+from pytest_httpserver.httpserver import HandlerType
+
+from py_sat import SATClient, SATClientConfig
+from py_sat.constant import ACCOUNT_PATH, Endpoint
+from py_sat.request_log import REDACTED, RequestLogConfig, RequestLogger
+
+
+class ExplodingHeaders(dict):
+    def items(self):
+        raise AssertionError("headers rendered while the level is disabled")
+
+
+def make_response(headers=None) -> requests.Response:
+    request = requests.PreparedRequest()
+    request.method = "POST"
+    request.url = "https://sat.test/v2/order"
+    request.headers = headers if headers is not None else {}
+    request.body = b'{"data": {}}'
+
+    response = requests.Response()
+    response.status_code = 200
+    response.request = request
+    return response
+
+
+def test_request_log_redacted(
+    caplog, make_httpserver: HTTPServer, fresh_local_config: SATClientConfig
+):
+    """
+    Authorization header is redacted from the request log
+
+    :param caplog:
+    :param make_httpserver:
+    :param fresh_local_config:
+    """
+    make_httpserver.expect_request(
+        ACCOUNT_PATH, handler_type=HandlerType.ONESHOT
+    ).respond_with_json(
+        {"data": {"type": "account", "id": "2203", "attributes": {"saldo": 1000}}}
+    )
+    logger = logging.getLogger("test_request_log_redacted")
+    config = fresh_local_config.with_logger(logger)
+
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        SATClient(config).account()
+
+    records = [r for r in caplog.records if r.name == logger.name]
+    assert len(records) == 1
+    assert records[0].sat_endpoint == Endpoint.ACCOUNT.value
+    assert records[0].sat_status == 200
+    assert ACCOUNT_PATH in records[0].getMessage()
+    assert "testingToken" not in records[0].getMessage()
+    assert REDACTED in records[0].getMessage()
+
+
+def test_request_log_signature_redacted(caplog):
+    """
+    Signature header and body are only logged when allowed
+
+    :param caplog:
+    """
+    logger = logging.getLogger("test_request_log_signature_redacted")
+    request_logger = RequestLogger(logger, log_body=False)
+    response = make_response({"Signature": "c2lnbmF0dXJl"})
+
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        request_logger.log(response, Endpoint.CHECKOUT, 0.01)
+
+    message = caplog.records[0].getMessage()
+    assert "c2lnbmF0dXJl" not in message
+    assert "body=" not in message
+
+
+def test_request_log_lazy(caplog):
+    """
+    Nothing is rendered when the level is disabled
+
+    :param caplog:
+    """
+    logger = logging.getLogger("test_request_log_lazy")
+    request_logger = RequestLogger(logger, log_body=True)
+
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        request_logger.log(make_response(ExplodingHeaders()), Endpoint.CHECKOUT, 0.01)
+
+    assert not caplog.records
+
+
+def test_request_log_sampling_and_slow(caplog):
+    """
+    Regular requests are sampled 1 in N, slow requests are always logged at WARNING
+
+    :param caplog:
+    """
+    logger = logging.getLogger("test_request_log_sampling_and_slow")
+    request_logger = RequestLogger(
+        logger, RequestLogConfig(sample_rate=4, slow_threshold=1.0)
+    )
+
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        for _ in range(8):
+            request_logger.log(make_response(), Endpoint.CHECKOUT, 0.01)
+        request_logger.log(make_response(), Endpoint.CHECKOUT, 1.5)
+
+    levels = [record.levelno for record in caplog.records]
+    assert levels == [logging.DEBUG, logging.DEBUG, logging.WARNING]
+    assert caplog.records[-1].getMessage().startswith("Slow request")
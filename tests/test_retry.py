@@ -0,0 +1,150 @@
+"""
+Test retry policy of the SATClient.
+
+This example shows how to enable retries, and how checkout stays safe from duplicate orders.
+"""
+
+import socket
+
+import pytest
+import requests
+from pytest_httpserver import HTTPServer
+from pytest_httpserver.httpserver import HandlerType
+
+from py_sat import SATClient, SATClientConfig
+from py_sat.constant import ACCOUNT_PATH, CHECKOUT_PATH, Endpoint
+from py_sat.models import ErrorResponse, OrderRequest
+from py_sat.retry import RetryPolicy, is_connect_failure, parse_retry_after
+
+ACCOUNT_RESPONSE = {
+    "data": {"type": "account", "id": "2203", "attributes": {"saldo": 50000000}}
+}
+
+
+def test_retry_idempotent_endpoint(
+    make_httpserver: HTTPServer, fresh_local_config: SATClientConfig
+):
+    """
+    Account is retried on a transient 502 and the retries are visible on the response
+
+    :param make_httpserver:
+    :param fresh_local_config:
+    """
+    make_httpserver.expect_request(
+        ACCOUNT_PATH, handler_type=HandlerType.ONESHOT
+    ).respond_with_data("Bad Gateway", status=502)
+    make_httpserver.expect_request(
+        ACCOUNT_PATH, handler_type=HandlerType.ONESHOT
+    ).respond_with_data("Too Many Requests", status=429, headers={"Retry-After": "0"})
+    make_httpserver.expect_request(
+        ACCOUNT_PATH, handler_type=HandlerType.ONESHOT
+    ).respond_with_json(ACCOUNT_RESPONSE)
+
+    config = fresh_local_config.with_retry_policy(
+        RetryPolicy(max_attempts=3, backoff_base=0.01)
+    )
+    response = SATClient(config).account()
+
+    assert response.is_success()
+    assert response.saldo == 50000000
+    assert response.get_retry_count() == 2
+    assert 0 <= response.get_retry_backoff() <= 0.03
+
+
+def test_checkout_not_retried_on_server_error(
+    make_httpserver: HTTPServer, fresh_local_config: SATClientConfig
+):
+    """
+    Checkout may have reached SAT, so a 503 is returned without any retry
+
+    :param make_httpserver:
+    :param fresh_local_config:
+    """
+    make_httpserver.expect_request(
+        CHECKOUT_PATH, method="POST", handler_type=HandlerType.ONESHOT
+    ).respond_with_json(
+        {"errors": [{"code": "S00", "detail": "Service Unavailable", "status": "503"}]},
+        status=503,
+    )
+
+    config = fresh_local_config.with_retry_policy(
+        RetryPolicy(max_attempts=3, backoff_base=0.01)
+    )
+    response = SATClient(config).checkout(
+        OrderRequest(id="PYSATRETRY1", product_code="pln-postpaid", amount=1)
+    )
+
+    assert isinstance(response, ErrorResponse)
+    assert response.get_retry_count() == 0
+
+
+def test_checkout_retried_on_retryable_code(
+    make_httpserver: HTTPServer, fresh_local_config: SATClientConfig
+):
+    """
+    Checkout is retried when SAT answers with an error code declared retryable
+
+    :param make_httpserver:
+    :param fresh_local_config:
+    """
+    make_httpserver.expect_request(
+        CHECKOUT_PATH, method="POST", handler_type=HandlerType.ONESHOT
+    ).respond_with_json(
+        {"errors": [{"code": "R99", "detail": "Try again", "status": "503"}]},
+        status=503,
+    )
+    make_httpserver.expect_request(
+        CHECKOUT_PATH, method="POST", handler_type=HandlerType.ONESHOT
+    ).respond_with_json(
+        {
+            "data": {
+                "type": "order",
+                "id": "PYSATRETRY2",
+                "attributes": {"status": "Pending"},
+            }
+        }
+    )
+
+    config = fresh_local_config.with_retry_policy(
+        RetryPolicy(
+            max_attempts=2, backoff_base=0.01, retryable_error_codes=frozenset({"R99"})
+        )
+    )
+    response = SATClient(config).checkout(
+        OrderRequest(id="PYSATRETRY2", product_code="pln-postpaid", amount=1)
+    )
+
+    assert response.is_success()
+    assert response.status == "Pending"
+    assert response.get_retry_count() == 1
+
+
+def test_connect_failure_detection():
+    """
+    Only failures to establish the connection are considered as never reaching the server
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    with pytest.raises(requests.exceptions.ConnectionError) as exc_info:
+        requests.get(f"http://127.0.0.1:{port}/v2/order", timeout=1)
+
+    policy = RetryPolicy()
+    assert is_connect_failure(exc_info.value)
+    assert policy.should_retry_exception(Endpoint.CHECKOUT, exc_info.value)
+
+    read_timeout = requests.exceptions.ReadTimeout("read timed out")
+    assert not is_connect_failure(read_timeout)
+    assert not policy.should_retry_exception(Endpoint.CHECKOUT, read_timeout)
+    assert policy.should_retry_exception(Endpoint.CHECK_STATUS, read_timeout)
+
+
+def test_parse_retry_after():
+    """
+    Retry-After supports both delay seconds and HTTP date
+    """
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
@@ -9,7 +9,9 @@ For more information, please refer to "Signature" section in the SAT documentati
 import pytest
 from conftest import TESTING_CLIENT_PRIVATE_KEY, TESTING_CLIENT_PUBLIC_KEY
 
-from py_sat.signature import Signature, SignatureType
+from py_sat.exceptions import InvalidInputException
+from py_sat.signature import (Signature, SignatureBackend, SignatureType,
+                              openssl)
 
 
 @pytest.mark.parametrize(
@@ -49,3 +51,83 @@ def test_signature(test_input, test_message, verified):
 
     is_verified = signature.verify(test_message, sig)
     assert verified == is_verified
+
+
+@pytest.mark.skipif(
+    not openssl.OPENSSL_AVAILABLE, reason="cryptography is not installed"
+)
+@pytest.mark.parametrize(
+    "signer_backend, verifier_backend",
+    [
+        (SignatureBackend.PYCRYPTODOME, SignatureBackend.OPENSSL),
+        (SignatureBackend.OPENSSL, SignatureBackend.PYCRYPTODOME),
+        (SignatureBackend.OPENSSL, SignatureBackend.OPENSSL),
+    ],
+)
+def test_signature_backends_are_interchangeable(signer_backend, verifier_backend):
+    """
+    A signature made by one backend is verified the same way by the other one
+
+    :param signer_backend:
+    :param verifier_backend:
+    """
+    signer = Signature(
+        TESTING_CLIENT_PRIVATE_KEY, None, SignatureType.PSS, signer_backend
+    )
+    verifier = Signature(
+        None, TESTING_CLIENT_PUBLIC_KEY, SignatureType.PSS, verifier_backend
+    )
+    message = '{"test_message": "Hello, World!!"}'
+
+    sig = signer.sign(message)
+
+    assert verifier.verify(message, sig)
+    assert not verifier.verify('{"test_message": "Hello, Not World!!"}', sig)
+    with pytest.raises(Exception):
+        verifier.verify(message, " ")
+
+
+def test_signature_backend_auto(monkeypatch):
+    """
+    AUTO picks OpenSSL when cryptography is installed, pycryptodome otherwise,
+    and an explicit OpenSSL backend without cryptography is rejected
+
+    :param monkeypatch:
+    """
+    signature = Signature(TESTING_CLIENT_PRIVATE_KEY, None, SignatureType.PSS)
+    assert signature.backend == (
+        SignatureBackend.OPENSSL
+        if openssl.OPENSSL_AVAILABLE
+        else SignatureBackend.PYCRYPTODOME
+    )
+
+    monkeypatch.setattr("py_sat.signature.OPENSSL_AVAILABLE", False)
+    signature = Signature(TESTING_CLIENT_PRIVATE_KEY, None, SignatureType.PSS)
+    assert signature.backend == SignatureBackend.PYCRYPTODOME
+
+    with pytest.raises(InvalidInputException):
+        Signature(
+            TESTING_CLIENT_PRIVATE_KEY,
+            None,
+            SignatureType.PSS,
+            SignatureBackend.OPENSSL,
+        )
+
+
+def test_signature_bytes():
+    """
+    Bytes are signed and verified as-is, the same as their UTF-8 string
+    """
+    signature = Signature(
+        private_key_str=TESTING_CLIENT_PRIVATE_KEY,
+        sat_public_key_str=TESTING_CLIENT_PUBLIC_KEY,
+        padding_type=SignatureType.PSS,
+    )
+    message = '{"test_message": "Hállo, World!!"}'
+
+    assert signature.verify(message.encode("utf-8"), signature.sign(message))
+    assert signature.verify(message, signature.sign(message.encode("utf-8")))
+    assert not signature.verify(message.encode("latin-1"), signature.sign(message))
+
+    with pytest.raises(InvalidInputException):
+        signature.verify(bytearray(message.encode("utf-8")), signature.sign(message))
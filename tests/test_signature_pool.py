@@ -0,0 +1,149 @@
+"""
+Test the bulk sign and verify operations of the signature module
+
+This example shows how to sign a batch of orders at once, in this process or in a pool of worker processes.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from conftest import (TESTING_CLIENT_PRIVATE_KEY, TESTING_CLIENT_PUBLIC_KEY,
+                      TESTING_SAT_PRIVATE_KEY, TESTING_SAT_PUBLIC_KEY)
+
+from py_sat import SATClientConfig
+from py_sat.exceptions import InvalidInputException, SignatureErrorException
+from py_sat.signature import Signature, SignatureType
+from py_sat.signature.pool import (SignaturePool, SignaturePoolConfig,
+                                   WorkerKeys, sign_chunk)
+
+MESSAGES = [f'{{"data":{{"type":"order","id":"order-{i}"}}}}' for i in range(7)]
+
+
+@pytest.fixture(params=[None, SignaturePoolConfig(workers=2, chunk_size=2)])
+def signature(request):
+    signature = Signature(
+        TESTING_CLIENT_PRIVATE_KEY,
+        TESTING_CLIENT_PUBLIC_KEY,
+        SignatureType.PSS,
+        pool_config=request.param,
+    )
+    yield signature
+    signature.close()
+
+
+def test_sign_many(signature: Signature):
+    """
+    Signatures are returned in the order of the messages, a failing message does not fail the batch
+
+    :param signature:
+    """
+    results = signature.sign_many(MESSAGES[:3] + [42] + MESSAGES[3:])
+
+    assert len(results) == len(MESSAGES) + 1
+    assert not results[3].ok
+    assert isinstance(results[3].error, InvalidInputException)
+
+    signed = [result for i, result in enumerate(results) if i != 3]
+    for message, result in zip(MESSAGES, signed):
+        assert result.ok
+        assert signature.verify(message, result.value)
+
+
+def test_verify_many(signature: Signature):
+    """
+    Verifications are returned in the order of the pairs, with the error of each failing pair
+
+    :param signature:
+    """
+    signed = [signature.sign(message) for message in MESSAGES]
+    other_signer = Signature(
+        TESTING_SAT_PRIVATE_KEY, TESTING_SAT_PUBLIC_KEY, SignatureType.PSS
+    )
+    pairs = list(zip(MESSAGES, signed)) + [
+        (MESSAGES[0], other_signer.sign(MESSAGES[0])),
+        (MESSAGES[0], " "),
+        ("not a pair",),
+    ]
+
+    results = signature.verify_many(pairs)
+
+    assert [result.value for result in results[: len(MESSAGES)]] == [True] * len(
+        MESSAGES
+    )
+    assert results[len(MESSAGES)].ok
+    assert results[len(MESSAGES)].value is False
+    assert isinstance(results[len(MESSAGES) + 1].error, SignatureErrorException)
+    assert isinstance(results[len(MESSAGES) + 2].error, ValueError)
+
+
+def crash_chunk(messages):
+    os._exit(1)
+
+
+def test_signature_pool_worker_killed():
+    """
+    Worker processes killed between two batches are replaced, the next batch succeeds
+    """
+    signature = Signature(
+        TESTING_CLIENT_PRIVATE_KEY,
+        TESTING_CLIENT_PUBLIC_KEY,
+        SignatureType.PSS,
+        pool_config=SignaturePoolConfig(workers=2, chunk_size=2),
+    )
+    try:
+        assert all(result.ok for result in signature.sign_many(MESSAGES))
+        for worker in multiprocessing.active_children():
+            worker.kill()
+
+        for _ in range(2):
+            results = signature.sign_many(MESSAGES)
+            assert len(results) == len(MESSAGES)
+            assert all(result.ok for result in results)
+    finally:
+        signature.close()
+
+
+def test_signature_pool_broken_batch():
+    """
+    A batch breaking every pool it runs on fails item by item, the pool still serves the next batch
+    """
+    pool = SignaturePool(
+        SignaturePoolConfig(workers=1, chunk_size=2),
+        WorkerKeys(
+            private_key=TESTING_CLIENT_PRIVATE_KEY.encode(),
+            public_keys={},
+            padding_type=SignatureType.PSS.value,
+            backend="auto",
+        ),
+    )
+    try:
+        results = pool.map(crash_chunk, MESSAGES)
+        assert len(results) == len(MESSAGES)
+        assert all(isinstance(result.error, BrokenProcessPool) for result in results)
+
+        results = pool.map(sign_chunk, MESSAGES)
+        assert all(result.ok for result in results)
+    finally:
+        pool.close()
+
+
+def test_signature_pool_invalid_config():
+    """
+    Invalid pool configurations are rejected
+    """
+    config = SATClientConfig(
+        client_id="client_id",
+        client_secret="client_secret",
+        private_key=TESTING_CLIENT_PRIVATE_KEY,
+        sat_public_key=TESTING_SAT_PUBLIC_KEY,
+    )
+
+    with pytest.raises(InvalidInputException):
+        config.with_signature_pool(workers=0)
+
+    with pytest.raises(InvalidInputException):
+        config.with_signature_pool(chunk_size=0)
+
+    assert config.with_signature_pool(workers=4).signature_pool_config.workers == 4
@@ -0,0 +1,106 @@
+"""
+Test timeouts and deadlines of the SATClient.
+
+This example shows how to configure connect/read timeouts per endpoint,
+and how to bound a whole call with a deadline.
+"""
+
+import time
+
+import pytest
+from pytest_httpserver import HTTPServer
+from pytest_httpserver.httpserver import HandlerType
+from werkzeug.wrappers import Request, Response
+
+from py_sat import SATClient, SATClientConfig
+from py_sat.constant import ACCOUNT_PATH, Endpoint
+from py_sat.exceptions import (DeadlineExceededException, GeneralException,
+                               InvalidInputException)
+from py_sat.timeout import Deadline, Timeout
+
+
+def slow_account_handler(request: Request) -> Response:
+    time.sleep(0.5)
+    return Response(
+        status=200,
+        response='{"data": {"type": "account", "id": "2203", "attributes": {"saldo": 1}}}',
+        content_type="application/json",
+    )
+
+
+def test_endpoint_read_timeout(
+    make_httpserver: HTTPServer, fresh_local_config: SATClientConfig
+):
+    """
+    Read timeout of an endpoint stops waiting on a stuck socket
+
+    :param make_httpserver:
+    :param fresh_local_config:
+    """
+    make_httpserver.expect_request(
+        ACCOUNT_PATH, handler_type=HandlerType.ONESHOT
+    ).respond_with_handler(slow_account_handler)
+
+    config = fresh_local_config.with_endpoint_timeout(
+        Endpoint.ACCOUNT, connect=1, read=0.1
+    )
+    sat_client = SATClient(config)
+    sat_client.get_http_client().ensure_access_token()
+
+    with pytest.raises(GeneralException) as exc_info:
+        sat_client.account()
+
+    assert not isinstance(exc_info.value, DeadlineExceededException)
+    assert "timed out" in str(exc_info.value)
+    # Let the stub finish the slow response before the next test
+    time.sleep(0.5)
+
+
+def test_deadline_exceeded(
+    make_httpserver: HTTPServer, fresh_local_config: SATClientConfig
+):
+    """
+    Deadline bounds the call even when the endpoint timeout is longer
+
+    :param make_httpserver:
+    :param fresh_local_config:
+    """
+    make_httpserver.expect_request(
+        ACCOUNT_PATH, handler_type=HandlerType.ONESHOT
+    ).respond_with_handler(slow_account_handler)
+
+    sat_client = SATClient(fresh_local_config)
+    sat_client.get_http_client().ensure_access_token()
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededException):
+        sat_client.account(deadline=0.2)
+
+    assert time.monotonic() - start < 0.5
+    # Let the stub finish the slow response before the next test
+    time.sleep(0.5)
+
+
+def test_deadline_bound():
+    """
+    Deadline shrinks socket timeouts to the remaining budget
+    """
+    deadline = Deadline(1)
+    timeout = deadline.bound(Timeout(connect=5, read=0.5))
+
+    assert timeout.connect <= 1
+    assert timeout.read == 0.5
+    assert Deadline.after(None) is None
+
+    with pytest.raises(DeadlineExceededException):
+        Deadline(0).check("ping")
+
+
+def test_invalid_endpoint_timeout(fresh_local_config: SATClientConfig):
+    """
+    Endpoint timeouts must be positive
+
+    :param fresh_local_config:
+    """
+    with pytest.raises(InvalidInputException):
+        fresh_local_config.with_endpoint_timeout(Endpoint.PING, connect=0, read=1)
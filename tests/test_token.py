@@ -0,0 +1,225 @@
+"""
+Test the OAuth access token management of the HTTPClient.
+
+This example shows that building a SATClient does no network I/O,
+how to warm up the access token explicitly on startup,
+and how the token is refreshed before it expires.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+
+from pytest_httpserver import HTTPServer
+from pytest_httpserver.httpserver import HandlerType
+
+from py_sat import SATClient, SATClientConfig
+from py_sat.constant import ACCOUNT_PATH
+from py_sat.token import AccessToken, TokenManager
+from py_sat.token_store import FileTokenStore, InMemoryTokenStore
+
+ACCOUNT_RESPONSE = {
+    "data": {"type": "account", "id": "2203", "attributes": {"saldo": 50000000}}
+}
+
+
+def count_token_requests(httpserver: HTTPServer) -> int:
+    return sum(1 for request, _ in httpserver.log if request.path == "/token")
+
+
+def test_lazy_token(make_httpserver: HTTPServer, fresh_local_config: SATClientConfig):
+    """
+    The token is fetched once on warm up, not when the client is built
+
+    :param make_httpserver:
+    :param fresh_local_config:
+    """
+    before = count_token_requests(make_httpserver)
+    sat_client = SATClient(fresh_local_config)
+    assert count_token_requests(make_httpserver) == before
+
+    http_client = sat_client.get_http_client()
+    assert http_client.ensure_access_token() == "testingToken"
+    assert http_client.ensure_access_token() == "testingToken"
+    assert count_token_requests(make_httpserver) == before + 1
+
+
+def test_no_network_on_construction(fresh_local_config: SATClientConfig):
+    """
+    An unreachable token endpoint does not prevent the client from being built
+
+    :param fresh_local_config:
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    config = fresh_local_config.with_access_token_base_url(
+        f"http://127.0.0.1:{port}/token"
+    )
+    sat_client = SATClient(config)
+
+    assert sat_client.get_http_client().get_pool_stats().handshakes == 0
+
+
+def test_access_token_lifetime():
+    """
+    The token is refreshed after the configured fraction of its lifetime and expires after it
+    """
+    token = AccessToken.from_response(
+        {"access_token": "token", "expires_in": 100}, refresh_ratio=0.8, now=1000
+    )
+
+    assert token.refresh_at == 1080
+    assert token.expires_at == 1100
+    assert not token.needs_refresh(now=1079)
+    assert token.needs_refresh(now=1080)
+    assert not token.is_expired(now=1099)
+    assert token.is_expired(now=1100)
+
+    token = AccessToken.from_response({"access_token": "token"})
+    assert not token.needs_refresh()
+    assert not token.is_expired()
+
+
+def test_single_flight_refresh():
+    """
+    Concurrent callers hitting a missing token share a single fetch
+    """
+    fetches = []
+
+    def fetch(deadline):
+        fetches.append(deadline)
+        time.sleep(0.1)
+        return AccessToken(access_token=f"token-{len(fetches)}")
+
+    manager = TokenManager(fetch, InMemoryTokenStore(), logging.getLogger(__name__))
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(manager.get()))
+        for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fetches) == 1
+    assert results == ["token-1"] * 10
+
+
+def test_proactive_refresh():
+    """
+    A token close to expiry keeps being served while a single refresh runs in the background
+    """
+    refreshed = threading.Event()
+    fetches = []
+
+    def fetch(deadline):
+        fetches.append(deadline)
+        refreshed.wait(1)
+        return AccessToken(access_token="new", expires_at=time.time() + 60)
+
+    manager = TokenManager(fetch, InMemoryTokenStore(), logging.getLogger(__name__))
+    now = time.time()
+    manager.set(AccessToken(access_token="old", expires_at=now + 60, refresh_at=now))
+
+    assert manager.get() == "old"
+    assert manager.get() == "old"
+    refreshed.set()
+    for _ in range(100):
+        if manager.get() == "new":
+            break
+        time.sleep(0.01)
+
+    assert manager.get() == "new"
+    assert len(fetches) == 1
+
+
+def test_replay_on_unauthorized(
+    make_httpserver: HTTPServer, fresh_local_config: SATClientConfig
+):
+    """
+    A token rejected by SAT is refreshed once and the request is replayed
+
+    :param make_httpserver:
+    :param fresh_local_config:
+    """
+    sat_client = SATClient(fresh_local_config)
+    sat_client.get_http_client().ensure_access_token()
+    make_httpserver.expect_request(
+        ACCOUNT_PATH, handler_type=HandlerType.ONESHOT
+    ).respond_with_data("Unauthorized", status=401)
+    make_httpserver.expect_request(
+        ACCOUNT_PATH, handler_type=HandlerType.ONESHOT
+    ).respond_with_json(ACCOUNT_RESPONSE)
+
+    before = count_token_requests(make_httpserver)
+    response = sat_client.account()
+
+    assert response.is_success()
+    assert response.saldo == 50000000
+    assert count_token_requests(make_httpserver) == before + 1
+
+
+def test_file_token_store_shares_refresh(tmp_path):
+    """
+    Clients sharing a FileTokenStore, as worker processes of a host do, fetch the token once
+
+    :param tmp_path:
+    """
+    path = str(tmp_path / "token.json")
+    fetches = []
+
+    def fetch(deadline):
+        fetches.append(deadline)
+        time.sleep(0.1)
+        return AccessToken(access_token="shared", expires_at=time.time() + 60)
+
+    # One store per manager, each holds its own lock descriptor like separate processes
+    managers = [
+        TokenManager(fetch, FileTokenStore(path), logging.getLogger(__name__))
+        for _ in range(8)
+    ]
+    results = []
+    threads = [
+        threading.Thread(target=lambda m=manager: results.append(m.get()))
+        for manager in managers
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fetches) == 1
+    assert results == ["shared"] * 8
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    assert FileTokenStore(path).load() == AccessToken(
+        access_token="shared", expires_at=managers[0]._token.expires_at
+    )
+
+    managers[0].invalidate("shared")
+    assert FileTokenStore(path).load() is None
+
+
+def test_file_token_store_lock_timeout(tmp_path):
+    """
+    A refresh waiting on the lock held by another process gives up at the deadline
+
+    :param tmp_path:
+    """
+    path = str(tmp_path / "token.json")
+    holder = FileTokenStore(path)
+    assert holder.acquire()
+    try:
+        started = time.monotonic()
+        assert not FileTokenStore(path).acquire(timeout=0.1)
+        assert time.monotonic() - started >= 0.1
+    finally:
+        holder.release()
+
+    store = FileTokenStore(path)
+    assert store.acquire(timeout=0.1)
+    store.release()
@@ -0,0 +1,75 @@
+"""
+Test the warm up of the SATClient.
+
+This example shows how to warm up the client on startup, so the first checkout
+does not pay the token fetch, the handshakes and the first RSA operations.
+Pre-opened connections stay idle on the server, the threaded server serves them.
+"""
+
+import pytest
+from pytest_httpserver import HTTPServer
+
+from py_sat import SATClient, SATClientConfig
+from py_sat.bulkhead import BulkheadClass
+from py_sat.exceptions import GeneralException
+
+
+def test_warmup(threaded_server: HTTPServer, threaded_config: SATClientConfig):
+    """
+    Warm up fetches the token and fills the pool with idle connections
+
+    :param threaded_server:
+    :param threaded_config:
+    """
+    sat_client = SATClient(threaded_config.with_connection_pool(pool_maxsize=4))
+
+    report = sat_client.warmup(connections=3)
+
+    assert 0 < report.opened_connections <= 3
+    assert report.token > 0
+    assert report.signature > 0
+    assert report.decoders > 0
+    assert report.total >= report.token + report.signature
+
+    stats = sat_client.get_http_client().get_pool_stats()
+    assert stats.idle == 3
+    assert stats.in_use == 0
+
+    # Already warm, nothing more to open
+    assert sat_client.warmup(connections=3).opened_connections == 0
+
+
+def test_warmup_bulkheads(
+    threaded_server: HTTPServer, threaded_config: SATClientConfig
+):
+    """
+    Every bulkhead pool is warmed up, bounded by its in-flight limit
+
+    :param threaded_server:
+    :param threaded_config:
+    """
+    sat_client = SATClient(
+        threaded_config.with_bulkheads(checkout_max_in_flight=2, read_max_in_flight=1)
+    )
+
+    report = sat_client.warmup(connections=2)
+
+    assert report.opened_connections == 3
+    stats = sat_client.get_http_client().get_bulkhead_stats()
+    assert stats[BulkheadClass.CHECKOUT].pool.idle == 2
+    assert stats[BulkheadClass.READ].pool.idle == 1
+
+
+def test_warmup_unreachable(fresh_local_config: SATClientConfig):
+    """
+    Warm up fails when SAT is unreachable, so the readiness probe fails too
+
+    :param fresh_local_config:
+    """
+    sat_client = SATClient(
+        fresh_local_config.with_sat_base_url("http://127.0.0.1:1").with_timeout(1)
+    )
+    sat_client.get_http_client().ensure_access_token()
+
+    with pytest.raises(GeneralException):
+        sat_client.warmup()